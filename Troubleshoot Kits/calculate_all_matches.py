@@ -4,6 +4,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from matcher import SimpleMatcher
 from chroma_data_manager import ChromaDataManager
+from vector_db import vector_db
 
 def calculate_all_matches():
     print("🎯 CALCULATING ALL CANDIDATE-JOB MATCHES")
@@ -13,15 +14,12 @@ def calculate_all_matches():
     matcher = SimpleMatcher()
     db = ChromaDataManager()
     
-    # Get all jobs and candidates
-    jobs = db.load_jobs()
-    candidates = db.load_candidates()
-    
-    print(f"📊 Found {len(jobs)} jobs and {len(candidates)} candidates")
+    # Stream jobs and candidates instead of holding both collections in memory
+    print(f"📊 Found {vector_db.get_job_count()} jobs and {vector_db.get_candidate_count()} candidates")
     print()
     
     # Calculate matches for each job
-    for job in jobs:
+    for job in db.iter_jobs():
         print(f"💼 JOB: {job.get('title')} at {job.get('company')}")
         print(f"   Required Skills: {', '.join(job.get('required_skills', []))}")
         print(f"   Experience: {job.get('experience_required', 0)}+ years")
@@ -30,7 +28,7 @@ def calculate_all_matches():
         
         # Calculate matches for this job
         job_matches = []
-        for candidate in candidates:
+        for candidate in db.iter_candidates():
             # Calculate individual scores
             skill_score = matcher._calculate_skill_match(job, candidate)
             experience_score = matcher._calculate_experience_match(job, candidate)
@@ -1,7 +1,12 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
 from chromadb import PersistentClient
+from collection_names import active_collection_name
 
 client = PersistentClient(path="./chroma_db")
-collection = client.get_collection(name="candidates")
+collection = client.get_collection(name=active_collection_name("candidates"))
 
 records = collection.get(include=["metadatas"])
 
@@ -11,17 +11,16 @@ def check_vector_data():
     
     db = ChromaDataManager()
     
-    # Get candidates from both sources
-    candidates_db = db.load_candidates()
-    print(f"📁 Candidates from ChromaDataManager: {len(candidates_db)}")
+    # Get a sample candidate without loading the whole collection
+    sample_candidate = next(db.iter_candidates(batch_size=1), None)
+    print(f"📁 Sample candidate from ChromaDataManager: {'found' if sample_candidate else 'none'}")
     
     # Check vector DB directly
     vector_count = vector_db.get_candidate_count()
     print(f"📊 Candidates in Vector DB: {vector_count}")
     
-    # Compare first candidate from both sources
-    if candidates_db:
-        sample_candidate = candidates_db[0]
+    # Inspect the sample candidate
+    if sample_candidate:
         print(f"\n📋 SAMPLE CANDIDATE DATA STRUCTURE:")
         for key, value in sample_candidate.items():
             print(f"   {key}: {type(value)} = {value}")
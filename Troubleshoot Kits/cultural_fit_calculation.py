@@ -11,13 +11,9 @@ def detailed_cultural_calculation():
     
     db = ChromaDataManager()
     
-    # Get the specific job and candidates
-    jobs = db.load_jobs()
-    candidates = db.load_candidates()
-    
-    # Find the job (Senior Python Code Developer)
+    # Find the job (Senior Python Code Developer) - streamed, stops at the first hit
     target_job = None
-    for job in jobs:
+    for job in db.iter_jobs(fields=['title', 'cultural_attributes']):
         if 'Senior Python Code Developer' in job.get('title', ''):
             target_job = job
             break
@@ -34,7 +30,7 @@ def detailed_cultural_calculation():
     peter_tan = None
     alex_chen = None
     
-    for candidate in candidates:
+    for candidate in db.iter_candidates(fields=['name', 'cultural_attributes']):
         if candidate['name'] == 'Peter Tan':
             peter_tan = candidate
         elif candidate['name'] == 'Alex Chen':
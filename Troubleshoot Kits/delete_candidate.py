@@ -1,7 +1,16 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
 from chromadb import PersistentClient
+from collection_names import active_collection_name, collection_write_lock
+from id_sequence import bump_write_stamp
 
 client = PersistentClient(path="./chroma_db")
-collection = client.get_collection(name="candidates")
-
-collection.delete(ids=["5"])
+# Under the write lock, so a running rebuild_collection() cannot swap the collection mid-delete
+with collection_write_lock("./chroma_db"):
+    collection = client.get_collection(name=active_collection_name("candidates"))
+    collection.delete(ids=["5"])
+# Running app processes drop their cached / indexed copy of this candidate
+bump_write_stamp("./chroma_db", "candidates")
 print("Deleted candidate with ID: 5")
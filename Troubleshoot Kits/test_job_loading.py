@@ -11,10 +11,12 @@ def test_job_loading():
     db = ChromaDataManager()
     
     try:
-        jobs = db.load_jobs()
-        print(f"✅ Successfully loaded {len(jobs)} jobs")
-        for job in jobs[:3]:  # Show first 3
-            print(f"  - {job.get('title')} at {job.get('company')}")
+        job_count = 0
+        for job in db.iter_jobs(fields=['title', 'company']):
+            if job_count < 3:  # Show first 3
+                print(f"  - {job.get('title')} at {job.get('company')}")
+            job_count += 1
+        print(f"✅ Successfully streamed {job_count} jobs")
     except Exception as e:
         print(f"❌ Error loading jobs: {e}")
         import traceback
@@ -0,0 +1,434 @@
+"""
+🧮 BATCH SCORER - Vectorized Match Scoring for a Job Shortlist or the Full Job x Candidate Grid
+Candidates are turned into NumPy feature arrays once; every score component of SimpleMatcher is then
+computed as array operations per job. Scores are bit-for-bit the ones of the per-pair SimpleMatcher
+methods: the same float64 operations run in the same order, only over whole arrays at a time
+"""
+
+import heapq
+
+import numpy as np
+
+from skill_index import SkillMatrix
+from gazetteer import gazetteer
+
+# Order of the weighted sum matters for identical float results - keep it as in the per-pair formula
+COMPONENT_WEIGHTS = [
+    ('skills', 0.30),            # Skill matching
+    ('experience', 0.20),        # Experience rules
+    ('location', 0.15),          # Global location scoring
+    ('semantic', 0.20),          # Semantic understanding from the vector search
+    ('cultural_fit', 0.05),      # Cultural fit
+    ('growth_potential', 0.10)   # Growth potential
+]
+
+# Upper bound of a semantic cultural score - cosine similarities plus headroom for float32 rounding
+SEMANTIC_CULTURAL_MAX = 1.0 + 1e-3
+# ... and its lower bound (cosine similarities reach -1)
+SEMANTIC_CULTURAL_MIN = -1.0 - 1e-3
+
+# Components reported (as integer percents) in a match's breakdowns
+BREAKDOWN_COMPONENTS = (
+    'skills', 'experience', 'location', 'semantic', 'cultural_fit', 'growth_potential',
+    'cultural_keyword', 'cultural_semantic', 'archetype_match', 'career_stage_match', 'growth_trajectory'
+)
+
+MATCH_GRADES = [(0.9, 'A+'), (0.8, 'A'), (0.7, 'B+'), (0.6, 'B'), (0.5, 'C+'), (0.4, 'C')]
+
+
+def _interned_codes(values):
+    """(int codes array, distinct values in first-seen order) for a list of hashable values"""
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+
+def _clip01(values):
+    # max(0.0, min(1.0, x)) element-wise
+    return np.maximum(0.0, np.minimum(1.0, values))
+
+
+class CandidateFeatures:
+    """Job-independent candidate data as arrays, row i = candidates[i]"""
+
+    # Everything scoring reads, besides the skill matrix: arrays, and the distinct values their codes index
+    ARRAY_FIELDS = (
+        'experience', 'location_codes', 'archetype_codes', 'stage_codes', 'executive_potential',
+        'strategic_mobility', 'learning_velocity', 'growth_potential', 'has_cultural',
+        'cultural_values', 'cultural_valid'
+    )
+    VALUE_FIELDS = ('locations', 'archetypes', 'stages')
+
+    def __init__(self, matcher, candidates, skill_matrix=None):
+        self.candidates = list(candidates)
+        count = len(self.candidates)
+
+        # Skills: sparse candidate x interned-skill matrix (rows aligned with candidates)
+        self.skills = skill_matrix if skill_matrix is not None else SkillMatrix.from_skill_lists(
+            [candidate.get('skills', []) for candidate in self.candidates]
+        )
+
+        self.experience = np.array(
+            [float(candidate.get('experience_years', 0)) for candidate in self.candidates], dtype=np.float64
+        )
+
+        self.location_codes, self.locations = _interned_codes(
+            [candidate.get('location', '') for candidate in self.candidates]
+        )
+
+        growth_metrics = [candidate.get('growth_metrics', {}) for candidate in self.candidates]
+        self.archetype_codes, self.archetypes = _interned_codes(
+            [metrics.get('career_archetype') for metrics in growth_metrics]
+        )
+        self.stage_codes, self.stages = _interned_codes(
+            [metrics.get('career_stage') for metrics in growth_metrics]
+        )
+        self.executive_potential = np.array(
+            [metrics.get('executive_potential', 0.5) for metrics in growth_metrics], dtype=np.float64
+        )
+        self.strategic_mobility = np.array(
+            [metrics.get('strategic_mobility', 0.5) for metrics in growth_metrics], dtype=np.float64
+        )
+        self.learning_velocity = np.array(
+            [candidate.get('learning_velocity', 0.5) for candidate in self.candidates], dtype=np.float64
+        )
+        self.growth_potential = self._growth_potential(matcher, growth_metrics)
+
+        # Cultural attributes: value matrix plus a mask of values usable as numbers
+        attributes = matcher.CULTURAL_ATTRIBUTES
+        self.has_cultural = np.zeros(count, dtype=bool)
+        self.cultural_values = np.full((count, len(attributes)), 0.5, dtype=np.float64)
+        self.cultural_valid = np.ones((count, len(attributes)), dtype=bool)
+        for row, candidate in enumerate(self.candidates):
+            cultural = candidate.get('cultural_attributes', {})
+            if not cultural:
+                continue
+            self.has_cultural[row] = True
+            for column, attr in enumerate(attributes):
+                value = matcher._cultural_attribute_value(cultural.get(attr, 0.5))
+                if value is None:
+                    self.cultural_valid[row, column] = False
+                else:
+                    self.cultural_values[row, column] = value
+
+    def _growth_potential(self, matcher, growth_metrics):
+        """calculate_growth_potential_score for every candidate"""
+        base_scores = np.array(
+            [metrics.get('growth_potential_score', 0) for metrics in growth_metrics], dtype=np.float64
+        ) / 100.0
+        dimensions = [metrics.get('growth_dimensions', {}) for metrics in growth_metrics]
+        has_dimensions = np.array([bool(values) for values in dimensions], dtype=bool)
+        dimension_scores = np.array(
+            [[values.get(dimension, 0) if values else 0 for dimension in matcher.GROWTH_DIMENSIONS] for values in dimensions],
+            dtype=np.float64
+        ).reshape(len(growth_metrics), len(matcher.GROWTH_DIMENSIONS))
+
+        # Summed column by column, as sum() does
+        dimension_total = np.zeros(len(growth_metrics), dtype=np.float64)
+        for column in range(dimension_scores.shape[1]):
+            dimension_total = dimension_total + dimension_scores[:, column]
+        average = dimension_total / len(matcher.GROWTH_DIMENSIONS)
+
+        combined = np.where(has_dimensions, (base_scores * 0.7) + (average * 0.3), base_scores)
+        return _clip01(combined)
+
+    @classmethod
+    def from_arrays(cls, arrays, values, skills):
+        """Features without the candidate records - e.g. over arrays mapped from disk by a worker process"""
+        features = cls.__new__(cls)
+        features.candidates = None
+        features.skills = skills
+        for name in cls.ARRAY_FIELDS:
+            setattr(features, name, arrays[name])
+        for name in cls.VALUE_FIELDS:
+            setattr(features, name, list(values[name]))
+        return features
+
+    def __len__(self):
+        return len(self.experience)
+
+
+class BatchScorer:
+    """Scores jobs against CandidateFeatures with the weights and rules of `matcher` (a SimpleMatcher)"""
+
+    def __init__(self, matcher, location_score_fn=None, skill_matrix_fn=None):
+        self.matcher = matcher
+        # callable(candidates) -> SkillMatrix rows for them, e.g. from the ingest-time skill index
+        self.skill_matrix_fn = skill_matrix_fn
+        self.location_score_fn = location_score_fn or matcher.calculate_global_location_score
+        self._insights = {}
+
+    def candidate_features(self, candidates):
+        candidates = list(candidates)
+        skill_matrix = self.skill_matrix_fn(candidates) if self.skill_matrix_fn else None
+        return CandidateFeatures(self.matcher, candidates, skill_matrix)
+
+    def score_job(self, job, features, rows=None, semantic_scores=None, semantic_cultural_scores=None):
+        """Every score component of `job` against features rows `rows` (all rows when None).
+        semantic_scores / semantic_cultural_scores are aligned with the selected rows.
+        Returns {component: float64 array} including 'total'"""
+        if rows is None:
+            rows = np.arange(len(features))
+        rows = np.asarray(rows, dtype=np.int64)
+        count = len(rows)
+        semantic = np.zeros(count) if semantic_scores is None else np.asarray(semantic_scores, dtype=np.float64)
+        semantic_cultural = (
+            np.full(count, 0.5) if semantic_cultural_scores is None
+            else np.asarray(semantic_cultural_scores, dtype=np.float64)
+        )
+
+        scores = self._base_scores(job, features, rows, semantic)
+        keyword, applies = self._cultural_keyword(job, features, rows)
+        scores.update(self._cultural_scores(keyword, applies, semantic_cultural))
+        scores['total'] = self._total(scores)
+        return scores
+
+    def score_matches(self, job, features, rows, semantic_scores, semantic_cultural_fn, top_k=None):
+        """Everything find_matches reports for one job's shortlist, as plain lists in ranking order (best
+        first, ties by shortlist position): shortlist 'positions', 'total', 'match_grade', percent
+        'breakdown' per component, career 'insights' and 'distance_km' (None where a city is unknown).
+        semantic_cultural_fn(positions) -> semantic cultural scores of those shortlist positions"""
+        rows = np.asarray(rows, dtype=np.int64)
+        positions, scores = self.top_k(
+            job, features, rows, semantic_scores, len(rows) if top_k is None else top_k, semantic_cultural_fn
+        )
+        selected = rows[np.asarray(positions, dtype=np.int64)]
+        trajectories = scores['growth_trajectory'].tolist()
+        distances = gazetteer.distances_km(
+            job.get('location', ''), [features.locations[code] for code in features.location_codes[selected]]
+        )
+        return {
+            'positions': positions,
+            'total': scores['total'].tolist(),
+            'match_grade': match_grades(scores['total']),
+            'breakdown': {name: percent(scores[name]) for name in BREAKDOWN_COMPONENTS},
+            'insights': [
+                self.career_insights(job, features, row, trajectory)
+                for row, trajectory in zip(selected.tolist(), trajectories)
+            ],
+            # Great-circle distance between the job's and the candidate's city
+            'distance_km': [None if np.isnan(distance) else round(float(distance), 1) for distance in distances],
+        }
+
+    def top_k(self, job, features, rows, semantic_scores, k, semantic_cultural_fn, block_size=16):
+        """The k best rows of a shortlist without scoring all of it: (shortlist positions best first,
+        {component: array} for those positions). Same rows, order and values as score_job followed
+        by a stable descending sort cut at k.
+        The cheap components are computed for the whole shortlist; semantic cultural fit - the
+        expensive one, semantic_cultural_fn(positions) -> scores - is only requested, block by block
+        in upper-bound order, while a position can still beat the current k-th total"""
+        rows = np.asarray(rows, dtype=np.int64)
+        count = len(rows)
+        semantic = np.asarray(semantic_scores, dtype=np.float64)
+        if k >= count:
+            scores = self.score_job(
+                job, features, rows, semantic, semantic_cultural_fn(list(range(count))) if count else []
+            )
+            order = np.argsort(-scores['total'], kind='stable')
+            return order.tolist(), {name: values[order] for name, values in scores.items()}
+
+        scores = self._base_scores(job, features, rows, semantic)
+        keyword, applies = self._cultural_keyword(job, features, rows)
+        # Totals with semantic cultural fit at its maximum bound every position's real total from above
+        # (float rounding is monotonic); positions it does not apply to already have their exact total
+        upper = self._total({**scores, **self._cultural_scores(keyword, applies, np.where(applies, SEMANTIC_CULTURAL_MAX, 0.5))})
+
+        semantic_cultural = np.full(count, 0.5)
+        # Min-heap of (total, -position): ties rank by shortlist position, as the stable sort does
+        heap = []
+        order = np.lexsort((np.arange(count), -upper))
+        for start in range(0, count, block_size):
+            first = int(order[start])
+            if len(heap) == k and (float(upper[first]), -first) <= heap[0]:
+                # Upper bounds only decrease from here - nothing left can enter the top k
+                break
+            block = order[start:start + block_size]
+            pending = block[applies[block]]
+            if len(pending):
+                semantic_cultural[pending] = semantic_cultural_fn(pending.tolist())
+            block_scores = {name: values[block] for name, values in scores.items()}
+            block_scores.update(self._cultural_scores(keyword[block], applies[block], semantic_cultural[block]))
+            for position, total in zip(block.tolist(), self._total(block_scores).tolist()):
+                if len(heap) < k:
+                    heapq.heappush(heap, (total, -position))
+                elif (total, -position) > heap[0]:
+                    heapq.heapreplace(heap, (total, -position))
+
+        positions = np.array([-negated for _, negated in sorted(heap, reverse=True)], dtype=np.int64)
+        selected = {name: values[positions] for name, values in scores.items()}
+        selected.update(self._cultural_scores(keyword[positions], applies[positions], semantic_cultural[positions]))
+        selected['total'] = self._total(selected)
+        return positions.tolist(), selected
+
+    def semantic_cultural_positions(self, job, features, rows, semantic_scores, k):
+        """Shortlist positions whose semantic cultural score top_k(..., k, ...) can need - the ones it
+        applies to whose best possible total still reaches the k-th best worst possible total. Any other
+        position ranks below k others whatever its score, so semantic_cultural_fn may answer it with any value"""
+        rows = np.asarray(rows, dtype=np.int64)
+        count = len(rows)
+        keyword, applies = self._cultural_keyword(job, features, rows)
+        if k >= count:
+            return np.flatnonzero(applies).tolist()
+
+        scores = self._base_scores(job, features, rows, np.asarray(semantic_scores, dtype=np.float64))
+        upper = self._total({**scores, **self._cultural_scores(keyword, applies, np.where(applies, SEMANTIC_CULTURAL_MAX, 0.5))})
+        lower = self._total({**scores, **self._cultural_scores(keyword, applies, np.where(applies, SEMANTIC_CULTURAL_MIN, 0.5))})
+        # k-th best (lower total, -position): at least k positions are certain to rank at or above it
+        kth = int(np.lexsort((np.arange(count), -lower))[k - 1])
+        positions = np.arange(count)
+        reaches = (upper > lower[kth]) | ((upper == lower[kth]) & (positions <= kth))
+        return np.flatnonzero(applies & reaches).tolist()
+
+    def _base_scores(self, job, features, rows, semantic):
+        """Every component except cultural fit"""
+        scores = {
+            'skills': self._skill_scores(job, features, rows),
+            'experience': self._experience_scores(job, features, rows),
+            'location': self._location_scores(job, features, rows),
+            'semantic': semantic,
+            'growth_potential': features.growth_potential[rows],
+        }
+        scores.update(self._career_scores(job, features, rows))
+        return scores
+
+    def _total(self, scores):
+        total = None
+        for component, weight in COMPONENT_WEIGHTS:
+            weighted = scores[component] * weight
+            total = weighted if total is None else total + weighted
+        return total
+
+    def score_grid(self, jobs, features, semantic_matrix=None, semantic_cultural_matrix=None):
+        """Full job x candidate grid: {component: (len(jobs), len(features)) array}"""
+        per_job = [
+            self.score_job(
+                job, features,
+                semantic_scores=None if semantic_matrix is None else semantic_matrix[job_index],
+                semantic_cultural_scores=None if semantic_cultural_matrix is None else semantic_cultural_matrix[job_index]
+            )
+            for job_index, job in enumerate(jobs)
+        ]
+        if not per_job:
+            return {}
+        return {component: np.vstack([scores[component] for scores in per_job]) for component in per_job[0]}
+
+    def _skill_scores(self, job, features, rows):
+        # Weighted coverage of the job's skills - one sparse mat-vec over the selected rows
+        skills = features.skills if len(rows) == len(features) and (rows == np.arange(len(rows))).all() else features.skills.take(rows)
+        return skills.weighted_coverage(job.get('required_skills', []), self._skill_weight)
+
+    def _skill_weight(self, skill):
+        return self.matcher.SKILL_WEIGHTS.get(skill, self.matcher.DEFAULT_SKILL_WEIGHT)
+
+    def _experience_scores(self, job, features, rows):
+        required_exp = self.matcher.required_experience(job.get('title', ''))
+        experience = features.experience[rows]
+        return np.where(
+            experience >= required_exp, 1.0,
+            np.where(experience > 0, experience / required_exp, 0.1)
+        )
+
+    def _location_scores(self, job, features, rows):
+        # One location score per distinct candidate location, gathered into the rows
+        job_location = job.get('location', '')
+        by_code = np.array(
+            [self.location_score_fn(job_location, location) for location in features.locations], dtype=np.float64
+        )
+        return by_code[features.location_codes[rows]] if len(by_code) else np.zeros(len(rows))
+
+    def _cultural_keyword(self, job, features, rows):
+        """(keyword cultural score, mask of rows where job and candidate both have cultural attributes)"""
+        count = len(rows)
+        job_cultural = job.get('cultural_attributes', {})
+        if not job_cultural:
+            return np.full(count, 0.5), np.zeros(count, dtype=bool)
+
+        candidate_values = features.cultural_values[rows]
+        candidate_valid = features.cultural_valid[rows]
+        total = np.zeros(count, dtype=np.float64)
+        attributes = self.matcher.CULTURAL_ATTRIBUTES
+        for column, attr in enumerate(attributes):
+            job_score = self.matcher._cultural_attribute_value(job_cultural.get(attr, 0.5))
+            if job_score is None:
+                compatibility = np.full(count, 1 - abs(0.5 - 0.5))
+            else:
+                compatibility = np.where(
+                    candidate_valid[:, column],
+                    1 - np.abs(job_score - candidate_values[:, column]),
+                    1 - abs(0.5 - 0.5)
+                )
+            total = total + compatibility
+        return total / len(attributes), features.has_cultural[rows]
+
+    def _cultural_scores(self, keyword, applies, semantic_cultural):
+        final = (0.7 * keyword) + (0.3 * semantic_cultural)
+        return {
+            'cultural_keyword': np.where(applies, keyword, 0.5),
+            'cultural_semantic': np.where(applies, semantic_cultural, 0.5),
+            'cultural_fit': np.where(applies, final, 0.5),
+        }
+
+    def _career_scores(self, job, features, rows):
+        job_growth = job.get('growth_requirements', {})
+        job_archetype = job_growth.get('role_archetype')
+        job_stage = job_growth.get('target_career_stage')
+
+        # Archetype / stage compatibility is a lookup per distinct candidate value
+        archetype_table = np.array(
+            [self.matcher.archetype_compatibility(job_archetype, archetype) for archetype in features.archetypes],
+            dtype=np.float64
+        )
+        stage_table = np.array(
+            [self.matcher.career_stage_compatibility(job_stage, stage) for stage in features.stages],
+            dtype=np.float64
+        )
+
+        # Growth trajectory (assess_growth_trajectory), step by step
+        trajectory = 0.5 + np.where(
+            features.executive_potential[rows] >= job_growth.get('executive_potential_required', 0.3), 0.2, -0.1
+        )
+        mobility_diff = np.abs(features.strategic_mobility[rows] - job_growth.get('strategic_mobility_preferred', 0.5))
+        trajectory = trajectory + (1 - mobility_diff) * 0.2
+        trajectory = trajectory + np.where(
+            features.learning_velocity[rows] >= job_growth.get('learning_expectations', 0.5), 0.1, 0.0
+        )
+        trajectory = _clip01(trajectory)
+
+        return {
+            'archetype_match': archetype_table[features.archetype_codes[rows]] if len(archetype_table) else np.zeros(len(rows)),
+            'career_stage_match': stage_table[features.stage_codes[rows]] if len(stage_table) else np.zeros(len(rows)),
+            'growth_trajectory': trajectory,
+        }
+
+    def career_insights(self, job, features, row, growth_trajectory):
+        """get_career_alignment_insights for one scored pair - memoized on everything the text depends on"""
+        job_growth = job.get('growth_requirements', {})
+        job_archetype = job_growth.get('role_archetype')
+        job_stage = job_growth.get('target_career_stage')
+        candidate_archetype = features.archetypes[features.archetype_codes[row]]
+        candidate_stage = features.stages[features.stage_codes[row]]
+        trajectory_band = 2 if growth_trajectory >= 0.8 else 1 if growth_trajectory >= 0.6 else 0
+
+        key = (job_archetype, candidate_archetype, job_stage, candidate_stage, trajectory_band)
+        insights = self._insights.get(key)
+        if insights is None:
+            insights = self.matcher.format_career_alignment_insights(
+                job_archetype, candidate_archetype, job_stage, candidate_stage, growth_trajectory
+            )
+            self._insights[key] = insights
+        return list(insights)
+
+
+def match_grades(total_scores):
+    """get_match_grade for an array of total scores"""
+    total_scores = np.asarray(total_scores, dtype=np.float64)
+    return np.select(
+        [total_scores >= threshold for threshold, _ in MATCH_GRADES],
+        [grade for _, grade in MATCH_GRADES],
+        default='D'
+    ).tolist()
+
+
+def percent(values):
+    """int(x * 100) for an array of scores, as Python ints"""
+    return (np.asarray(values, dtype=np.float64) * 100).astype(np.int64).tolist()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+📏 VECTOR INDEX BENCHMARK - Recall@k and Query Latency Across Index Settings
+Builds a throwaway Chroma collection per (space, M, construction_ef, search_ef) setting from the
+candidate vectors in ./chroma_db (or synthetic ones), then reports recall@k against exact search
+and p50/p99 single-query latency, next to the NumPy backend at each storage precision
+(float32 / float16 / int8, with and without the full-precision rescoring pass) and its matrix size.
+
+to invoke:  python benchmark_vector_index.py
+            python benchmark_vector_index.py --synthetic 50000 --spaces cosine,ip --m 16,32 --search-ef 10,50,100
+            python benchmark_vector_index.py --precisions float32,int8 --spaces l2 --search-ef 10
+"""
+
+import argparse
+import itertools
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import chromadb
+
+from vector_db import index_metadata, DISTANCE_SPACES
+from vector_backends import NumpyBackend, PRECISIONS
+
+# Chroma rejects very large add() batches
+ADD_BATCH_SIZE = 5000
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(',') if value]
+
+
+def load_stored_vectors(persist_directory, max_candidates):
+    """Candidate vectors (and job vectors as queries) already in the vector DB"""
+    from vector_db import ChromaVectorDB
+    db = ChromaVectorDB(persist_directory=persist_directory)
+
+    def collect(collection, limit):
+        vectors = []
+        offset = 0
+        while len(vectors) < limit:
+            page = collection.get(include=['embeddings'], limit=min(1000, limit - len(vectors)), offset=offset)
+            if not page['ids']:
+                break
+            vectors.extend(np.asarray(page['embeddings'], dtype=np.float32))
+            offset += len(page['ids'])
+        return np.asarray(vectors, dtype=np.float32)
+
+    return collect(db.candidates_collection, max_candidates), collect(db.jobs_collection, max_candidates)
+
+
+def synthetic_vectors(count, dim, seed=7, clusters=64):
+    """Clustered unit vectors - closer to real embedding neighbourhoods than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size=count)] + 0.35 * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_queries(candidates, jobs, count, seed=11):
+    """Job vectors when there are enough, topped up with perturbed candidate vectors"""
+    rng = np.random.default_rng(seed)
+    queries = list(jobs[:count])
+    if len(queries) < count:
+        picks = candidates[rng.integers(0, len(candidates), size=count - len(queries))]
+        noisy = picks + 0.2 * rng.normal(size=picks.shape).astype(np.float32)
+        queries.extend(noisy / np.linalg.norm(noisy, axis=1, keepdims=True))
+    return np.asarray(queries, dtype=np.float32)
+
+
+def exact_top_k(candidates, queries, k):
+    """Ground truth: for unit vectors l2, cosine and ip all rank by the dot product"""
+    similarities = queries @ candidates.T
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def percentiles(latencies):
+    return np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000
+
+
+def bench_chroma(candidates, queries, truth, k, space, m, construction_ef, search_ef):
+    directory = tempfile.mkdtemp(prefix="vector_bench_")
+    try:
+        client = chromadb.PersistentClient(path=directory)
+        collection = client.create_collection(
+            name="bench",
+            metadata=index_metadata({'space': space, 'M': m, 'construction_ef': construction_ef, 'search_ef': search_ef})
+        )
+        started = time.perf_counter()
+        for start in range(0, len(candidates), ADD_BATCH_SIZE):
+            chunk = candidates[start:start + ADD_BATCH_SIZE]
+            collection.add(
+                ids=[str(start + row) for row in range(len(chunk))],
+                embeddings=chunk.tolist()
+            )
+        build_seconds = time.perf_counter() - started
+
+        latencies = []
+        hits = 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=['distances'])
+            latencies.append(time.perf_counter() - started)
+            hits += len(expected & set(int(record_id) for record_id in result['ids'][0]))
+        return hits / (k * len(queries)), percentiles(latencies), build_seconds
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_numpy(candidates, queries, truth, k, precision='float32', rescore=True):
+    directory = tempfile.mkdtemp(prefix="vector_bench_")
+    try:
+        backend = NumpyBackend(directory, precision=precision, rescore=rescore)
+        started = time.perf_counter()
+        backend.add(list(range(len(candidates))), candidates)
+        build_seconds = time.perf_counter() - started
+        stats = backend.stats()
+
+        latencies = []
+        hits = 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            result = backend.search([query], k)
+            latencies.append(time.perf_counter() - started)
+            hits += len(expected & set(int(record_id) for record_id in result['ids'][0]))
+
+        # Batch matching path: every query in one matmul
+        started = time.perf_counter()
+        backend.search(queries, k)
+        batch_seconds = time.perf_counter() - started
+        return hits / (k * len(queries)), percentiles(latencies), build_seconds, batch_seconds, stats
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k / latency benchmark for vector index settings")
+    parser.add_argument('--persist-directory', default='./chroma_db')
+    parser.add_argument('--synthetic', type=int, default=0, help="use N synthetic vectors instead of stored ones")
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--max-candidates', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--spaces', default=','.join(DISTANCE_SPACES))
+    parser.add_argument('--m', default='16')
+    parser.add_argument('--construction-ef', default='100')
+    parser.add_argument('--search-ef', default='10,50,100')
+    parser.add_argument('--precisions', default=','.join(PRECISIONS), help="numpy backend storage precisions")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        candidates, jobs = synthetic_vectors(args.synthetic, args.dim), np.zeros((0, args.dim), dtype=np.float32)
+    else:
+        candidates, jobs = load_stored_vectors(args.persist_directory, args.max_candidates)
+        if len(candidates) == 0:
+            print("❌ No stored candidate vectors - run with --synthetic N")
+            return
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    queries = make_queries(candidates, jobs, args.queries)
+    k = min(args.k, len(candidates))
+    truth = exact_top_k(candidates, queries, k)
+
+    print("📏 VECTOR INDEX BENCHMARK")
+    print("=" * 86)
+    print(f"   {len(candidates)} candidate vectors x {candidates.shape[1]} dims, {len(queries)} queries, recall@{k}")
+    print()
+    print(f"{'backend':<8} {'space':<10} {'M':>4} {'c_ef':>5} {'s_ef':>5} {'recall':>8} {'p50 ms':>8} {'p99 ms':>8} {'build s':>8}")
+    print("-" * 86)
+
+    batch_seconds = None
+    precision_rows = []
+    for precision in args.precisions.split(','):
+        for rescore in ((True, False) if precision != 'float32' else (True,)):
+            recall, (p50, p99), build_seconds, seconds, stats = bench_numpy(
+                candidates, queries, truth, k, precision, rescore
+            )
+            label = precision if precision == 'float32' else f"{precision}{'+rs' if rescore else ''}"
+            print(f"{'numpy':<8} {label:<10} {'-':>4} {'-':>5} {'-':>5} {recall:>8.4f} {p50:>8.2f} {p99:>8.2f} {build_seconds:>8.2f}")
+            precision_rows.append((label, recall, stats['vector_bytes'], stats['rescore_bytes']))
+            if precision == 'float32':
+                batch_seconds = seconds
+
+    settings = itertools.product(
+        args.spaces.split(','), _int_list(args.m), _int_list(args.construction_ef), _int_list(args.search_ef)
+    )
+    for space, m, construction_ef, search_ef in settings:
+        recall, (p50, p99), build_seconds = bench_chroma(candidates, queries, truth, k, space, m, construction_ef, search_ef)
+        print(f"{'chroma':<8} {space:<10} {m:>4} {construction_ef:>5} {search_ef:>5} "
+              f"{recall:>8.4f} {p50:>8.2f} {p99:>8.2f} {build_seconds:>8.2f}")
+
+    print()
+    if batch_seconds is not None:
+        print(f"   numpy batch search, all {len(queries)} queries in one matmul: {batch_seconds * 1000:.1f} ms")
+    # Recall loss of reduced precision, relative to float32 exact search (recall 1.0). The searched matrix is
+    # what every query scans; the rescore copy is memory-mapped and paged in only for shortlisted rows
+    for label, recall, vector_bytes, rescore_bytes in precision_rows:
+        print(f"   {label:<10} matrix {vector_bytes / 1024 / 1024:>8.1f} MB   rescore copy {rescore_bytes / 1024 / 1024:>8.1f} MB"
+              f"   recall loss {(1.0 - recall) * 100:>6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
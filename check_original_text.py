@@ -3,16 +3,17 @@ sys.path.append('.')
 from chroma_data_manager import ChromaDataManager
 
 db = ChromaDataManager()
-jobs = db.load_jobs()
+jobs = db.load_jobs(fields=['title', 'description'])
 
 if jobs:
-    job = jobs[0]
+    # Original text lives in the document side store - fetched explicitly
+    job = db.get_job(jobs[0]['id'], include_original_text=True)
     print("Job data fields:")
     print(f"  title: {job.get('title')}")
     print(f"  description length: {len(job.get('description', ''))}")
     print(f"  original_job_text length: {len(job.get('original_job_text', ''))}")
-    print(f"  original_job_text present: {'original_job_text' in job}")
-    if 'original_job_text' in job:
+    print(f"  original_job_text present: {bool(job.get('original_job_text'))}")
+    if job.get('original_job_text'):
         print(f"  First 200 chars: {job['original_job_text'][:200]}...")
 else:
     print("No jobs found")
@@ -1,44 +1,127 @@
 # 🗃️ CHROMA DATA MANAGER - Enhanced with Growth Data & Job Requirements
 # Fixed data integrity issue - preserves Groq AI extracted data
 
-from vector_db import vector_db
+from vector_db import vector_db, QUALITY_LEVELS, MIN_CULTURAL_CONTEXT_LENGTH
+from cultural_context import extract_cultural_context
+from embedding_cache import normalize_text
+from record_cache import RecordCache
 import json
+import time
 
 class ChromaDataManager:
     def __init__(self):
+        # Decoded records are served from memory (as shallow copies) until their collection is written to
+        self.record_cache = RecordCache(vector_db.get_version)
         print(f"✅ Enhanced Chroma Data Manager initialized with job requirements support!")
     
-    def load_jobs(self):
-        """Get all jobs from Chroma DB - NOW WITH ENHANCED DATA"""
-        try:
-            jobs = vector_db.get_all_jobs()
-            print(f"📁 Loaded {len(jobs)} jobs from Chroma DB with enhanced data")
-            
+    def _project(self, record, fields):
+        """Projection of a cached record to `fields` ('id' is always included)"""
+        projected = {'id': record['id']}
+        for field in fields:
+            if field in record:
+                projected[field] = record[field]
+        return projected
+    
+    def _load_all(self, record_type, fields=None):
+        """Full listing of a collection - from the record cache when it is current, else read through"""
+        records = self.record_cache.get_all(record_type)
+        if records is not None:
+            return records if fields is None else [self._project(record, fields) for record in records]
+        
+        if record_type == 'jobs':
+            load_fn, count_fn = vector_db.get_all_jobs, vector_db.get_job_count
+        else:
+            load_fn, count_fn = vector_db.get_all_candidates, vector_db.get_candidate_count
+        if fields is not None:
+            # Cold cache: let the store do the projection, cache only full records
+            return load_fn(fields=fields)
+        
+        version = self.record_cache.version(record_type)
+        records = load_fn()
+        if record_type == 'jobs':
             # ENSURE backward compatibility - add missing fields if needed
-            for job in jobs:
+            for job in records:
                 self._ensure_job_data_backward_compatibility(job)
-                
+        # A failed read comes back as [] - only cache listings that cover the whole collection
+        if len(records) == count_fn():
+            self.record_cache.put_all(record_type, records, version)
+        return records
+    
+    def _get_records(self, record_type, record_ids):
+        """{id: full record} for the given ids - cached ones from memory, the rest in one get_many"""
+        records, missing = self.record_cache.get_many(record_type, record_ids)
+        if missing:
+            version = self.record_cache.version(record_type)
+            fetched = vector_db.get_many(missing, record_type)
+            if record_type == 'jobs':
+                for job in fetched:
+                    self._ensure_job_data_backward_compatibility(job)
+            self.record_cache.put_many(record_type, fetched, version)
+            records.update((int(record['id']), record) for record in fetched)
+        return records
+    
+    def load_jobs(self, fields=None):
+        """Get all jobs from Chroma DB - NOW WITH ENHANCED DATA
+        fields: optional projection, e.g. ['title', 'quality_assessment'] ('id' is always included)"""
+        try:
+            jobs = self._load_all('jobs', fields)
+            print(f"📁 Loaded {len(jobs)} jobs from Chroma DB with enhanced data")
             return jobs
         except Exception as e:
             print(f"❌ Error loading jobs from Chroma DB: {e}")
             return []
     
-    def load_candidates(self):
-        """Get all candidates from Chroma DB - WITH GROWTH DATA"""
+    def load_candidates(self, fields=None):
+        """Get all candidates from Chroma DB - WITH GROWTH DATA
+        fields: optional projection, e.g. ['name', 'growth_metrics'] ('id' is always included)"""
         try:
-            candidates = vector_db.get_all_candidates()
+            candidates = self._load_all('candidates', fields)
             print(f"📁 Loaded {len(candidates)} candidates from Chroma DB with growth data")
             return candidates
         except Exception as e:
             print(f"❌ Error loading candidates from Chroma DB: {e}")
             return []
     
+    def iter_jobs(self, batch_size=500, where=None, fields=None):
+        """Stream jobs from Chroma DB page by page instead of loading them all at once
+        (served from the record cache when the full listing is cached and no filter is given)"""
+        cached = self.record_cache.get_all('jobs') if where is None else None
+        if cached is not None:
+            for job in cached:
+                yield job if fields is None else self._project(job, fields)
+            return
+        for job in vector_db.iter_jobs(batch_size=batch_size, where=where, fields=fields):
+            # ENSURE backward compatibility - add missing fields if needed (full records only)
+            if fields is None:
+                self._ensure_job_data_backward_compatibility(job)
+            yield job
+    
+    def iter_candidates(self, batch_size=500, where=None, fields=None):
+        """Stream candidates from Chroma DB page by page instead of loading them all at once
+        (served from the record cache when the full listing is cached and no filter is given)"""
+        cached = self.record_cache.get_all('candidates') if where is None else None
+        if cached is not None:
+            for candidate in cached:
+                yield candidate if fields is None else self._project(candidate, fields)
+            return
+        yield from vector_db.iter_candidates(batch_size=batch_size, where=where, fields=fields)
+    
+    def find_matches_for_jobs(self, jobs, top_k=20, where=None):
+        """Semantic candidate search for many jobs - hit candidates come from the record cache"""
+        return vector_db.find_matches_for_jobs(
+            jobs, top_k=top_k, where=where,
+            record_lookup=lambda ids: self._get_records('candidates', ids)
+        )
+    
+    def find_matches_for_job(self, job, top_k=20, where=None):
+        """Semantic candidate search for one job - hit candidates come from the record cache"""
+        return self.find_matches_for_jobs([job], top_k=top_k, where=where)[0]
+    
     def add_job(self, job_data):
         """Add a new job to Chroma DB with complete job structure - ENHANCED"""
         try:
-            # Get next ID from existing jobs
-            existing_jobs = vector_db.get_all_jobs()
-            new_id = max([j['id'] for j in existing_jobs]) + 1 if existing_jobs else 1
+            # Get next ID from the persisted job sequence
+            new_id = vector_db.allocate_job_ids()
             
             # ENSURE backward compatibility for existing job data
             self._ensure_job_data_backward_compatibility(job_data)
@@ -70,6 +153,8 @@ class ChromaDataManager:
             # Add to Chroma DB
             success = vector_db.add_job(complete_job)
             if success:
+                # Precompute cultural context embedding so matching needs no model inference
+                vector_db.add_cultural_context('job', new_id, extract_cultural_context(complete_job))
                 print(f"✅ Added new job to Chroma DB with enhanced data: {complete_job['title']} (ID: {new_id})")
                 print(f"   Quality Level: {complete_job['quality_assessment'].get('quality_level', 'unknown')}")
                 print(f"   AI Job Profile: {'Yes' if complete_job.get('ai_job_profile') else 'No'}")
@@ -85,9 +170,8 @@ class ChromaDataManager:
     def add_candidate(self, candidate_data):
         """Add a new candidate to Chroma DB - ENHANCED WITH GROWTH DATA"""
         try:
-            # Get next ID
-            existing_candidates = vector_db.get_all_candidates()
-            new_id = max([c['id'] for c in existing_candidates]) + 1 if existing_candidates else 1
+            # Get next ID from the persisted candidate sequence
+            new_id = vector_db.allocate_candidate_ids()
             candidate_data['id'] = new_id
 
             # ENHANCED: Ensure all required fields are included WITHOUT overwriting existing data
@@ -96,6 +180,8 @@ class ChromaDataManager:
             # Add to Chroma DB
             success = vector_db.add_candidate(candidate_data)
             if success:
+                # Precompute cultural context embedding so matching needs no model inference
+                vector_db.add_cultural_context('candidate', new_id, extract_cultural_context(candidate_data))
                 print(f"✅ Added new candidate to Chroma DB with growth data: {candidate_data['name']} (ID: {new_id})")
                 
                 # DEBUG: Verify work_experience is preserved
@@ -237,52 +323,96 @@ class ChromaDataManager:
         if work_exp and len(work_exp) > 0:
             print(f"   ✅ Preserving {len(work_exp)} work experience entries from Groq AI")
     
-    def add_candidates_batch(self, candidates_data):
-        """Add multiple candidates to Chroma DB - ENHANCED WITH GROWTH DATA"""
+    def add_candidates_batch(self, candidates_data, batch_size=64, chunk_size=1000):
+        """Add multiple candidates to Chroma DB - ENHANCED WITH GROWTH DATA
+        Bulk path: one id block, batched encoding and chunked collection writes"""
         try:
-            candidate_ids = []
+            if not candidates_data:
+                return []
             
-            for candidate_data in candidates_data:
+            start_time = time.time()
+            
+            # Reserve one contiguous block of ids for the whole batch
+            first_id = vector_db.allocate_candidate_ids(len(candidates_data))
+            for offset, candidate_data in enumerate(candidates_data):
+                candidate_data['id'] = first_id + offset
                 # ENHANCED: Ensure growth data integrity WITHOUT overwriting
                 self._ensure_candidate_data_integrity(candidate_data)
-                
-                candidate_id = self.add_candidate(candidate_data)
-                if candidate_id:
-                    candidate_ids.append(candidate_id)
             
-            print(f"✅ Added {len(candidate_ids)} candidates to Chroma DB with growth data")
+            candidate_ids = vector_db.add_candidates_bulk(candidates_data, batch_size=batch_size, chunk_size=chunk_size)
+            
+            # Precompute cultural context embeddings for everything that was written
+            added = set(candidate_ids)
+            contexts = {c['id']: extract_cultural_context(c) for c in candidates_data if c['id'] in added}
+            stored = vector_db.add_cultural_contexts_batch('candidate', contexts, batch_size=batch_size, chunk_size=chunk_size)
+            # Contexts too short to embed are skipped on purpose - anything else missing failed to store
+            expected = sum(1 for text in contexts.values() if len(normalize_text(text)) >= MIN_CULTURAL_CONTEXT_LENGTH)
+            
+            elapsed = time.time() - start_time
+            rate = len(candidate_ids) / elapsed if elapsed > 0 else 0.0
+            print(f"✅ Added {len(candidate_ids)} candidates to Chroma DB with growth data "
+                  f"in {elapsed:.1f}s ({rate:.1f} candidates/s), {stored} cultural context vectors stored")
+            if stored < expected:
+                print(f"⚠️ {expected - stored} of {expected} cultural context vectors failed to store - "
+                      f"cultural fit falls back to encoding for those candidates (see backfill_cultural_contexts)")
             return candidate_ids
             
         except Exception as e:
             print(f"❌ Error adding candidates batch: {e}")
             return []
     
-    def get_candidate_with_growth_data(self, candidate_id):
-        """Get a specific candidate with full growth data"""
+    def backfill_cultural_contexts(self, batch_size=500):
+        """Precompute cultural context embeddings for records added before ingest-time precomputation"""
+        stored = 0
+        for record_type, records in (('job', self.iter_jobs(batch_size=batch_size)),
+                                     ('candidate', self.iter_candidates(batch_size=batch_size))):
+            pending = {}
+            for record in records:
+                pending[record['id']] = extract_cultural_context(record)
+                if len(pending) >= batch_size:
+                    stored += vector_db.add_cultural_contexts_batch(record_type, pending)
+                    pending = {}
+            if pending:
+                stored += vector_db.add_cultural_contexts_batch(record_type, pending)
+        print(f"✅ Backfilled {stored} cultural context embeddings")
+        return stored
+
+    def get_candidate_with_growth_data(self, candidate_id, include_original_text=False):
+        """Get a specific candidate with full growth data (and the raw resume text when asked for)"""
         try:
-            candidates = self.load_candidates()
-            for candidate in candidates:
-                if candidate['id'] == candidate_id:
-                    # ENHANCED: Verify growth data is present
-                    self._ensure_candidate_data_integrity(candidate)
-                    return candidate
-            return None
+            # Direct lookup by id - no collection scan, served from the record cache when current
+            candidate = self._get_records('candidates', [candidate_id]).get(int(candidate_id))
+            if candidate is not None:
+                # Own copy - cached records are shared
+                candidate = dict(candidate)
+                if include_original_text:
+                    candidate['original_resume_text'] = vector_db.get_original_text('candidates', candidate_id)
+                # ENHANCED: Verify growth data is present
+                self._ensure_candidate_data_integrity(candidate)
+            return candidate
         except Exception as e:
             print(f"❌ Error getting candidate with growth data: {e}")
             return None
     
-    def get_candidates_by_growth_potential(self, min_score=0):
-        """Get candidates filtered by growth potential score"""
+    def get_job(self, job_id, include_original_text=False):
+        """Get a specific job with full enhanced data (and the raw job text when asked for)"""
         try:
-            candidates = self.load_candidates()
-            filtered_candidates = []
-            
-            for candidate in candidates:
-                growth_metrics = candidate.get('growth_metrics', {})
-                growth_score = growth_metrics.get('growth_potential_score', 0)
-                
-                if growth_score >= min_score:
-                    filtered_candidates.append(candidate)
+            job = self._get_records('jobs', [job_id]).get(int(job_id))
+            if job is not None:
+                # Own copy - cached records are shared
+                job = dict(job)
+                if include_original_text:
+                    job['original_job_text'] = vector_db.get_original_text('jobs', job_id)
+            return job
+        except Exception as e:
+            print(f"❌ Error getting job: {e}")
+            return None
+    
+    def get_candidates_by_growth_potential(self, min_score=0, fields=None):
+        """Get candidates filtered by growth potential score (filtered inside Chroma)"""
+        try:
+            where = {'growth_potential_score': {'$gte': float(min_score)}} if min_score > 0 else None
+            filtered_candidates = list(self.iter_candidates(where=where, fields=fields))
             
             print(f"✅ Found {len(filtered_candidates)} candidates with growth potential >= {min_score}")
             return filtered_candidates
@@ -290,18 +420,12 @@ class ChromaDataManager:
             print(f"❌ Error filtering by growth potential: {e}")
             return []
     
-    def get_jobs_by_quality(self, min_quality='medium'):
-        """Get jobs filtered by quality level - NEW"""
+    def get_jobs_by_quality(self, min_quality='medium', fields=None):
+        """Get jobs filtered by quality level - NEW (filtered inside Chroma)"""
         try:
-            jobs = self.load_jobs()
-            quality_levels = ['very_low', 'low', 'medium', 'high']
-            min_quality_index = quality_levels.index(min_quality)
-            
-            filtered_jobs = []
-            for job in jobs:
-                quality_level = job.get('quality_assessment', {}).get('quality_level', 'medium')
-                if quality_levels.index(quality_level) >= min_quality_index:
-                    filtered_jobs.append(job)
+            min_quality_index = QUALITY_LEVELS.index(min_quality)
+            where = {'quality_rank': {'$gte': min_quality_index}}
+            filtered_jobs = list(self.iter_jobs(where=where, fields=fields))
             
             print(f"✅ Found {len(filtered_jobs)} jobs with quality >= {min_quality}")
             return filtered_jobs
@@ -312,32 +436,37 @@ class ChromaDataManager:
     def get_vector_db_stats(self):
         """Get statistics about the vector database - ENHANCED WITH JOB METRICS"""
         try:
-            jobs = self.load_jobs()
-            candidates = self.load_candidates()
-            
-            # Calculate growth metrics statistics
-            growth_scores = [c.get('growth_metrics', {}).get('growth_potential_score', 0) for c in candidates]
-            avg_growth_score = sum(growth_scores) / len(growth_scores) if growth_scores else 0
-            high_growth_candidates = len([score for score in growth_scores if score >= 70])
+            # Stream only the fields the stats need - no resume text, no unused JSON decoding
+            candidate_total = 0
+            growth_score_sum = 0
+            high_growth_candidates = 0
+            candidates_with_work_exp = 0
+            for candidate in self.iter_candidates(fields=['growth_metrics', 'work_experience']):
+                growth_score = candidate.get('growth_metrics', {}).get('growth_potential_score', 0)
+                candidate_total += 1
+                growth_score_sum += growth_score
+                if growth_score >= 70:
+                    high_growth_candidates += 1
+                # NEW: Count candidates with actual work experience data
+                if candidate.get('work_experience') and len(candidate['work_experience']) > 0:
+                    candidates_with_work_exp += 1
+            avg_growth_score = growth_score_sum / candidate_total if candidate_total else 0
             
-            # NEW: Count candidates with actual work experience data
-            candidates_with_work_exp = len([c for c in candidates if c.get('work_experience') and len(c['work_experience']) > 0])
-            
-            # NEW: Job quality statistics
-            quality_levels = [j.get('quality_assessment', {}).get('quality_level', 'medium') for j in jobs]
-            quality_counts = {
-                'high': quality_levels.count('high'),
-                'medium': quality_levels.count('medium'),
-                'low': quality_levels.count('low'),
-                'very_low': quality_levels.count('very_low')
-            }
-            
-            # NEW: AI Job Profile statistics
-            jobs_with_ai_profile = len([j for j in jobs if j.get('ai_job_profile') and j['ai_job_profile'].get('role_overview')])
+            # NEW: Job quality and AI Job Profile statistics
+            jobs_total = 0
+            quality_counts = {'high': 0, 'medium': 0, 'low': 0, 'very_low': 0}
+            jobs_with_ai_profile = 0
+            for job in self.iter_jobs(fields=['quality_assessment', 'ai_job_profile']):
+                jobs_total += 1
+                quality_level = job.get('quality_assessment', {}).get('quality_level', 'medium')
+                if quality_level in quality_counts:
+                    quality_counts[quality_level] += 1
+                if job.get('ai_job_profile') and job['ai_job_profile'].get('role_overview'):
+                    jobs_with_ai_profile += 1
             
             return {
                 'candidates_in_vector_db': vector_db.get_candidate_count(),
-                'jobs_count': len(jobs),
+                'jobs_count': jobs_total,
                 'average_growth_potential': round(avg_growth_score, 1),
                 'high_growth_candidates': high_growth_candidates,
                 'candidates_with_career_data': candidates_with_work_exp,  # FIXED: Use actual work experience count
@@ -347,13 +476,13 @@ class ChromaDataManager:
                 'needs_improvement_jobs': quality_counts['low'] + quality_counts['very_low'],
                 # NEW: AI Job Profile metrics
                 'jobs_with_ai_profile': jobs_with_ai_profile,
-                'ai_profile_coverage': round((jobs_with_ai_profile / len(jobs)) * 100, 1) if jobs else 0
+                'ai_profile_coverage': round((jobs_with_ai_profile / jobs_total) * 100, 1) if jobs_total else 0
             }
         except Exception as e:
             print(f"❌ Error getting enhanced stats: {e}")
             return {
                 'candidates_in_vector_db': vector_db.get_candidate_count(),
-                'jobs_count': len(self.load_jobs()),
+                'jobs_count': vector_db.get_job_count(),
                 'average_growth_potential': 0,
                 'high_growth_candidates': 0,
                 'candidates_with_career_data': 0,
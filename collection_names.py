@@ -0,0 +1,102 @@
+"""
+🏷️ COLLECTION NAMES - Active Chroma Collection per Record Type
+rebuild_collection() swaps in freshly named collections; this file-backed pointer says which one is live.
+Swapped-out collections are listed as retired (with the time of the swap) until they are dropped, and
+writers hold collection_write_lock() so no write lands in a collection while it is being swapped out
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+
+DEFAULT_COLLECTION_NAMES = {'candidates': 'candidates', 'jobs': 'jobs'}
+
+# Seconds a writer waits for the lock - rebuild_collection() holds it for its final catch-up and the swap
+WRITE_LOCK_TIMEOUT = 300
+
+
+def _names_path(persist_directory):
+    return os.path.join(persist_directory, "collection_names.json")
+
+
+def _read(persist_directory):
+    path = _names_path(persist_directory)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as names_file:
+        return json.load(names_file)
+
+
+def _write(persist_directory, data):
+    # Written to a temp file and renamed, so readers never see a partial file
+    path = _names_path(persist_directory)
+    with open(path + ".tmp", 'w') as names_file:
+        json.dump(data, names_file)
+    os.replace(path + ".tmp", path)
+
+
+def load_collection_names(persist_directory="./chroma_db"):
+    """Active collection name per record type"""
+    data = _read(persist_directory)
+    return {record_type: data.get(record_type, name) for record_type, name in DEFAULT_COLLECTION_NAMES.items()}
+
+
+def save_collection_names(persist_directory, names):
+    """Persist the active collection names (retired collections are kept as they are)"""
+    _write(persist_directory, {**_read(persist_directory), **names})
+
+
+def collection_names_signature(persist_directory="./chroma_db"):
+    """Cheap change marker of the names file (one stat) - differs after every swap, in any process"""
+    try:
+        stat = os.stat(_names_path(persist_directory))
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def swap_collection(persist_directory, record_type, name):
+    """Make `name` the live collection of a record type and retire the previous one - call under
+    collection_write_lock(). The old collection stays until drop time, for processes still reading it"""
+    data = _read(persist_directory)
+    old_name = data.get(record_type, DEFAULT_COLLECTION_NAMES[record_type])
+    retired = dict(data.get('retired', {}))
+    if old_name != name:
+        retired[old_name] = time.time()
+    _write(persist_directory, {**data, record_type: name, 'retired': retired})
+    return old_name
+
+
+def retired_collections(persist_directory="./chroma_db", min_age=0):
+    """Names of collections swapped out at least `min_age` seconds ago"""
+    now = time.time()
+    return [name for name, retired_at in _read(persist_directory).get('retired', {}).items() if now - retired_at >= min_age]
+
+
+def forget_retired_collections(persist_directory, names):
+    """Remove dropped collections from the retired list"""
+    data = _read(persist_directory)
+    retired = {name: retired_at for name, retired_at in data.get('retired', {}).items() if name not in set(names)}
+    _write(persist_directory, {**data, 'retired': retired})
+
+
+@contextmanager
+def collection_write_lock(persist_directory="./chroma_db"):
+    """Cross-process lock around writes to the live candidates/jobs collections (not reentrant).
+    A SQLite write transaction on a lock file - other processes and threads wait in BEGIN IMMEDIATE"""
+    with closing(sqlite3.connect(
+        os.path.join(persist_directory, "collection_lock.sqlite3"), timeout=WRITE_LOCK_TIMEOUT, isolation_level=None
+    )) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        finally:
+            conn.execute("ROLLBACK")
+
+
+def active_collection_name(record_type, persist_directory="./chroma_db"):
+    """Name of the live 'candidates' or 'jobs' collection (for scripts that open Chroma directly -
+    resolve it under collection_write_lock() before writing)"""
+    return load_collection_names(persist_directory)[record_type]
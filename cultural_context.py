@@ -0,0 +1,30 @@
+"""
+🌱 CULTURAL CONTEXT - Descriptive Text Behind Semantic Cultural Fit
+Shared by ingest (to precompute context embeddings) and the matcher (to verify they are current)
+"""
+
+
+def extract_cultural_context(data):
+    """Extract cultural-relevant text from job or candidate data"""
+    cultural_text_parts = []
+
+    cultural_attrs = data.get('cultural_attributes', {})
+    # Extract from cultural attributes if available
+    if cultural_attrs:
+        # Convert numerical scores to descriptive text for semantic analysis
+        for attr, value in cultural_attrs.items():
+            if isinstance(value, (list, tuple)) and len(value) > 0:
+                score = value[0]
+                if score >= 0.7:
+                    cultural_text_parts.append(f"strong {attr}")
+                elif score >= 0.6:
+                    cultural_text_parts.append(f"moderate {attr}")
+                elif score <= 0.4:
+                    cultural_text_parts.append(f"low {attr}")
+
+    # Add general description for broader context
+    description = data.get('description', '') or data.get('summary', '') or data.get('role', '')
+    if description:
+        cultural_text_parts.append(description)
+
+    return " ".join(cultural_text_parts) if cultural_text_parts else ""
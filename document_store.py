@@ -0,0 +1,116 @@
+"""
+📄 DOCUMENT STORE - Compressed Side Store for Raw Resume / Job Text
+Large original documents live here, keyed by record id, instead of in Chroma metadata -
+list and query results stay small and the text is only read when explicitly requested
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import closing
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+class DocumentStore:
+    def __init__(self, path, compression_level=6):
+        self.path = path
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "record_type TEXT NOT NULL, record_id INTEGER NOT NULL, "
+                "codec TEXT NOT NULL, body BLOB NOT NULL, "
+                "PRIMARY KEY (record_type, record_id))"
+            )
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe across threads and processes.
+        # Callers close it with closing() - `with conn` alone only commits or rolls back
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _compress(self, text):
+        data = text.encode('utf-8')
+        if ZSTD_AVAILABLE:
+            return 'zstd', zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return 'zlib', zlib.compress(data, self.compression_level)
+
+    def _decompress(self, codec, body):
+        if codec == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise ValueError("Document was compressed with zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(body).decode('utf-8')
+        return zlib.decompress(body).decode('utf-8')
+
+    def put_many(self, record_type, documents):
+        """Store {record_id: text}, replacing existing documents. Empty texts are removed instead"""
+        rows = []
+        empty_ids = []
+        for record_id, text in documents.items():
+            if text:
+                codec, body = self._compress(text)
+                rows.append((record_type, int(record_id), codec, body))
+            else:
+                empty_ids.append((record_type, int(record_id)))
+        if not rows and not empty_ids:
+            return 0
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (record_type, record_id, codec, body) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            conn.executemany("DELETE FROM documents WHERE record_type = ? AND record_id = ?", empty_ids)
+        return len(rows)
+
+    def put(self, record_type, record_id, text):
+        return self.put_many(record_type, {record_id: text}) == 1
+
+    def get_many(self, record_type, record_ids):
+        """Return {record_id: text} for the ids that have a stored document"""
+        record_ids = [int(record_id) for record_id in record_ids]
+        documents = {}
+        with closing(self._connect()) as conn:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(record_ids), 500):
+                chunk = record_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT record_id, codec, body FROM documents WHERE record_type = ? AND record_id IN ({placeholders})",
+                    [record_type, *chunk]
+                )
+                for record_id, codec, body in rows:
+                    documents[record_id] = self._decompress(codec, body)
+        return documents
+
+    def get(self, record_type, record_id):
+        """Stored text for one record, or None"""
+        return self.get_many(record_type, [record_id]).get(int(record_id))
+
+    def delete(self, record_type, record_ids=None):
+        """Remove documents for the given ids, or every document of `record_type` when ids is None"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            if record_ids is None:
+                conn.execute("DELETE FROM documents WHERE record_type = ?", (record_type,))
+            else:
+                conn.executemany(
+                    "DELETE FROM documents WHERE record_type = ? AND record_id = ?",
+                    [(record_type, int(record_id)) for record_id in record_ids]
+                )
+
+    def stats(self):
+        """Document counts and stored (compressed) bytes per record type"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT record_type, COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM documents GROUP BY record_type"
+            ).fetchall()
+        return {record_type: {'documents': count, 'stored_bytes': size} for record_type, count, size in rows}
@@ -0,0 +1,174 @@
+"""
+💾 EMBEDDING CACHE - Content-Addressed Vector Reuse
+In-memory LRU in front of a size-bounded SQLite store, keyed by hash(model name + normalized text)
+so repeated matching runs reuse vectors instead of running the transformer again
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache/embeddings.sqlite3")
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different copies of a text share one cache entry"""
+    return " ".join(text.split()) if text else ""
+
+
+class EmbeddingCache:
+    def __init__(self, model_name, cache_path=DEFAULT_CACHE_PATH, memory_size=4096, max_disk_entries=200000):
+        self.model_name = model_name
+        self.cache_path = cache_path
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = None
+        try:
+            directory = os.path.dirname(cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+            self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ Embedding cache disk store unavailable, using memory only: {e}")
+            self._conn = None
+
+    def make_key(self, text):
+        """Content address for a text under the current model"""
+        payload = f"{self.model_name}\x00{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, text):
+        """Return the cached vector for a text, or None"""
+        key = self.make_key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+
+            vector = self._read_disk(key)
+            if vector is None:
+                self.misses += 1
+                return None
+
+            self._remember(key, vector)
+            self.hits += 1
+            return vector
+
+    def put(self, text, vector):
+        """Store a vector for a text in memory and on disk"""
+        key = self.make_key(text)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            self._write_disk(key, vector)
+
+    def get_or_encode(self, text, encode_fn):
+        """Return the cached vector for a text, computing and storing it with encode_fn on a miss"""
+        vector = self.get(text)
+        if vector is not None:
+            return vector
+        vector = encode_fn(normalize_text(text))
+        if vector is not None:
+            self.put(text, vector)
+        return vector
+
+    def get_or_encode_many(self, texts, encode_many_fn):
+        """get_or_encode for a list of texts: the misses are computed with one encode_many_fn call
+        on their normalized texts (each distinct text once). Returns the vectors in input order"""
+        vectors = [self.get(text) for text in texts]
+        missing = {}
+        for position, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(normalize_text(texts[position]), []).append(position)
+        if missing:
+            for normalized, vector in zip(missing, encode_many_fn(list(missing))):
+                self.put(normalized, vector)
+                for position in missing[normalized]:
+                    vectors[position] = np.asarray(vector, dtype=np.float32)
+        return vectors
+
+    def stats(self):
+        """Cache hit/miss counters and sizes"""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                try:
+                    disk_entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                except Exception:
+                    pass
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries
+            }
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute("SELECT dim, vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE embeddings SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            dim, blob = row
+            return np.frombuffer(blob, dtype=np.float32, count=dim).copy()
+        except Exception as e:
+            print(f"⚠️ Embedding cache read error: {e}")
+            return None
+
+    def _write_disk(self, key, vector):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, last_used) VALUES (?, ?, ?, ?)",
+                (key, int(vector.shape[0]), vector.tobytes(), time.time())
+            )
+            self._conn.commit()
+            self._writes_since_evict += 1
+            # Checking the table size on every write is wasteful - evict in batches
+            if self._writes_since_evict >= 256:
+                self._evict_disk()
+        except Exception as e:
+            print(f"⚠️ Embedding cache write error: {e}")
+
+    def _evict_disk(self):
+        """Drop least-recently-used rows once the disk store exceeds max_disk_entries"""
+        self._writes_since_evict = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._conn.commit()
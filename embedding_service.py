@@ -0,0 +1,61 @@
+"""
+🧠 EMBEDDING SERVICE - One Shared Sentence Transformer Per Process
+Every module that needs embeddings (vector DB, semantic matcher, cultural extractor)
+borrows the same all-MiniLM-L6-v2 instance instead of loading its own copy
+"""
+
+import threading
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+class EmbeddingService:
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._load_attempted = False
+        self._lock = threading.Lock()
+
+    def get_model(self):
+        """Return the shared SentenceTransformer, loading it on first use (None if unavailable)"""
+        if self._load_attempted:
+            return self._model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if self._load_attempted:
+                return self._model
+
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                print("⚠️ sentence-transformers not installed - embeddings unavailable")
+            else:
+                try:
+                    self._model = SentenceTransformer(self.model_name)
+                    print(f"✅ Shared embedding model loaded: {self.model_name}")
+                except Exception as e:
+                    print(f"❌ Failed to load embedding model {self.model_name}: {e}")
+                    self._model = None
+            self._load_attempted = True
+
+        return self._model
+
+    def is_available(self):
+        """Check whether the shared model could be loaded"""
+        return self.get_model() is not None
+
+    def encode(self, texts, **kwargs):
+        """Encode one text or a list of texts with the shared model"""
+        model = self.get_model()
+        if model is None:
+            return None
+        return model.encode(texts, **kwargs)
+
+
+# Global instance for reuse
+embedding_service = EmbeddingService()
@@ -0,0 +1,175 @@
+"""
+🗺️ GAZETTEER - Offline City Coordinates with a Spatial Index
+Resolves free-text locations to cities from the bundled data/gazetteer.csv (lat/lon, country, timezone),
+indexes them in a BallTree over haversine distance, and answers vectorized distance and
+"within R km" questions - e.g. as a geographic pre-filter before semantic retrieval
+"""
+
+import csv
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from location_resolver import COUNTRY_ALIASES
+
+try:
+    from sklearn.neighbors import BallTree
+    BALLTREE_AVAILABLE = True
+except ImportError:
+    BALLTREE_AVAILABLE = False
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+
+# Mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+# Countries with no gazetteer city - still recognized when stated, so a same-named city elsewhere
+# is not picked ('San Jose, Costa Rica' is not the US San Jose)
+OTHER_COUNTRIES = [
+    'costa rica', 'panama', 'guatemala', 'honduras', 'el salvador', 'nicaragua', 'cuba',
+    'dominican republic', 'puerto rico', 'jamaica', 'venezuela', 'ecuador', 'bolivia', 'paraguay',
+    'uruguay', 'morocco', 'algeria', 'tunisia', 'ghana', 'ethiopia', 'tanzania', 'uganda', 'rwanda',
+    'senegal', 'croatia', 'serbia', 'slovakia', 'slovenia', 'bulgaria', 'lithuania', 'latvia',
+    'iceland', 'luxembourg', 'cyprus', 'malta', 'lebanon', 'kuwait', 'bahrain', 'oman', 'iran',
+    'iraq', 'kazakhstan', 'uzbekistan', 'nepal', 'myanmar', 'cambodia'
+]
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distance in km from one point to arrays of points (all in degrees)"""
+    lat1 = np.radians(latitude)
+    lon1 = np.radians(longitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon2 = np.radians(np.asarray(longitudes, dtype=np.float64))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class Gazetteer:
+    def __init__(self, path=DEFAULT_GAZETTEER_PATH):
+        self.path = path
+        self.cities = []
+        self.latitudes = np.zeros(0, dtype=np.float64)
+        self.longitudes = np.zeros(0, dtype=np.float64)
+        self._pattern = None
+        self._country_pattern = None
+        self._tree = None
+        # Each distinct location string is parsed once
+        self._resolve_text = lru_cache(maxsize=8192)(self._match_city)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"⚠️ Gazetteer file not found: {self.path} - distance matching disabled")
+            return
+
+        names = {}
+        with open(self.path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                city = {
+                    'city': row['city'].strip().lower(),
+                    'country': row['country'].strip().lower(),
+                    'latitude': float(row['latitude']),
+                    'longitude': float(row['longitude']),
+                    'timezone': row['timezone'].strip()
+                }
+                for name in {city['city'], *(alias.strip().lower() for alias in row['aliases'].split('|'))}:
+                    if name:
+                        names.setdefault(name, []).append(len(self.cities))
+                self.cities.append(city)
+
+        # Name -> positions of every city called that (the stated country picks between them)
+        self._names = names
+        self.latitudes = np.array([city['latitude'] for city in self.cities], dtype=np.float64)
+        self.longitudes = np.array([city['longitude'] for city in self.cities], dtype=np.float64)
+        self._pattern = self._compile(names)
+        countries = {
+            **{country: country for country in OTHER_COUNTRIES},
+            **{city['country']: city['country'] for city in self.cities},
+            **COUNTRY_ALIASES
+        }
+        self._countries = countries
+        self._country_pattern = self._compile(countries)
+        if BALLTREE_AVAILABLE and self.cities:
+            self._tree = BallTree(np.radians(np.column_stack([self.latitudes, self.longitudes])), metric='haversine')
+
+    @staticmethod
+    def _compile(terms):
+        # Longest terms first so 'new york city' wins over 'new york'. Lookarounds instead of \b, which
+        # never matches after a trailing '.' ('washington d.c.'); separators also match ', '
+        ordered = sorted(terms, key=len, reverse=True)
+        alternation = '|'.join(r'[\s,]+'.join(re.escape(word) for word in term.split()) for term in ordered)
+        return re.compile(r'(?<!\w)(' + alternation + r')(?!\w)')
+
+    def _term(self, match):
+        return ' '.join(match.group(1).replace(',', ' ').split())
+
+    def resolve(self, location):
+        """Gazetteer record ({'city', 'country', 'latitude', 'longitude', 'timezone'}) for a
+        free-text location - the first known city mentioned in it - or None.
+        A country stated in the text must agree: it picks between same-named cities, and a
+        known city in another country than the stated one resolves to None"""
+        if not location or self._pattern is None:
+            return None
+        return self._resolve_text(location.lower().strip())
+
+    def _match_city(self, text):
+        positions = [position for match in self._pattern.finditer(text) for position in self._names[self._term(match)]]
+        if not positions:
+            return None
+        stated = {self._countries[self._term(match)] for match in self._country_pattern.finditer(text)}
+        if not stated:
+            return self.cities[positions[0]]
+        for position in positions:
+            if self.cities[position]['country'] in stated:
+                return self.cities[position]
+        return None
+
+    def city_key(self, location):
+        """Canonical city name of a location ('' when it is not in the gazetteer)"""
+        city = self.resolve(location)
+        return city['city'] if city else ''
+
+    def coordinates(self, locations):
+        """(latitudes, longitudes) arrays for many locations - NaN where a location is unknown"""
+        latitudes = np.full(len(locations), np.nan)
+        longitudes = np.full(len(locations), np.nan)
+        for position, location in enumerate(locations):
+            city = self.resolve(location)
+            if city:
+                latitudes[position] = city['latitude']
+                longitudes[position] = city['longitude']
+        return latitudes, longitudes
+
+    def distances_km(self, job_location, candidate_locations):
+        """Distance in km from a job's city to each candidate's city - NaN where either is unknown"""
+        job_city = self.resolve(job_location)
+        if job_city is None:
+            return np.full(len(candidate_locations), np.nan)
+        latitudes, longitudes = self.coordinates(candidate_locations)
+        return haversine_km(job_city['latitude'], job_city['longitude'], latitudes, longitudes)
+
+    def cities_within(self, location, radius_km):
+        """Canonical names of the gazetteer cities within radius_km of a location ([] when it is unknown)"""
+        center = self.resolve(location)
+        if center is None:
+            return []
+        if self._tree is not None:
+            point = np.radians([[center['latitude'], center['longitude']]])
+            positions = self._tree.query_radius(point, r=radius_km / EARTH_RADIUS_KM)[0]
+        else:
+            # No scikit-learn: the gazetteer is small enough for one vectorized pass
+            distances = haversine_km(center['latitude'], center['longitude'], self.latitudes, self.longitudes)
+            positions = np.flatnonzero(distances <= radius_km)
+        return sorted(self.cities[position]['city'] for position in positions)
+
+    def within_radius(self, job_location, candidate_locations, radius_km):
+        """Positions of the candidate locations within radius_km of the job's city"""
+        distances = self.distances_km(job_location, candidate_locations)
+        return np.flatnonzero(distances <= radius_km)
+
+
+# Global instance
+gazetteer = Gazetteer()
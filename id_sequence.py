@@ -0,0 +1,73 @@
+"""
+🔢 ID SEQUENCE - Persisted Atomic ID Allocation
+SQLite counter table so new job/candidate ids cost O(1) and never collide across threads or workers
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+ID_SEQUENCE_FILE = "id_sequences.sqlite3"
+
+# Sequences used as persisted per-collection write stamps - bumped by every write, in any process
+WRITE_STAMPS = {'candidates': 'candidates_writes', 'jobs': 'jobs_writes'}
+
+
+def bump_write_stamp(persist_directory, record_type):
+    """Record a write made outside ChromaVectorDB (e.g. a delete script) so running processes
+    drop what they cached or indexed from that collection"""
+    IdSequence(os.path.join(persist_directory, ID_SEQUENCE_FILE)).allocate(WRITE_STAMPS[record_type])
+
+
+class IdSequence:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)")
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe across threads and processes.
+        # Callers close it with closing() - `with conn` alone only commits or rolls back
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def allocate(self, name, count=1, seed_fn=None):
+        """Reserve `count` consecutive ids for sequence `name` and return the first one.
+        On first use the sequence starts after seed_fn() (the current max id), or after 0"""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        return self._update(name, lambda last_id: last_id + count, seed_fn) + 1
+
+    def advance(self, name, record_id, seed_fn=None):
+        """Make sure sequence `name` never hands out `record_id` or anything below it -
+        for writes that bring their own id instead of allocating one"""
+        self._update(name, lambda last_id: max(last_id, int(record_id)), seed_fn)
+
+    def current(self, name):
+        """Last id handed out by sequence `name` (0 before first use) - a plain read, no write lock"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT last_id FROM sequences WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def _update(self, name, next_fn, seed_fn):
+        """Set the sequence's last id to next_fn(last id) in one write transaction and return the previous one"""
+        with self._lock, closing(self._connect()) as conn:
+            try:
+                # BEGIN IMMEDIATE takes the write lock up front, so other workers wait here
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT last_id FROM sequences WHERE name = ?", (name,)).fetchone()
+                last_id = row[0] if row else (seed_fn() if seed_fn else 0)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sequences (name, last_id) VALUES (?, ?)",
+                    (name, next_fn(last_id))
+                )
+                conn.execute("COMMIT")
+                return last_id
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
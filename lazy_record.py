@@ -0,0 +1,96 @@
+"""
+💤 LAZY RECORD - Decode Nested Fields Only When They Are Read
+A dict that holds nested fields in their stored (serialized) form and decodes each one on first access
+"""
+
+import json
+
+
+class LazyRecord(dict):
+    """dict subclass whose `lazy_fields` hold encoded values until they are first read.
+    Iteration, membership and len() never decode; item access, get(), items(), values(),
+    copying and JSON serialization decode on demand so callers always see plain Python data"""
+
+    def __init__(self, values, lazy_fields=(), decode=json.loads):
+        super().__init__(values)
+        self._pending = set(field for field in lazy_fields if field in values)
+        self._decode = decode
+
+    def _hydrate(self, key):
+        if key in self._pending:
+            self._pending.discard(key)
+            super().__setitem__(key, self._decode(super().__getitem__(key)))
+
+    def _hydrate_all(self):
+        for key in list(self._pending):
+            self._hydrate(key)
+
+    def __getitem__(self, key):
+        self._hydrate(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._pending.discard(key)
+        super().__delitem__(key)
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(record) / {**record} go through __getitem__ instead of raw storage
+        return super().__iter__()
+
+    def pop(self, key, *default):
+        if key in self:
+            self._hydrate(key)
+        return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def items(self):
+        self._hydrate_all()
+        return super().items()
+
+    def values(self):
+        self._hydrate_all()
+        return super().values()
+
+    def copy(self):
+        return dict(self.items())
+
+    def shallow_copy(self):
+        """A new LazyRecord over the same values - fields still encoded here stay encoded in the copy"""
+        clone = LazyRecord(dict(super().items()), decode=self._decode)
+        clone._pending = set(self._pending)
+        return clone
+
+    def __eq__(self, other):
+        self._hydrate_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._hydrate_all()
+        return super().__repr__()
+
+    def __reduce__(self):
+        # Pickles (e.g. for worker processes) as a plain, fully decoded dict
+        return (dict, (dict(self.items()),))
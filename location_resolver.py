@@ -0,0 +1,368 @@
+"""
+📍 LOCATION RESOLVER - Normalized Location Facts
+Turns free-text locations into scalar facts (country, remote flag) that can be stored and filtered on,
+and scores job/candidate location compatibility from records resolved once per location string
+"""
+
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+REMOTE_INDICATORS = ['remote', 'anywhere', 'flexible', 'virtual', 'wfh', 'work from home']
+
+# Country name/alias -> normalized country key
+COUNTRY_ALIASES = {
+    'usa': 'usa', 'united states': 'usa', 'us': 'usa',
+    'uk': 'uk', 'united kingdom': 'uk', 'england': 'uk', 'scotland': 'uk',
+    'india': 'india', 'germany': 'germany', 'japan': 'japan', 'singapore': 'singapore',
+    'australia': 'australia', 'canada': 'canada', 'france': 'france', 'ireland': 'ireland',
+    'netherlands': 'netherlands', 'sweden': 'sweden', 'spain': 'spain', 'china': 'china',
+    'south korea': 'south korea', 'korea': 'south korea', 'new zealand': 'new zealand',
+    'israel': 'israel', 'uae': 'uae', 'united arab emirates': 'uae', 'saudi arabia': 'saudi arabia',
+    'brazil': 'brazil', 'argentina': 'argentina', 'colombia': 'colombia', 'hong kong': 'hong kong'
+}
+
+# Well-known city -> normalized country key
+CITY_COUNTRIES = {
+    'san francisco': 'usa', 'new york': 'usa', 'seattle': 'usa', 'chicago': 'usa', 'austin': 'usa',
+    'boston': 'usa', 'los angeles': 'usa', 'oakland': 'usa', 'san jose': 'usa', 'berkeley': 'usa',
+    'palo alto': 'usa',
+    'toronto': 'canada',
+    'london': 'uk', 'manchester': 'uk', 'birmingham': 'uk', 'edinburgh': 'uk',
+    'berlin': 'germany', 'munich': 'germany', 'hamburg': 'germany', 'frankfurt': 'germany',
+    'paris': 'france', 'amsterdam': 'netherlands', 'dublin': 'ireland', 'stockholm': 'sweden',
+    'barcelona': 'spain',
+    'tokyo': 'japan', 'osaka': 'japan', 'kyoto': 'japan', 'yokohama': 'japan',
+    'bangalore': 'india', 'bengaluru': 'india', 'mumbai': 'india', 'delhi': 'india',
+    'hyderabad': 'india', 'chennai': 'india',
+    'seoul': 'south korea', 'shanghai': 'china', 'shenzhen': 'china',
+    'dubai': 'uae', 'tel aviv': 'israel', 'riyadh': 'saudi arabia',
+    'sydney': 'australia', 'melbourne': 'australia', 'auckland': 'new zealand',
+    'sao paulo': 'brazil', 'buenos aires': 'argentina', 'bogota': 'colombia'
+}
+
+
+def _compile_terms(terms):
+    """Word-bounded alternation, longest terms first so 'south korea' wins over 'korea'"""
+    ordered = sorted(terms, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(term) for term in ordered) + r')\b')
+
+
+_COUNTRY_PATTERN = _compile_terms(COUNTRY_ALIASES)
+_CITY_PATTERN = _compile_terms(CITY_COUNTRIES)
+
+
+def is_remote_location(location):
+    """Check if a location string indicates remote work"""
+    if not location:
+        return False
+    location = location.lower()
+    return any(indicator in location for indicator in REMOTE_INDICATORS)
+
+
+def normalize_country(location):
+    """Best-effort normalized country key for a location string ('' when unknown)"""
+    if not location:
+        return ''
+    location = location.lower().strip()
+
+    # Explicit country names win over city guesses
+    match = _COUNTRY_PATTERN.search(location)
+    if match:
+        return COUNTRY_ALIASES[match.group(1)]
+    match = _CITY_PATTERN.search(location)
+    if match:
+        return CITY_COUNTRIES[match.group(1)]
+    return ''
+
+
+# --- Location compatibility scoring (SimpleMatcher.calculate_global_location_score) ---
+# Every rule below is a plain substring test against these tables, so a location string is
+# fully described by the set of table terms it contains
+
+# Major global tech hubs and metro areas - first cluster containing the location wins
+TECH_HUB_CLUSTERS = {
+    'north_america': ['san francisco', 'new york', 'seattle', 'toronto', 'chicago', 'austin', 'boston', 'los angeles'],
+    'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin', 'stockholm', 'barcelona'],
+    'asia': ['tokyo', 'singapore', 'bangalore', 'hong kong', 'seoul', 'shanghai', 'shenzhen'],
+    'south_asia': ['mumbai', 'delhi', 'bangalore', 'hyderabad', 'chennai'],
+    'middle_east': ['dubai', 'tel aviv', 'riyadh'],
+    'oceania': ['sydney', 'melbourne', 'auckland']
+}
+
+METRO_AREAS = {
+    'san francisco': ['oakland', 'san jose', 'berkeley', 'palo alto'],
+    'london': ['greater london', 'london uk'],
+    'tokyo': ['tokyo japan', 'greater tokyo'],
+    'bangalore': ['bengaluru', 'bangalore india']
+}
+
+COUNTRY_INDICATORS = {
+    'usa': ['new york', 'san francisco', 'chicago', 'austin', 'boston'],
+    'india': ['bangalore', 'mumbai', 'delhi', 'hyderabad', 'chennai'],
+    'uk': ['london', 'manchester', 'birmingham', 'edinburgh'],
+    'germany': ['berlin', 'munich', 'hamburg', 'frankfurt'],
+    'japan': ['tokyo', 'osaka', 'kyoto', 'yokohama']
+}
+
+# Regions and continents - the last one containing the location wins
+REGIONS = {
+    'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin'],
+    'south_asia': ['bangalore', 'mumbai', 'delhi', 'chennai'],
+    'east_asia': ['tokyo', 'seoul', 'shanghai', 'hong kong'],
+    'north_america': ['san francisco', 'new york', 'toronto', 'seattle']
+}
+
+CONTINENTS = {
+    'asia': ['tokyo', 'singapore', 'bangalore', 'seoul', 'shanghai'],
+    'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin'],
+    'north america': ['san francisco', 'new york', 'toronto', 'chicago'],
+    'south america': ['sao paulo', 'buenos aires', 'bogota']
+}
+
+# EU free movement, Commonwealth countries, etc. - either direction
+FAVORABLE_VISA_PAIRS = [
+    ('germany', 'france'), ('uk', 'ireland'),
+    ('australia', 'new zealand'), ('canada', 'usa')
+]
+
+# Simplified - in reality would need comprehensive visa data (job term, candidate term)
+COMPLEX_VISA_PAIRS = [
+    ('usa', 'china'), ('russia', 'europe'),
+    ('middle east', 'certain countries')  # Placeholder
+]
+
+ENGLISH_SPEAKING = ['usa', 'uk', 'canada', 'australia', 'singapore', 'india']
+
+# (job term, candidate term)
+SIMILAR_CULTURES = [
+    ('usa', 'canada'), ('uk', 'australia'),
+    ('germany', 'france'), ('japan', 'south korea')
+]
+
+GLOBAL_TECH_HUBS = ['san francisco', 'london', 'tokyo', 'singapore', 'bangalore', 'berlin', 'new york', 'seattle']
+
+# Simplified timezone estimation - first country found wins, UTC when none
+UTC_OFFSETS = {
+    'usa': -5, 'uk': 0, 'germany': 1, 'india': 5.5,
+    'singapore': 8, 'japan': 9, 'australia': 10
+}
+
+# Established business corridors - either direction
+BUSINESS_CORRIDORS = [
+    ('san francisco', 'bangalore'), ('london', 'new york'),
+    ('singapore', 'hong kong'), ('berlin', 'amsterdam')
+]
+
+_SCORING_TERMS = frozenset(
+    REMOTE_INDICATORS + GLOBAL_TECH_HUBS + ENGLISH_SPEAKING + list(UTC_OFFSETS)
+    + [term for table in (TECH_HUB_CLUSTERS, COUNTRY_INDICATORS, REGIONS, CONTINENTS) for terms in table.values() for term in terms]
+    + [term for city, areas in METRO_AREAS.items() for term in [city, *areas]]
+    + [term for pairs in (FAVORABLE_VISA_PAIRS, COMPLEX_VISA_PAIRS, SIMILAR_CULTURES, BUSINESS_CORRIDORS)
+       for pair in pairs for term in pair]
+)
+
+ResolvedLocation = namedtuple('ResolvedLocation', [
+    'key',            # frozenset of scoring terms in the location - equal keys always score alike
+    'city', 'country', 'region', 'continent', 'utc_offset', 'is_hub', 'is_remote',
+    'hub_cluster', 'countries', 'metro_cities', 'metro_areas', 'speaks_english'
+])
+
+# One resolved record per distinct term set, shared by every string that resolves to it
+_RECORDS = {}
+_RECORDS_LOCK = threading.Lock()
+
+
+def _last_match(table, terms):
+    found = None
+    for name, members in table.items():
+        if any(member in terms for member in members):
+            found = name
+    return found
+
+
+def _record_for_terms(terms, location):
+    record = _RECORDS.get(terms)
+    if record is not None:
+        return record
+
+    city_match = _CITY_PATTERN.search(location)
+    record = ResolvedLocation(
+        key=terms,
+        city=city_match.group(1) if city_match else '',
+        country=normalize_country(location),
+        region=_last_match(REGIONS, terms),
+        continent=_last_match(CONTINENTS, terms),
+        utc_offset=next((offset for country, offset in UTC_OFFSETS.items() if country in terms), 0),
+        is_hub=any(hub in terms for hub in GLOBAL_TECH_HUBS),
+        is_remote=any(indicator in terms for indicator in REMOTE_INDICATORS),
+        hub_cluster=next(
+            (cluster for cluster, hubs in TECH_HUB_CLUSTERS.items() if any(hub in terms for hub in hubs)), None
+        ),
+        countries=frozenset(
+            country for country, cities in COUNTRY_INDICATORS.items() if any(city in terms for city in cities)
+        ),
+        metro_cities=frozenset(city for city in METRO_AREAS if city in terms),
+        metro_areas=frozenset(city for city, areas in METRO_AREAS.items() if any(area in terms for area in areas)),
+        speaks_english=any(country in terms for country in ENGLISH_SPEAKING)
+    )
+    with _RECORDS_LOCK:
+        return _RECORDS.setdefault(terms, record)
+
+
+@lru_cache(maxsize=8192)
+def _resolve_normalized(location):
+    terms = frozenset(term for term in _SCORING_TERMS if term in location)
+    return _record_for_terms(terms, location)
+
+
+def resolve_location(location):
+    """Canonical record for a location string - parsed once per distinct string (LRU cached)"""
+    return _resolve_normalized((location or '').lower().strip())
+
+
+def _either_direction(pairs, job_terms, candidate_terms):
+    return any(
+        (first in job_terms and second in candidate_terms) or (second in job_terms and first in candidate_terms)
+        for first, second in pairs
+    )
+
+
+def _clip01(score):
+    return max(0.0, min(1.0, score))
+
+
+def _geographic_proximity(job, candidate):
+    """Geographic proximity score (40% weight)"""
+    # Same city/metro area
+    if (job.metro_cities & candidate.metro_areas) or (candidate.metro_cities & job.metro_areas):
+        return 0.9
+
+    # Same major hub cluster
+    if job.hub_cluster and candidate.hub_cluster and job.hub_cluster == candidate.hub_cluster:
+        return 0.8
+
+    # Same country
+    if job.countries & candidate.countries:
+        return 0.6
+
+    # Neighboring countries/same region
+    if job.region and candidate.region and job.region == candidate.region:
+        return 0.4
+
+    # Same continent
+    if job.continent and candidate.continent and job.continent == candidate.continent:
+        return 0.3
+
+    # Global (different continents)
+    return 0.2
+
+
+def _relocation_practicality(job, candidate):
+    """Relocation practicality score (30% weight)"""
+    score = 0.5  # Base neutral score
+
+    # Visa requirements consideration
+    if _either_direction(FAVORABLE_VISA_PAIRS, job.key, candidate.key):
+        score += 0.2
+    elif any(first in job.key and second in candidate.key for first, second in COMPLEX_VISA_PAIRS):
+        score -= 0.2
+
+    # Language compatibility
+    if job.speaks_english and candidate.speaks_english:
+        score += 0.15
+
+    # Cultural similarity
+    if any(first in job.key and second in candidate.key for first, second in SIMILAR_CULTURES):
+        score += 0.1
+
+    return _clip01(score)
+
+
+def _professional_context(job, candidate):
+    """Professional context score (20% weight)"""
+    if job.is_hub and candidate.is_hub:
+        return 0.8  # Both global tech hubs
+    elif job.is_hub or candidate.is_hub:
+        return 0.6  # One is a tech hub
+    else:
+        return 0.4  # Neither major hub
+
+
+def _preference_score(willing_to_relocate, company_relocation_support):
+    """Preference score (10% weight)"""
+    score = 0.5  # Base neutral
+
+    if willing_to_relocate:
+        score += 0.3
+
+    if company_relocation_support:
+        score += 0.2
+
+    return _clip01(score)
+
+
+def _timezone_penalty(job, candidate):
+    difference = abs(job.utc_offset - candidate.utc_offset)
+
+    if difference <= 2:
+        return 0.0
+    elif difference <= 4:
+        return 0.05
+    elif difference <= 6:
+        return 0.1
+    else:
+        return 0.15
+
+
+@lru_cache(maxsize=65536)
+def _pair_score(job_key, candidate_key, willing_to_relocate, company_relocation_support):
+    """Score of two resolved, non-remote, non-identical locations - memoized on their keys"""
+    job = _RECORDS[job_key]
+    candidate = _RECORDS[candidate_key]
+
+    # Weighted combined score
+    base_score = (
+        (_geographic_proximity(job, candidate) * 0.4)
+        + (_relocation_practicality(job, candidate) * 0.3)
+        + (_professional_context(job, candidate) * 0.2)
+        + (_preference_score(willing_to_relocate, company_relocation_support) * 0.1)
+    )
+
+    # Apply modifiers: time zone difference penalty, established business corridor bonus
+    final_score = base_score
+    final_score -= _timezone_penalty(job, candidate)
+    if _either_direction(BUSINESS_CORRIDORS, job.key, candidate.key):
+        final_score += 0.1
+
+    return _clip01(_clip01(final_score))
+
+
+def location_score(job_location, candidate_location, candidate_willing_to_relocate=False, company_relocation_support=False):
+    """Global location compatibility score in [0, 1] (see SimpleMatcher.calculate_global_location_score)"""
+    if not job_location or not candidate_location:
+        return 0.5
+
+    job_loc = job_location.lower().strip()
+    candidate_loc = candidate_location.lower().strip()
+    job = _resolve_normalized(job_loc)
+    candidate = _resolve_normalized(candidate_loc)
+
+    # Handle remote work scenarios
+    if job.is_remote:
+        return 1.0
+
+    if candidate.is_remote:
+        return 0.3  # Candidate wants remote but job requires on-site
+
+    # Exact match
+    if job_loc == candidate_loc:
+        return 1.0
+
+    return _pair_score(job.key, candidate.key, bool(candidate_willing_to_relocate), bool(company_relocation_support))
+
+
+def resolver_cache_info():
+    """LRU statistics of the string resolver and the pair-score memo"""
+    return {'locations': _resolve_normalized.cache_info(), 'pairs': _pair_score.cache_info()}
@@ -0,0 +1,141 @@
+"""
+⚡ PARALLEL MATCHING - Job Batches Scored in a Process Pool
+Candidate feature arrays are written once to .npy files that every worker maps read-only
+(np.load mmap_mode='r'), so the OS page cache holds a single copy and no task pickles them.
+Tasks carry only their jobs and per-job shortlist inputs; results come back in submission
+order, so the output is deterministic and identical to the serial path.
+Scoring runs in two passes over the pool: workers first name the shortlist positions that can
+still make a job's top_k, the parent scores semantic cultural fit for just those (it holds the
+database and model), then workers rank with them
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_scorer import BatchScorer, CandidateFeatures
+from skill_index import SkillMatrix
+
+
+def _default_match_workers():
+    # A malformed MATCH_WORKERS must not break importing the matcher - fall back to in-process matching
+    try:
+        return max(1, int(os.getenv("MATCH_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+# Worker processes for find_matches - 1 keeps matching in-process
+DEFAULT_MATCH_WORKERS = _default_match_workers()
+
+# Tasks per worker - several smaller batches even out jobs with uneven shortlists
+BATCHES_PER_WORKER = 4
+
+_SKILL_ARRAYS = ('row_ids', 'indptr', 'indices')
+
+# Per-worker state, set once by _init_worker
+_worker_scorer = None
+_worker_features = None
+
+
+class MappedFeatures:
+    """CandidateFeatures arrays saved to a temporary directory for workers to memory-map"""
+
+    def __init__(self, features):
+        self.directory = tempfile.mkdtemp(prefix="match_features_")
+        for name in CandidateFeatures.ARRAY_FIELDS:
+            np.save(os.path.join(self.directory, f"{name}.npy"), getattr(features, name))
+        for name in _SKILL_ARRAYS:
+            np.save(os.path.join(self.directory, f"skills_{name}.npy"), getattr(features.skills, name))
+        # The distinct-value lists are small - they travel with the worker initializer
+        self.spec = {
+            'directory': self.directory,
+            'values': {name: getattr(features, name) for name in CandidateFeatures.VALUE_FIELDS},
+            'skill_names': features.skills.names,
+        }
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def load_mapped_features(spec):
+    """CandidateFeatures over the read-only memory-mapped arrays of a MappedFeatures spec"""
+    def load(name):
+        # A plain ndarray view of the mapping - np.memmap results would be re-wrapped on every operation
+        return np.asarray(np.load(os.path.join(spec['directory'], f"{name}.npy"), mmap_mode='r'))
+
+    arrays = {name: load(name) for name in CandidateFeatures.ARRAY_FIELDS}
+    skills = SkillMatrix(*(load(f"skills_{name}") for name in _SKILL_ARRAYS), spec['skill_names'])
+    return CandidateFeatures.from_arrays(arrays, spec['values'], skills)
+
+
+def _init_worker(matcher, spec):
+    global _worker_scorer, _worker_features
+    _worker_scorer = BatchScorer(matcher)
+    _worker_features = load_mapped_features(spec)
+
+
+def _semantic_cultural_batch(tasks):
+    """BatchScorer.semantic_cultural_positions for a batch of (job, rows, semantic_scores, top_k)"""
+    return [
+        _worker_scorer.semantic_cultural_positions(
+            job, _worker_features, rows, semantic_scores, len(rows) if top_k is None else top_k
+        )
+        for job, rows, semantic_scores, top_k in tasks
+    ]
+
+
+def _score_batch(tasks):
+    """score_matches for a batch of (job, rows, semantic_scores, {position: semantic cultural score}, top_k)"""
+    results = []
+    for job, rows, semantic_scores, semantic_cultural_scores, top_k in tasks:
+        # Positions left out of the map cannot make the top_k (see semantic_cultural_positions)
+        results.append(_worker_scorer.score_matches(
+            job, _worker_features, rows, semantic_scores,
+            lambda positions: [semantic_cultural_scores.get(position, 0.5) for position in positions],
+            top_k
+        ))
+    return results
+
+
+def _pool_context():
+    # Forked workers inherit the already-imported modules (and any loaded model); other platforms spawn
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def score_matches_parallel(matcher, features, tasks, workers, semantic_cultural_fn):
+    """BatchScorer.score_matches for every (job, rows, semantic_scores, top_k) task, in task order, on
+    `workers` processes. semantic_cultural_fn(task_index, positions) -> semantic cultural scores of
+    those shortlist positions, called here once per task for the positions that can still need them"""
+    if not tasks:
+        return []
+    batch_size = max(1, -(-len(tasks) // (workers * BATCHES_PER_WORKER)))
+
+    def batches(items):
+        return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+    mapped = MappedFeatures(features)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches(tasks))), mp_context=_pool_context(),
+            initializer=_init_worker, initargs=(matcher, mapped.spec)
+        ) as executor:
+            # map() yields in submission order whatever order the batches finish in
+            needed = [
+                positions
+                for batch_positions in executor.map(_semantic_cultural_batch, batches(tasks))
+                for positions in batch_positions
+            ]
+            scoring_tasks = []
+            for index, ((job, rows, semantic_scores, top_k), positions) in enumerate(zip(tasks, needed)):
+                semantic_cultural = dict(zip(positions, semantic_cultural_fn(index, positions))) if positions else {}
+                scoring_tasks.append((job, rows, semantic_scores, semantic_cultural, top_k))
+            return [result for batch_results in executor.map(_score_batch, batches(scoring_tasks)) for result in batch_results]
+    finally:
+        mapped.close()
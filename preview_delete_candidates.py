@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import sys
 from chromadb import PersistentClient
+from collection_names import active_collection_name, collection_write_lock
+from id_sequence import bump_write_stamp
 
 # to involke python preview_delete_candidates.py "candidate_name"
 
@@ -42,7 +44,11 @@ def preview_candidates_by_name(collection_name, name_search):
         response = input(f"\n❓ Delete these {len(matching_records)} candidates? (y/N): ")
         if response.lower() == 'y':
             ids_to_delete = [record['id'] for record in matching_records]
-            collection.delete(ids=ids_to_delete)
+            # Under the write lock, against the collection live now - a rebuild may have swapped it meanwhile
+            with collection_write_lock("./chroma_db"):
+                client.get_collection(name=active_collection_name("candidates")).delete(ids=ids_to_delete)
+            # Running app processes drop their cached / indexed copies of these candidates
+            bump_write_stamp("./chroma_db", "candidates")
             print(f"✅ Deleted {len(ids_to_delete)} candidates")
         else:
             print("❌ Deletion cancelled")
@@ -56,4 +62,4 @@ if __name__ == "__main__":
         sys.exit(1)
     
     name_to_search = sys.argv[1]
-    preview_candidates_by_name("candidates", name_to_search)
\ No newline at end of file
+    preview_candidates_by_name(active_collection_name("candidates"), name_to_search)
\ No newline at end of file
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import sys
 from chromadb import PersistentClient
+from collection_names import active_collection_name, collection_write_lock
+from id_sequence import bump_write_stamp
 
 def preview_jobs_by_title(collection_name, title_search):
     """Preview jobs that match the title before deleting"""
@@ -41,7 +43,11 @@ def preview_jobs_by_title(collection_name, title_search):
         response = input(f"\n❓ Delete these {len(matching_records)} jobs? (y/N): ")
         if response.lower() == 'y':
             ids_to_delete = [record['id'] for record in matching_records]
-            collection.delete(ids=ids_to_delete)
+            # Under the write lock, against the collection live now - a rebuild may have swapped it meanwhile
+            with collection_write_lock("./chroma_db"):
+                client.get_collection(name=active_collection_name("jobs")).delete(ids=ids_to_delete)
+            # Running app processes drop their cached / indexed copies of these jobs
+            bump_write_stamp("./chroma_db", "jobs")
             print(f"✅ Deleted {len(ids_to_delete)} jobs")
         else:
             print("❌ Deletion cancelled")
@@ -57,4 +63,4 @@ if __name__ == "__main__":
         sys.exit(1)
     
     title_to_search = sys.argv[1]
-    preview_jobs_by_title("jobs", title_to_search)
\ No newline at end of file
+    preview_jobs_by_title(active_collection_name("jobs"), title_to_search)
\ No newline at end of file
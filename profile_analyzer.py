@@ -28,6 +28,26 @@ class ProfileRelevanceAnalyzer:
         print(f"   Candidate: {candidate_profile[:60]}...")
         
         return semantic_score
+    
+    def calculate_semantic_relevance_many(self, job_description, candidate_profiles):
+        """
+        Score one job description against a whole candidate list in a single batched pass
+        Returns one relevance score per profile, in order
+        """
+        if not job_description:
+            return [0.5 for _ in candidate_profiles]
+        
+        pair_indices = [i for i, profile in enumerate(candidate_profiles) if profile]
+        scores = [0.5 for _ in candidate_profiles]  # Neutral for missing data
+        
+        pair_scores = semantic_matcher.calculate_similarity_many(
+            [(job_description, candidate_profiles[i]) for i in pair_indices]
+        )
+        for i, score in zip(pair_indices, pair_scores):
+            scores[i] = score
+        
+        print(f"🔍 Semantic Relevance: scored {len(pair_indices)} profiles against {job_description[:60]}...")
+        return scores
 
 # Global instance for reuse
 profile_analyzer = ProfileRelevanceAnalyzer()
\ No newline at end of file
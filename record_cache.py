@@ -0,0 +1,99 @@
+"""
+🧠 RECORD CACHE - Versioned In-Process Read-Through Cache of Decoded Records
+Decoded jobs/candidates are kept in memory keyed by id; every write to a collection - from any
+process - bumps its persisted write stamp, which drops that collection's cached records on the next read
+"""
+
+import threading
+
+from lazy_record import LazyRecord
+
+
+def _shallow_copy(record):
+    # Callers get their own top-level dict - lazy fields stay encoded until the copy reads them
+    return record.shallow_copy() if isinstance(record, LazyRecord) else dict(record)
+
+
+class RecordCache:
+    """Per-collection cache of decoded records. `version_fn(record_type)` returns the collection's
+    current write version; entries cached under an older version are never served.
+    Records are handed out as shallow copies - callers may set fields, nested values are shared"""
+
+    def __init__(self, version_fn):
+        self._version_fn = version_fn
+        self._lock = threading.Lock()
+        self._collections = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, record_type):
+        return self._version_fn(record_type)
+
+    def _collection(self, record_type):
+        # Caller holds the lock
+        version = self._version_fn(record_type)
+        entry = self._collections.get(record_type)
+        if entry is None or entry['version'] != version:
+            entry = {'version': version, 'records': {}, 'listing': None}
+            self._collections[record_type] = entry
+        return entry
+
+    def get_many(self, record_type, record_ids):
+        """Return ({record_id: record} for cached ids, [missing ids])"""
+        with self._lock:
+            records = self._collection(record_type)['records']
+            found = {}
+            missing = []
+            for record_id in record_ids:
+                record = records.get(int(record_id))
+                if record is None:
+                    missing.append(record_id)
+                else:
+                    found[int(record_id)] = _shallow_copy(record)
+            self.hits += len(found)
+            self.misses += len(missing)
+            return found, missing
+
+    def put_many(self, record_type, records, version):
+        """Cache records read at `version` - dropped if the collection was written to since"""
+        with self._lock:
+            entry = self._collection(record_type)
+            if entry['version'] != version:
+                return
+            for record in records:
+                # Kept apart from the caller's own (mutable) record
+                entry['records'][int(record['id'])] = _shallow_copy(record)
+
+    def get_all(self, record_type):
+        """The full cached listing of a collection, or None if it is not (or no longer) cached"""
+        with self._lock:
+            listing = self._collection(record_type)['listing']
+            if listing is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [_shallow_copy(record) for record in listing]
+
+    def put_all(self, record_type, records, version):
+        """Cache the full listing of a collection read at `version` (also fills the per-id entries)"""
+        with self._lock:
+            entry = self._collection(record_type)
+            if entry['version'] != version:
+                return
+            entry['listing'] = [_shallow_copy(record) for record in records]
+            for record in entry['listing']:
+                entry['records'][int(record['id'])] = record
+
+    def clear(self):
+        with self._lock:
+            self._collections.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'cached_records': {
+                    record_type: len(entry['records']) for record_type, entry in self._collections.items()
+                }
+            }
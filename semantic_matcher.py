@@ -9,6 +9,8 @@ import sys
 import warnings
 from sklearn.metrics.pairwise import cosine_similarity
 
+from embedding_cache import EmbeddingCache, normalize_text
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
@@ -49,8 +51,10 @@ SEMANTIC_AVAILABLE = install_and_import_sentence_transformers()
 sentence_transformer_model = None
 if SEMANTIC_AVAILABLE:
     try:
-        from sentence_transformers import SentenceTransformer
-        sentence_transformer_model = SentenceTransformer('all-MiniLM-L6-v2')
+        from embedding_service import embedding_service
+        sentence_transformer_model = embedding_service.get_model()
+        if sentence_transformer_model is None:
+            raise RuntimeError("shared embedding model unavailable")
         print("✅ Sentence Transformers loaded - using advanced semantic matching!")
     except Exception as e:
         print(f"⚠️ Failed to load sentence transformer model: {e}")
@@ -61,8 +65,11 @@ else:
 class SemanticMatcher:
     def __init__(self):
         self.model = sentence_transformer_model
+        self.embedding_cache = None
         
         if self.model:
+            from embedding_service import embedding_service
+            self.embedding_cache = EmbeddingCache(embedding_service.model_name)
             print("🎯 Semantic matcher ready with all-MiniLM-L6-v2 model!")
         else:
             print("🔧 Using enhanced basic matching (word overlap + technical terms)")
@@ -73,12 +80,15 @@ class SemanticMatcher:
             return None
         
         # Clean and prepare text
-        clean_text = text.strip()
+        clean_text = normalize_text(text)
         if len(clean_text) < 10:  # Too short for meaningful embedding
             return None
             
         try:
-            return self.model.encode([clean_text])[0]
+            # Reuse a previously computed vector for identical text
+            return self.embedding_cache.get_or_encode(
+                clean_text, lambda normalized: self.model.encode([normalized])[0]
+            )
         except Exception as e:
             print(f"⚠️ Encoding error: {e}")
             return None
@@ -103,6 +113,87 @@ class SemanticMatcher:
             print(f"⚠️ Similarity calculation error: {e}")
             return self.enhanced_similarity_fallback(text1, text2)
     
+    def encode_texts(self, texts):
+        """Encode many texts at once - deduplicated, cache-aware, one model.encode batch for the misses.
+        Returns a dict of text -> vector (None for texts too short to embed)"""
+        vectors = {}
+        embeddable = []
+        for text in dict.fromkeys(texts):
+            # Same length rule as encode_text
+            if not self.model or len(normalize_text(text)) < 10:
+                vectors[text] = None
+            else:
+                embeddable.append(text)
+
+        if embeddable:
+            try:
+                for text, vector in zip(embeddable, self.embedding_cache.get_or_encode_many(embeddable, self.model.encode)):
+                    vectors[text] = vector
+            except Exception as e:
+                print(f"⚠️ Batch encoding error: {e}")
+                # Whatever was already cached is still usable
+                for text in embeddable:
+                    vectors[text] = self.embedding_cache.get(text)
+
+        return vectors
+
+    def similarity_matrix(self, texts_a, texts_b):
+        """Cosine similarity of every text in texts_a against every text in texts_b as a NumPy matrix.
+        Pairs without usable embeddings fall back to enhanced_similarity_fallback"""
+        scores = np.zeros((len(texts_a), len(texts_b)), dtype=np.float64)
+        if not texts_a or not texts_b:
+            return scores
+
+        vectors = self.encode_texts(list(texts_a) + list(texts_b))
+        rows_a = [i for i, t in enumerate(texts_a) if vectors.get(t) is not None]
+        rows_b = [j for j, t in enumerate(texts_b) if vectors.get(t) is not None]
+
+        if rows_a and rows_b:
+            matrix_a = np.vstack([vectors[texts_a[i]] for i in rows_a]).astype(np.float64)
+            matrix_b = np.vstack([vectors[texts_b[j]] for j in rows_b]).astype(np.float64)
+            matrix_a /= np.maximum(np.linalg.norm(matrix_a, axis=1, keepdims=True), 1e-12)
+            matrix_b /= np.maximum(np.linalg.norm(matrix_b, axis=1, keepdims=True), 1e-12)
+            scores[np.ix_(rows_a, rows_b)] = matrix_a @ matrix_b.T
+
+        # Same fallback as calculate_similarity for anything the model could not embed
+        embedded_a = set(rows_a)
+        embedded_b = set(rows_b)
+        for i, text_a in enumerate(texts_a):
+            for j, text_b in enumerate(texts_b):
+                if i not in embedded_a or j not in embedded_b:
+                    scores[i, j] = self.enhanced_similarity_fallback(text_a, text_b)
+
+        return scores
+
+    def calculate_similarity_many(self, pairs):
+        """Semantic similarity for a list of (text1, text2) pairs in one batched pass"""
+        if not pairs:
+            return []
+        if not self.model:
+            return [self.enhanced_similarity_fallback(t1, t2) for t1, t2 in pairs]
+
+        vectors = self.encode_texts([t for pair in pairs for t in pair])
+        results = []
+        for text1, text2 in pairs:
+            embedding1 = vectors.get(text1)
+            embedding2 = vectors.get(text2)
+            if embedding1 is None or embedding2 is None:
+                results.append(self.enhanced_similarity_fallback(text1, text2))
+            else:
+                results.append(None)
+
+        # Score every embeddable pair with one row-wise product
+        indices = [i for i, score in enumerate(results) if score is None]
+        if indices:
+            left = np.vstack([vectors[pairs[i][0]] for i in indices]).astype(np.float64)
+            right = np.vstack([vectors[pairs[i][1]] for i in indices]).astype(np.float64)
+            norms = np.maximum(np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1), 1e-12)
+            cosines = np.einsum('ij,ij->i', left, right) / norms
+            for i, score in zip(indices, cosines):
+                results[i] = float(score)
+
+        return results
+
     def enhanced_similarity_fallback(self, text1, text2):
         """Enhanced fallback similarity calculation when embeddings aren't available"""
         if not text1 or not text2:
@@ -0,0 +1,345 @@
+"""
+🧩 SKILL INDEX - Interned Skill Vocabulary and Sparse Candidate x Skill Matrix
+Skills are normalized and interned to integer ids once, when a candidate is written; the
+candidate x skill incidence is kept as a CSR matrix so a job's skill coverage over every
+candidate is one sparse matrix-vector product (scipy when installed, NumPy otherwise)
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Bits per float64 coverage code - sums of distinct powers of two stay exact below 2**53
+_CODE_BITS = 52
+
+# Change-log entries kept for update_matrix() - a matrix older than that is reloaded whole
+CHANGE_LOG_LIMIT = 100000
+
+
+def normalize_skill(skill):
+    """The interned form of a skill - matches the lower-casing the scorers have always used"""
+    return str(skill).lower()
+
+
+class SkillMatrix:
+    """Binary CSR matrix: row i holds the skill columns of record row_ids[i], columns index `names`"""
+
+    def __init__(self, row_ids, indptr, indices, names):
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.names = list(names)
+        self.vocabulary = {name: column for column, name in enumerate(self.names) if name is not None}
+        self._row_order = None
+        self._csr = None
+        self._entry_rows = None
+        # SkillIndex change-log position the matrix reflects (set by load_matrix / update_matrix)
+        self.change_seq = None
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists, row_ids=None, names=None):
+        """Build from raw skill lists, interning new skills after the existing `names`"""
+        names = list(names or [])
+        vocabulary = {name: column for column, name in enumerate(names) if name is not None}
+        indptr = [0]
+        indices = []
+        for skills in skill_lists:
+            # A skill listed twice is still one incidence
+            columns = set()
+            for skill in skills or []:
+                name = normalize_skill(skill)
+                column = vocabulary.get(name)
+                if column is None:
+                    column = vocabulary[name] = len(names)
+                    names.append(name)
+                columns.add(column)
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        if row_ids is None:
+            row_ids = np.full(len(indptr) - 1, -1, dtype=np.int64)
+        return cls(row_ids, indptr, indices, names)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def rows_for(self, record_ids):
+        """Row position of each record id, -1 where the id has no row"""
+        known = np.array([record_id is not None for record_id in record_ids], dtype=bool)
+        record_ids = np.array(
+            [int(record_id) if record_id is not None else 0 for record_id in record_ids], dtype=np.int64
+        )
+        if not len(self) or not len(record_ids):
+            return np.full(len(record_ids), -1, dtype=np.int64)
+        if self._row_order is None:
+            self._row_order = np.argsort(self.row_ids, kind='stable')
+        sorted_ids = self.row_ids[self._row_order]
+        positions = np.minimum(np.searchsorted(sorted_ids, record_ids), len(sorted_ids) - 1)
+        return np.where(known & (sorted_ids[positions] == record_ids), self._row_order[positions], -1)
+
+    def take(self, rows):
+        """The sub-matrix of the given rows, in that order (same vocabulary)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        # Entry k of the result comes from source position starts[row] + (k - indptr[row])
+        offsets = np.arange(indptr[-1]) - np.repeat(indptr[:-1], lengths)
+        indices = self.indices[np.repeat(starts, lengths) + offsets]
+        return SkillMatrix(self.row_ids[rows], indptr, indices, self.names)
+
+    def replace_rows(self, record_ids, replacement):
+        """This matrix with the rows of `record_ids` dropped and the rows of `replacement` appended.
+        replacement's columns index its own names, which extend this matrix's (skill ids never change)"""
+        keep = np.flatnonzero(~np.isin(self.row_ids, np.asarray(list(record_ids), dtype=np.int64)))
+        kept = self.take(keep)
+        return SkillMatrix(
+            np.concatenate((kept.row_ids, replacement.row_ids)),
+            np.concatenate((kept.indptr, kept.indptr[-1] + replacement.indptr[1:])),
+            np.concatenate((kept.indices, replacement.indices)),
+            replacement.names
+        )
+
+    def select(self, record_ids, skill_lists):
+        """Rows for the given records in order - taken from this matrix where the id is indexed,
+        interned from the record's own skill list otherwise (ad-hoc or not yet indexed records)"""
+        rows = self.rows_for(record_ids)
+        if len(rows) and (rows >= 0).all():
+            return self.take(rows)
+
+        names = list(self.names)
+        extra = SkillMatrix.from_skill_lists(
+            [skills for row, skills in zip(rows, skill_lists) if row < 0], names=names
+        )
+        indptr = [0]
+        indices = []
+        extra_row = 0
+        for row in rows:
+            if row >= 0:
+                columns = self.indices[self.indptr[row]:self.indptr[row + 1]]
+            else:
+                columns = extra.indices[extra.indptr[extra_row]:extra.indptr[extra_row + 1]]
+                extra_row += 1
+            indices.extend(columns.tolist())
+            indptr.append(len(indices))
+        return SkillMatrix(
+            [int(record_id) if record_id is not None else -1 for record_id in record_ids], indptr, indices, extra.names
+        )
+
+    def matvec(self, vector):
+        """Matrix x dense vector over the skill columns - one value per row"""
+        vector = np.asarray(vector, dtype=np.float64)
+        if SCIPY_AVAILABLE:
+            if self._csr is None:
+                self._csr = sparse.csr_matrix(
+                    (np.ones(len(self.indices)), self.indices, self.indptr), shape=(len(self), len(self.names))
+                )
+            return self._csr @ vector
+        if self._entry_rows is None:
+            self._entry_rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        return np.bincount(self._entry_rows, weights=vector[self.indices], minlength=len(self))
+
+    def _coverage(self, normalized_skills):
+        """(pattern index per row, [set of covered columns] per distinct pattern) for a job's skills.
+        Each distinct job-skill column gets one bit of a code vector; the mat-vec sums the bits of the
+        columns a row has, so a handful of distinct codes describe the coverage of every row"""
+        columns = list(dict.fromkeys(
+            self.vocabulary[skill] for skill in normalized_skills if skill in self.vocabulary
+        ))
+        if not columns or not len(self):
+            return np.zeros(len(self), dtype=np.int64), [frozenset()]
+
+        groups = [columns[start:start + _CODE_BITS] for start in range(0, len(columns), _CODE_BITS)]
+        codes = np.empty((len(self), len(groups)), dtype=np.int64)
+        for group_index, group in enumerate(groups):
+            code_vector = np.zeros(len(self.names), dtype=np.float64)
+            code_vector[group] = 2.0 ** np.arange(len(group))
+            codes[:, group_index] = self.matvec(code_vector).astype(np.int64)
+
+        patterns, inverse = np.unique(codes, axis=0, return_inverse=True)
+        covered = []
+        for pattern in patterns:
+            covered.append(frozenset(
+                column
+                for group_index, group in enumerate(groups)
+                for bit, column in enumerate(group)
+                if (int(pattern[group_index]) >> bit) & 1
+            ))
+        return inverse.reshape(-1), covered
+
+    def weighted_coverage(self, job_skills, weight_fn):
+        """SimpleMatcher.calculate_skill_score for every row: matched / total job skill weight.
+        Weights are summed per distinct coverage pattern in job-skill order, so the result is
+        bit-for-bit the per-pair score"""
+        if not job_skills:
+            return np.zeros(len(self), dtype=np.float64)
+
+        normalized = [normalize_skill(skill) for skill in job_skills]
+        weights = [weight_fn(skill) for skill in normalized]
+        total_weight = 0
+        for weight in weights:
+            total_weight += weight
+
+        inverse, covered = self._coverage(normalized)
+        per_pattern = []
+        for columns in covered:
+            matched_weight = 0
+            for skill, weight in zip(normalized, weights):
+                if self.vocabulary.get(skill) in columns:
+                    matched_weight += weight
+            per_pattern.append(matched_weight / total_weight if total_weight > 0 else 0.0)
+        return np.asarray(per_pattern, dtype=np.float64)[inverse]
+
+    def common_skills(self, job_skills):
+        """Per row, the job's (normalized, distinct) skills the row has - in job-skill order"""
+        normalized = list(dict.fromkeys(normalize_skill(skill) for skill in job_skills))
+        inverse, covered = self._coverage(normalized)
+        per_pattern = [
+            [skill for skill in normalized if self.vocabulary.get(skill) in columns]
+            for columns in covered
+        ]
+        return [list(per_pattern[pattern]) for pattern in inverse]
+
+
+class SkillIndex:
+    """Persisted skill vocabulary (skill -> integer id) and candidate -> skill id incidence, plus a log
+    of the record ids each write touched so a loaded matrix can be brought up to date row by row"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS skills (skill_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS record_skills ("
+                "record_id INTEGER NOT NULL, skill_id INTEGER NOT NULL, "
+                "PRIMARY KEY (record_id, skill_id)) WITHOUT ROWID"
+            )
+            # record_id NULL: every record changed (delete of the whole index)
+            conn.execute("CREATE TABLE IF NOT EXISTS record_changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, record_id INTEGER)")
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe across threads and processes.
+        # Callers close it with closing() - `with conn` alone only commits or rolls back
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _intern(self, conn, names):
+        conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+        skill_ids = {}
+        names = list(names)
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for skill_id, name in conn.execute(
+                f"SELECT skill_id, name FROM skills WHERE name IN ({placeholders})", chunk
+            ):
+                skill_ids[name] = skill_id
+        return skill_ids
+
+    def put_many(self, records):
+        """Replace the skills of {record_id: skill list}"""
+        if not records:
+            return 0
+        normalized = {
+            int(record_id): {normalize_skill(skill) for skill in skills or []}
+            for record_id, skills in records.items()
+        }
+        with self._lock, closing(self._connect()) as conn, conn:
+            skill_ids = self._intern(conn, set().union(*normalized.values()))
+            conn.executemany("DELETE FROM record_skills WHERE record_id = ?", [(record_id,) for record_id in normalized])
+            conn.executemany(
+                "INSERT INTO record_skills (record_id, skill_id) VALUES (?, ?)",
+                [(record_id, skill_ids[name]) for record_id, names in normalized.items() for name in names]
+            )
+            self._log_changes(conn, list(normalized))
+        return len(normalized)
+
+    def _log_changes(self, conn, record_ids):
+        """Append the touched ids (None for all) to the change log and trim it to CHANGE_LOG_LIMIT entries"""
+        conn.executemany("INSERT INTO record_changes (record_id) VALUES (?)", [(record_id,) for record_id in record_ids])
+        conn.execute(
+            "DELETE FROM record_changes WHERE seq <= (SELECT MAX(seq) FROM record_changes) - ?", (CHANGE_LOG_LIMIT,)
+        )
+
+    def delete(self, record_ids=None):
+        """Remove the skills of the given ids, or of every record when ids is None (the vocabulary stays)"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            if record_ids is None:
+                conn.execute("DELETE FROM record_skills")
+                self._log_changes(conn, [None])
+            else:
+                conn.executemany(
+                    "DELETE FROM record_skills WHERE record_id = ?", [(int(record_id),) for record_id in record_ids]
+                )
+                self._log_changes(conn, [int(record_id) for record_id in record_ids])
+
+    @staticmethod
+    def _names(conn):
+        names = [None] * (conn.execute("SELECT COALESCE(MAX(skill_id), 0) FROM skills").fetchone()[0] + 1)
+        for skill_id, name in conn.execute("SELECT skill_id, name FROM skills"):
+            names[skill_id] = name
+        return names
+
+    @staticmethod
+    def _matrix(pairs, names, change_seq):
+        """SkillMatrix of (record_id, skill_id) pairs grouped by record, sorted by skill id within a record"""
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        row_ids, starts = np.unique(pairs[:, 0], return_index=True)
+        matrix = SkillMatrix(row_ids, np.append(starts, len(pairs)), pairs[:, 1], names)
+        matrix.change_seq = change_seq
+        return matrix
+
+    def _load(self, conn, change_seq):
+        # Primary-key order: grouped by record, sorted by skill id within a record
+        pairs = conn.execute("SELECT record_id, skill_id FROM record_skills ORDER BY record_id, skill_id").fetchall()
+        return self._matrix(pairs, self._names(conn), change_seq)
+
+    def load_matrix(self):
+        """The whole index as a SkillMatrix - column = skill id, one row per indexed record"""
+        with closing(self._connect()) as conn:
+            # One read transaction, so the rows and the change-log position agree
+            conn.execute("BEGIN")
+            return self._load(conn, conn.execute("SELECT COALESCE(MAX(seq), 0) FROM record_changes").fetchone()[0])
+
+    def update_matrix(self, matrix):
+        """`matrix` brought up to date with the writes logged since it was loaded: only the rows of the
+        records changed since are re-read. Falls back to load_matrix() when the log no longer reaches back
+        that far or the whole index was deleted"""
+        if matrix.change_seq is None:
+            return self.load_matrix()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            latest, oldest = conn.execute("SELECT COALESCE(MAX(seq), 0), MIN(seq) FROM record_changes").fetchone()
+            if latest == matrix.change_seq:
+                return matrix
+            changed = [
+                record_id for (record_id,) in
+                conn.execute("SELECT DISTINCT record_id FROM record_changes WHERE seq > ?", (matrix.change_seq,))
+            ]
+            if oldest is None or oldest > matrix.change_seq + 1 or None in changed:
+                return self._load(conn, latest)
+            pairs = []
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(changed), 500):
+                chunk = changed[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                pairs.extend(conn.execute(
+                    f"SELECT record_id, skill_id FROM record_skills WHERE record_id IN ({placeholders}) "
+                    "ORDER BY record_id, skill_id", chunk
+                ).fetchall())
+            replacement = self._matrix(pairs, self._names(conn), latest)
+        updated = matrix.replace_rows(changed, replacement)
+        updated.change_seq = latest
+        return updated
@@ -3,22 +3,21 @@ from typing import Dict, Tuple
 import re
 
 try:
-    from sentence_transformers import SentenceTransformer, util
-    import torch
-    SEMANTIC_AVAILABLE = True
+    from embedding_service import embedding_service
+    from embedding_service import SENTENCE_TRANSFORMERS_AVAILABLE as SEMANTIC_AVAILABLE
 except ImportError:
     SEMANTIC_AVAILABLE = False
 
 class EnhancedCulturalExtractor:
     def __init__(self):
         if SEMANTIC_AVAILABLE:
-            try:
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
-                self.semantic_enabled = True
+            # Borrow the process-wide model instead of loading another copy
+            self.model = embedding_service.get_model()
+            self.semantic_enabled = self.model is not None
+            if self.semantic_enabled:
                 print("✅ Enhanced cultural extractor with semantic analysis ready!")
-            except Exception as e:
-                print(f"⚠️ Failed to load semantic model: {e}")
-                self.semantic_enabled = False
+            else:
+                print("⚠️ Failed to load semantic model")
         else:
             self.semantic_enabled = False
             print("⚠️ Enhanced cultural extractor using keyword-only mode")
@@ -5,10 +5,15 @@ from chroma_data_manager import ChromaDataManager
 from vector_db import vector_db
 from semantic_matcher import semantic_matcher
 from profile_analyzer import profile_analyzer
+from cultural_context import extract_cultural_context
+from location_resolver import location_score
+from batch_scorer import BatchScorer
+from parallel_matching import DEFAULT_MATCH_WORKERS, score_matches_parallel
 
 # New imports to support the hybrid cultuiral score calc.  
 import sys
 import os
+import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from semantic_matcher import semantic_matcher
@@ -17,25 +22,77 @@ from semantic_matcher import semantic_matcher
 print("=== 🤖 JOB-CANDIDATE MATCHER WITH CHROMA DB ===")
 
 class SimpleMatcher:
+    # Skill weights for realistic scoring
+    SKILL_WEIGHTS = {
+        'python': 0.15, 'javascript': 0.12, 'java': 0.12, 'react': 0.10,
+        'django': 0.08, 'flask': 0.08, 'node.js': 0.08, 'sql': 0.10,
+        'mongodb': 0.07, 'docker': 0.06, 'aws': 0.06, 'machine learning': 0.12,
+        'tensorflow': 0.08, 'pytorch': 0.08, 'statistics': 0.09, 'data analysis': 0.08,
+        'css': 0.05, 'html': 0.05, 'git': 0.04, 'rest api': 0.06
+    }
+    DEFAULT_SKILL_WEIGHT = 0.05
+    
+    ARCHETYPE_COMPATIBILITY = {
+        # High Growth IC: Best for scaling individual impact
+        'high_growth_ic': {
+            'high_growth_ic': 1.0,      # Perfect match
+            'technical_specialist': 0.8, # Good fit
+            'strategic_executive': 0.4,  # May be overqualified
+            'portfolio_leader': 0.6      # Moderate fit
+        },
+        # Technical Specialist: Deep expertise roles
+        'technical_specialist': {
+            'technical_specialist': 1.0,
+            'high_growth_ic': 0.9,
+            'strategic_executive': 0.3,
+            'portfolio_leader': 0.5
+        },
+        # Strategic Executive: Leadership roles
+        'strategic_executive': {
+            'strategic_executive': 1.0,
+            'portfolio_leader': 0.8,
+            'high_growth_ic': 0.4,
+            'technical_specialist': 0.2
+        },
+        # Portfolio Leader: Multi-team management
+        'portfolio_leader': {
+            'portfolio_leader': 1.0,
+            'strategic_executive': 0.9,
+            'high_growth_ic': 0.3,
+            'technical_specialist': 0.2
+        }
+    }
+    
+    CAREER_STAGE_LEVELS = {
+        'early_career': 1,
+        'mid_career': 2, 
+        'executive': 3
+    }
+    
+    GROWTH_DIMENSIONS = ['vertical_growth', 'scope_growth', 'impact_growth', 'adaptability', 'leadership_velocity']
+    
+    CULTURAL_ATTRIBUTES = ['teamwork', 'innovation', 'work_environment', 'work_pace', 'customer_focus']
+    
     def __init__(self):
         self.db = ChromaDataManager()
         self.semantic_matcher = semantic_matcher  # ADD THIS LINE
+        self.batch_scorer = BatchScorer(self, skill_matrix_fn=vector_db.skill_matrix_for)
         print("✅ Matcher initialized with Chroma Vector Database!")
     
+    def __getstate__(self):
+        # Parallel-matching workers only use the scoring rules - the database handles stay in this process
+        return {}
+    
+    def __setstate__(self, state):
+        self.db = None
+        self.semantic_matcher = semantic_matcher
+        self.batch_scorer = BatchScorer(self)
+    
     def calculate_skill_score(self, job_skills, candidate_skills):
         """Calculate weighted skill match score"""
         if not job_skills:
             return 0.0
         
-        # Skill weights for realistic scoring
-        skill_weights = {
-            'python': 0.15, 'javascript': 0.12, 'java': 0.12, 'react': 0.10,
-            'django': 0.08, 'flask': 0.08, 'node.js': 0.08, 'sql': 0.10,
-            'mongodb': 0.07, 'docker': 0.06, 'aws': 0.06, 'machine learning': 0.12,
-            'tensorflow': 0.08, 'pytorch': 0.08, 'statistics': 0.09, 'data analysis': 0.08,
-            'css': 0.05, 'html': 0.05, 'git': 0.04, 'rest api': 0.06
-        }
-        
         total_weight = 0
         matched_weight = 0
         
@@ -43,7 +100,7 @@ class SimpleMatcher:
         
         for skill in job_skills:
             skill_lower = skill.lower()
-            weight = skill_weights.get(skill_lower, 0.05)
+            weight = self.SKILL_WEIGHTS.get(skill_lower, self.DEFAULT_SKILL_WEIGHT)
             total_weight += weight
             if skill_lower in candidate_skills_lower:
                 matched_weight += weight
@@ -51,16 +108,20 @@ class SimpleMatcher:
         score = matched_weight / total_weight if total_weight > 0 else 0.0
         return score
     
-    def calculate_experience_score(self, job_title, candidate_experience):
-        """Calculate experience suitability score"""
+    def required_experience(self, job_title):
+        """Years of experience a job title implies"""
         job_lower = job_title.lower()
         
         if 'senior' in job_lower or 'lead' in job_lower or 'principal' in job_lower:
-            required_exp = 5
+            return 5
         elif 'junior' in job_lower or 'entry' in job_lower:
-            required_exp = 1
+            return 1
         else:
-            required_exp = 3
+            return 3
+    
+    def calculate_experience_score(self, job_title, candidate_experience):
+        """Calculate experience suitability score"""
+        required_exp = self.required_experience(job_title)
         
         if candidate_experience >= required_exp:
             return 1.0
@@ -70,297 +131,11 @@ class SimpleMatcher:
             return 0.1
     
     def calculate_global_location_score(self, job_location, candidate_location, candidate_willing_to_relocate=False, company_relocation_support=False):
-        """Enhanced global location compatibility scoring"""
-        if not job_location or not candidate_location:
-            return 0.5
-        
-        job_loc = job_location.lower().strip()
-        candidate_loc = candidate_location.lower().strip()
-        
-        # Handle remote work scenarios
-        if self._is_remote(job_loc):
-            return 1.0
-        
-        if self._is_remote(candidate_loc) and not self._is_remote(job_loc):
-            return 0.3  # Candidate wants remote but job requires on-site
-        
-        # Exact match
-        if job_loc == candidate_loc:
-            return 1.0
-        
-        # Calculate base geographic proximity (40% weight)
-        geo_score = self._calculate_geographic_proximity(job_loc, candidate_loc)
-        
-        # Calculate relocation practicality (30% weight)
-        practical_score = self._calculate_relocation_practicality(job_loc, candidate_loc)
-        
-        # Calculate professional context (20% weight)
-        professional_score = self._calculate_professional_context(job_loc, candidate_loc)
-        
-        # Calculate candidate preferences (10% weight)
-        preference_score = self._calculate_preference_score(candidate_willing_to_relocate, company_relocation_support)
-        
-        # Weighted combined score
-        base_score = (geo_score * 0.4) + (practical_score * 0.3) + (professional_score * 0.2) + (preference_score * 0.1)
-        
-        # Apply modifiers
-        final_score = self._apply_location_modifiers(base_score, job_loc, candidate_loc)
-        
-        return max(0.0, min(1.0, final_score))
-    
-    def _is_remote(self, location):
-        """Check if location indicates remote work"""
-        remote_indicators = ['remote', 'anywhere', 'flexible', 'virtual', 'wfh', 'work from home']
-        return any(indicator in location for indicator in remote_indicators)
-    
-    def _calculate_geographic_proximity(self, job_loc, candidate_loc):
-        """Calculate geographic proximity score (40% weight)"""
-        # Major global tech hubs and metro areas
-        tech_hubs = {
-            'north_america': ['san francisco', 'new york', 'seattle', 'toronto', 'chicago','austin', 'boston', 'los angeles'],
-            'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin', 'stockholm', 'barcelona'],
-            'asia': ['tokyo', 'singapore', 'bangalore', 'hong kong', 'seoul', 'shanghai', 'shenzhen'],
-            'south_asia': ['mumbai', 'delhi', 'bangalore', 'hyderabad', 'chennai'],
-            'middle_east': ['dubai', 'tel aviv', 'riyadh'],
-            'oceania': ['sydney', 'melbourne', 'auckland']
-        }
-        
-        # Check same city/metro area
-        if self._is_same_metro_area(job_loc, candidate_loc):
-            return 0.9
-        
-        # Check same major hub
-        job_hub = self._identify_tech_hub(job_loc, tech_hubs)
-        candidate_hub = self._identify_tech_hub(candidate_loc, tech_hubs)
-        
-        if job_hub and candidate_hub and job_hub == candidate_hub:
-            return 0.8  # Same hub cluster
-        
-        # Same country
-        if self._is_same_country(job_loc, candidate_loc):
-            return 0.6
-        
-        # Neighboring countries/same region
-        if self._is_same_region(job_loc, candidate_loc):
-            return 0.4
-        
-        # Same continent
-        if self._is_same_continent(job_loc, candidate_loc):
-            return 0.3
-        
-        # Global (different continents)
-        return 0.2
-    
-    def _calculate_relocation_practicality(self, job_loc, candidate_loc):
-        """Calculate relocation practicality score (30% weight)"""
-        score = 0.5  # Base neutral score
-        
-        # Visa requirements consideration
-        if self._has_visa_advantages(job_loc, candidate_loc):
-            score += 0.2
-        elif self._has_visa_complexity(job_loc, candidate_loc):
-            score -= 0.2
-        
-        # Language compatibility
-        if self._has_language_compatibility(job_loc, candidate_loc):
-            score += 0.15
-        
-        # Cultural similarity
-        if self._has_cultural_similarity(job_loc, candidate_loc):
-            score += 0.1
-        
-        return max(0.0, min(1.0, score))
-    
-    def _calculate_professional_context(self, job_loc, candidate_loc):
-        """Calculate professional context score (20% weight)"""
-        global_tech_hubs = ['san francisco', 'london', 'tokyo', 'singapore', 'bangalore', 'berlin', 'new york', 'seattle']
-        
-        job_is_hub = any(hub in job_loc for hub in global_tech_hubs)
-        candidate_is_hub = any(hub in candidate_loc for hub in global_tech_hubs)
-        
-        if job_is_hub and candidate_is_hub:
-            return 0.8  # Both global tech hubs
-        elif job_is_hub or candidate_is_hub:
-            return 0.6  # One is a tech hub
-        else:
-            return 0.4  # Neither major hub
-    
-    def _calculate_preference_score(self, willing_to_relocate, company_relocation_support):
-        """Calculate preference score (10% weight)"""
-        score = 0.5  # Base neutral
-        
-        if willing_to_relocate:
-            score += 0.3
-        
-        if company_relocation_support:
-            score += 0.2
-        
-        return max(0.0, min(1.0, score))
-    
-    def _apply_location_modifiers(self, base_score, job_loc, candidate_loc):
-        """Apply final location modifiers"""
-        final_score = base_score
-        
-        # Time zone difference penalty
-        tz_penalty = self._calculate_timezone_penalty(job_loc, candidate_loc)
-        final_score -= tz_penalty
-        
-        # Established business corridor bonus
-        if self._is_established_corridor(job_loc, candidate_loc):
-            final_score += 0.1
-        
-        return max(0.0, min(1.0, final_score))
-    
-    def _is_same_metro_area(self, loc1, loc2):
-        """Check if locations are in same metropolitan area"""
-        metro_areas = {
-            'san francisco': ['oakland', 'san jose', 'berkeley', 'palo alto'],
-            'london': ['greater london', 'london uk'],
-            'tokyo': ['tokyo japan', 'greater tokyo'],
-            'bangalore': ['bengaluru', 'bangalore india']
-        }
-        
-        for city, areas in metro_areas.items():
-            if city in loc1 and any(area in loc2 for area in areas):
-                return True
-            if city in loc2 and any(area in loc1 for area in areas):
-                return True
-        return False
-    
-    def _identify_tech_hub(self, location, tech_hubs):
-        """Identify which tech hub cluster the location belongs to"""
-        for region, hubs in tech_hubs.items():
-            if any(hub in location for hub in hubs):
-                return region
-        return None
-    
-    def _is_same_country(self, loc1, loc2):
-        """Simple same country detection"""
-        country_indicators = {
-            'usa': ['new york', 'san francisco', 'chicago', 'austin', 'boston'],
-            'india': ['bangalore', 'mumbai', 'delhi', 'hyderabad', 'chennai'],
-            'uk': ['london', 'manchester', 'birmingham', 'edinburgh'],
-            'germany': ['berlin', 'munich', 'hamburg', 'frankfurt'],
-            'japan': ['tokyo', 'osaka', 'kyoto', 'yokohama']
-        }
-        
-        for country, cities in country_indicators.items():
-            if any(city in loc1 for city in cities) and any(city in loc2 for city in cities):
-                return True
-        return False
-    
-    def _is_same_region(self, loc1, loc2):
-        """Check if locations are in same geographic region"""
-        regions = {
-            'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin'],
-            'south_asia': ['bangalore', 'mumbai', 'delhi', 'chennai'],
-            'east_asia': ['tokyo', 'seoul', 'shanghai', 'hong kong'],
-            'north_america': ['san francisco', 'new york', 'toronto', 'seattle']
-        }
-        
-        loc1_region = None
-        loc2_region = None
-        
-        for region, cities in regions.items():
-            if any(city in loc1 for city in cities):
-                loc1_region = region
-            if any(city in loc2 for city in cities):
-                loc2_region = region
-        
-        return loc1_region and loc2_region and loc1_region == loc2_region
-    
-    def _is_same_continent(self, loc1, loc2):
-        """Simple continent detection"""
-        continents = {
-            'asia': ['tokyo', 'singapore', 'bangalore', 'seoul', 'shanghai'],
-            'europe': ['london', 'berlin', 'paris', 'amsterdam', 'dublin'],
-            'north america': ['san francisco', 'new york', 'toronto', 'chicago'],
-            'south america': ['sao paulo', 'buenos aires', 'bogota']
-        }
-        
-        loc1_continent = None
-        loc2_continent = None
-        
-        for continent, cities in continents.items():
-            if any(city in loc1 for city in cities):
-                loc1_continent = continent
-            if any(city in loc2 for city in cities):
-                loc2_continent = continent
-        
-        return loc1_continent and loc2_continent and loc1_continent == loc2_continent
-    
-    def _has_visa_advantages(self, job_loc, candidate_loc):
-        """Check if visa situation is favorable"""
-        # EU free movement, Commonwealth countries, etc.
-        favorable_pairs = [
-            ('germany', 'france'), ('uk', 'ireland'), 
-            ('australia', 'new zealand'), ('canada', 'usa')
-        ]
-        
-        for country1, country2 in favorable_pairs:
-            if country1 in job_loc and country2 in candidate_loc:
-                return True
-            if country2 in job_loc and country1 in candidate_loc:
-                return True
-        return False
-    
-    def _has_visa_complexity(self, job_loc, candidate_loc):
-        """Check if visa situation is complex"""
-        # Simplified - in reality would need comprehensive visa data
-        complex_pairs = [
-            ('usa', 'china'), ('russia', 'europe'), 
-            ('middle east', 'certain countries')  # Placeholder
-        ]
-        return any(pair[0] in job_loc and pair[1] in candidate_loc for pair in complex_pairs)
-    
-    def _has_language_compatibility(self, job_loc, candidate_loc):
-        """Check language compatibility"""
-        english_speaking = ['usa', 'uk', 'canada', 'australia', 'singapore', 'india']
-        return any(country in job_loc for country in english_speaking) and any(country in candidate_loc for country in english_speaking)
-    
-    def _has_cultural_similarity(self, job_loc, candidate_loc):
-        """Check cultural similarity"""
-        similar_cultures = [
-            ('usa', 'canada'), ('uk', 'australia'), 
-            ('germany', 'france'), ('japan', 'south korea')
-        ]
-        return any(pair[0] in job_loc and pair[1] in candidate_loc for pair in similar_cultures)
-    
-    def _calculate_timezone_penalty(self, job_loc, candidate_loc):
-        """Calculate timezone difference penalty"""
-        # Simplified timezone estimation
-        timezones = {
-            'usa': -5, 'uk': 0, 'germany': 1, 'india': 5.5, 
-            'singapore': 8, 'japan': 9, 'australia': 10
-        }
-        
-        job_tz = next((tz for country, tz in timezones.items() if country in job_loc), 0)
-        candidate_tz = next((tz for country, tz in timezones.items() if country in candidate_loc), 0)
-        
-        difference = abs(job_tz - candidate_tz)
-        
-        if difference <= 2:
-            return 0.0
-        elif difference <= 4:
-            return 0.05
-        elif difference <= 6:
-            return 0.1
-        else:
-            return 0.15
-    
-    def _is_established_corridor(self, job_loc, candidate_loc):
-        """Check if locations have established business corridor"""
-        established_corridors = [
-            ('san francisco', 'bangalore'), ('london', 'new york'),
-            ('singapore', 'hong kong'), ('berlin', 'amsterdam')
-        ]
-        
-        for loc1, loc2 in established_corridors:
-            if loc1 in job_loc and loc2 in candidate_loc:
-                return True
-            if loc2 in job_loc and loc1 in candidate_loc:
-                return True
-        return False
+        """Enhanced global location compatibility scoring.
+        Geographic proximity (40%), relocation practicality (30%), professional context (20%) and
+        candidate preferences (10%), adjusted for time zones and business corridors - each location
+        string is resolved once and pair scores are memoized (see location_resolver.location_score)"""
+        return location_score(job_location, candidate_location, candidate_willing_to_relocate, company_relocation_support)
     
     def get_match_grade(self, total_score):
         """Convert numerical score to letter grade"""
@@ -385,13 +160,7 @@ class SimpleMatcher:
         growth_dimensions = growth_metrics.get('growth_dimensions', {})
         
         if growth_dimensions:
-            dimension_scores = [
-                growth_dimensions.get('vertical_growth', 0),
-                growth_dimensions.get('scope_growth', 0),
-                growth_dimensions.get('impact_growth', 0),
-                growth_dimensions.get('adaptability', 0),
-                growth_dimensions.get('leadership_velocity', 0)
-            ]
+            dimension_scores = [growth_dimensions.get(dimension, 0) for dimension in self.GROWTH_DIMENSIONS]
             avg_dimension_score = sum(dimension_scores) / len(dimension_scores)
             # Combine base score with dimension average
             final_score = (base_score * 0.7) + (avg_dimension_score * 0.3)
@@ -404,59 +173,28 @@ class SimpleMatcher:
         """Match job's required archetype with candidate's natural trajectory"""
         job_archetype = job.get('growth_requirements', {}).get('role_archetype')
         candidate_archetype = candidate.get('growth_metrics', {}).get('career_archetype')
-        
+        return self.archetype_compatibility(job_archetype, candidate_archetype)
+    
+    def archetype_compatibility(self, job_archetype, candidate_archetype):
+        """Compatibility of a candidate archetype with the archetype a job asks for"""
         if not job_archetype or not candidate_archetype:
             return 0.7  # Neutral if missing data
         
-        archetype_compatibility = {
-            # High Growth IC: Best for scaling individual impact
-            'high_growth_ic': {
-                'high_growth_ic': 1.0,      # Perfect match
-                'technical_specialist': 0.8, # Good fit
-                'strategic_executive': 0.4,  # May be overqualified
-                'portfolio_leader': 0.6      # Moderate fit
-            },
-            # Technical Specialist: Deep expertise roles
-            'technical_specialist': {
-                'technical_specialist': 1.0,
-                'high_growth_ic': 0.9,
-                'strategic_executive': 0.3,
-                'portfolio_leader': 0.5
-            },
-            # Strategic Executive: Leadership roles
-            'strategic_executive': {
-                'strategic_executive': 1.0,
-                'portfolio_leader': 0.8,
-                'high_growth_ic': 0.4,
-                'technical_specialist': 0.2
-            },
-            # Portfolio Leader: Multi-team management
-            'portfolio_leader': {
-                'portfolio_leader': 1.0,
-                'strategic_executive': 0.9,
-                'high_growth_ic': 0.3,
-                'technical_specialist': 0.2
-            }
-        }
-        
-        return archetype_compatibility.get(job_archetype, {}).get(candidate_archetype, 0.5)
+        return self.ARCHETYPE_COMPATIBILITY.get(job_archetype, {}).get(candidate_archetype, 0.5)
     
     def assess_career_stage_match(self, job, candidate):
         """Assess if candidate's career stage aligns with job requirements"""
         job_stage = job.get('growth_requirements', {}).get('target_career_stage')
         candidate_stage = candidate.get('growth_metrics', {}).get('career_stage')
-        
+        return self.career_stage_compatibility(job_stage, candidate_stage)
+    
+    def career_stage_compatibility(self, job_stage, candidate_stage):
+        """Compatibility of a candidate career stage with the stage a job targets"""
         if not job_stage or not candidate_stage:
             return 0.7  # Neutral if missing data
         
-        stage_progression = {
-            'early_career': 1,
-            'mid_career': 2, 
-            'executive': 3
-        }
-        
-        job_level = stage_progression.get(job_stage, 2)
-        candidate_level = stage_progression.get(candidate_stage, 2)
+        job_level = self.CAREER_STAGE_LEVELS.get(job_stage, 2)
+        candidate_level = self.CAREER_STAGE_LEVELS.get(candidate_stage, 2)
         
         # Scoring logic:
         if candidate_level == job_level:
@@ -504,14 +242,17 @@ class SimpleMatcher:
     
     def get_career_alignment_insights(self, job, candidate):
         """Get human-readable insights about career alignment"""
-        archetype_match = self.assess_archetype_match(job, candidate)
-        stage_match = self.assess_career_stage_match(job, candidate)
-        growth_trajectory = self.assess_growth_trajectory(job, candidate)
-        
-        job_archetype = job.get('growth_requirements', {}).get('role_archetype')
-        candidate_archetype = candidate.get('growth_metrics', {}).get('career_archetype')
-        job_stage = job.get('growth_requirements', {}).get('target_career_stage')
-        candidate_stage = candidate.get('growth_metrics', {}).get('career_stage')
+        return self.format_career_alignment_insights(
+            job.get('growth_requirements', {}).get('role_archetype'),
+            candidate.get('growth_metrics', {}).get('career_archetype'),
+            job.get('growth_requirements', {}).get('target_career_stage'),
+            candidate.get('growth_metrics', {}).get('career_stage'),
+            self.assess_growth_trajectory(job, candidate)
+        )
+    
+    def format_career_alignment_insights(self, job_archetype, candidate_archetype, job_stage, candidate_stage, growth_trajectory):
+        """Career alignment insights from the extracted archetypes / stages and the trajectory score"""
+        archetype_match = self.archetype_compatibility(job_archetype, candidate_archetype)
         
         insights = []
         
@@ -524,9 +265,8 @@ class SimpleMatcher:
             insights.append(f"❌ Weak archetype match ({self.format_archetype(job_archetype)} ↔ {self.format_archetype(candidate_archetype)})")
         
         # Career stage insights
-        stage_progression = {'early_career': 1, 'mid_career': 2, 'executive': 3}
-        job_level = stage_progression.get(job_stage, 2)
-        candidate_level = stage_progression.get(candidate_stage, 2)
+        job_level = self.CAREER_STAGE_LEVELS.get(job_stage, 2)
+        candidate_level = self.CAREER_STAGE_LEVELS.get(candidate_stage, 2)
         
         if candidate_level == job_level:
             insights.append("✅ Perfect career stage alignment")
@@ -559,8 +299,14 @@ class SimpleMatcher:
         }
         return archetypes.get(archetype, archetype)
     
-    def find_matches(self, jobs=None, candidates=None):
-        """Enhanced matching using Chroma vector database for semantic search"""
+    def find_matches(self, jobs=None, candidates=None, candidate_filter=None, max_distance_km=None, top_k=None, workers=None):
+        """Enhanced matching using Chroma vector database for semantic search
+        candidate_filter: optional Chroma `where` (see vector_db.build_candidate_filter) applied during retrieval
+        max_distance_km: optional geographic pre-filter - only candidates in gazetteer cities within this
+        distance of each job's city are retrieved (jobs whose location is not a known city are not limited)
+        top_k: optional positive count - keep only each job's best top_k matches (the same ones, in the same
+        order, as the head of the full list); expensive scoring is skipped for candidates that cannot make it
+        workers: processes to score job batches on (default MATCH_WORKERS, 1 = in-process) - same output either way"""
         if jobs is None:
             jobs = self.db.load_jobs()
         if candidates is None:
@@ -578,93 +324,122 @@ class SimpleMatcher:
         
         matches = {}
         
-        for job_index, job in enumerate(jobs):
-            print(f"\n📋 Processing: {job['title']}")
-            matches[job_index] = []
-            
-            # Use Chroma for instant semantic search
-            chroma_matches = vector_db.find_matches_for_job(job, top_k=50)
-            
+        # Use Chroma for instant semantic search - every job in one batched query
+        if max_distance_km is None:
+            chroma_matches_per_job = self.db.find_matches_for_jobs(jobs, top_k=50, where=candidate_filter)
+        else:
+            chroma_matches_per_job = self._find_matches_near(jobs, candidate_filter, max_distance_km)
+        
+        # Candidate feature arrays are built once for every shortlisted candidate, then shared by all jobs
+        shortlisted = {}
+        for chroma_matches in chroma_matches_per_job:
             for match in chroma_matches:
                 candidate = match['candidate']
-                
-                # Calculate individual score components
-                skill_score = self.calculate_skill_score(
-                    job.get('required_skills', []), 
-                    candidate.get('skills', [])
-                )
-                
-                experience_score = self.calculate_experience_score(
-                    job.get('title', ''), 
-                    candidate.get('experience_years', 0)
-                )
-                
-                # Use enhanced global location scoring
-                location_score = self.calculate_global_location_score(
-                    job.get('location', ''), 
-                    candidate.get('location', '')
-                )
-                
-                # Get semantic score from Chroma
-                semantic_score = match['score']
-
-                # Calculate cultural fit
-                cultural_fit = self._calculate_cultural_fit(job, candidate)
-
-                # NEW: Calculate growth potential score
-                growth_potential_score = self.calculate_growth_potential_score(candidate)
-
-                # NEW: Calculate career alignment scores
-                archetype_match = self.assess_archetype_match(job, candidate)
-                career_stage_match = self.assess_career_stage_match(job, candidate)
-                growth_trajectory = self.assess_growth_trajectory(job, candidate)
-
-                # Calculate total weighted score with all components
-                total_score = (
-                    skill_score * 0.30 +           # Skill matching (reduced from 0.35)
-                    experience_score * 0.20 +      # Experience rules (reduced from 0.25)
-                    location_score * 0.15 +        # Global location scoring  
-                    semantic_score * 0.20 +        # Semantic understanding from Chroma
-                    cultural_fit['final_score'] * 0.05 +  # Cultural fit (5%)
-                    growth_potential_score * 0.10  # NEW: Growth potential (10%)
+                shortlisted.setdefault(self._candidate_key(candidate), candidate)
+        row_of = {key: row for row, key in enumerate(shortlisted)}
+        features = self.batch_scorer.candidate_features(list(shortlisted.values()))
+        
+        if workers is None:
+            workers = DEFAULT_MATCH_WORKERS
+        
+        shortlists = []
+        for job_index, job in enumerate(jobs):
+            chroma_matches = chroma_matches_per_job[job_index]
+            shortlist = [match['candidate'] for match in chroma_matches]
+            rows = [row_of[self._candidate_key(candidate)] for candidate in shortlist]
+            shortlists.append((shortlist, rows, [match['score'] for match in chroma_matches]))
+        
+        if workers > 1 and len(jobs) > 1:
+            # Workers have no database or model handles - semantic cultural fit is scored here, only for
+            # the candidates the pool reports can still reach each job's top_k; the rest runs in the pool
+            print(f"   Scoring on {workers} worker processes")
+            tasks = [(job, rows, semantic_scores, top_k) for job, (_, rows, semantic_scores) in zip(jobs, shortlists)]
+            scored = score_matches_parallel(
+                self, features, tasks, workers,
+                lambda index, positions: self._calculate_semantic_cultural_fit_many(
+                    jobs[index], [shortlists[index][0][p] for p in positions]
                 )
+            )
+        else:
+            scored = []
+            for job, (shortlist, rows, semantic_scores) in zip(jobs, shortlists):
+                # Every score component for the whole shortlist as array operations; with top_k, semantic
+                # cultural fit only for candidates whose best possible score can still reach the top_k
+                scored.append(self.batch_scorer.score_matches(
+                    job, features, rows, semantic_scores,
+                    lambda positions: self._calculate_semantic_cultural_fit_many(job, [shortlist[p] for p in positions]),
+                    top_k
+                ))
+        
+        for job_index, job in enumerate(jobs):
+            print(f"\n📋 Processing: {job['title']}")
+            # Ranked by final score
+            matches[job_index] = self._scored_matches(chroma_matches_per_job[job_index], scored[job_index])
+            print(f"   ✅ Found {len(matches[job_index])} matches using vector search")
+        
+        return matches, jobs, candidates
+    
+    def _scored_matches(self, chroma_matches, scored):
+        """The retrieved matches of one job completed with BatchScorer.score_matches output, in its ranking order"""
+        breakdown = scored['breakdown']
+        job_matches = []
+        for position, shortlist_position in enumerate(scored['positions']):
+            match = chroma_matches[shortlist_position]
+            # Update the match with complete scoring
+            match['score'] = scored['total'][position]
+            match['score_breakdown'] = {
+                'skills': breakdown['skills'][position],
+                'experience': breakdown['experience'][position],
+                'location': breakdown['location'][position],
+                'semantic': breakdown['semantic'][position],
+                'cultural_fit': breakdown['cultural_fit'][position],
+                'growth_potential': breakdown['growth_potential'][position]
+            }
 
-                # Update the match with complete scoring
-                match['score'] = total_score
-                match['score_breakdown'] = {
-                    'skills': int(skill_score * 100),
-                    'experience': int(experience_score * 100),
-                    'location': int(location_score * 100),
-                    'semantic': int(semantic_score * 100),
-                    'cultural_fit': int(cultural_fit['final_score'] * 100),
-                    'growth_potential': int(growth_potential_score * 100)  # NEW
-                }
-
-                # Add cultural fit breakdown
-                match['cultural_breakdown'] = {
-                    'keyword_score': int(cultural_fit['keyword_score'] * 100),
-                    'semantic_score': int(cultural_fit['semantic_score'] * 100),  
-                    'final_score': int(cultural_fit['final_score'] * 100)
-                }
+            # Add cultural fit breakdown
+            match['cultural_breakdown'] = {
+                'keyword_score': breakdown['cultural_keyword'][position],
+                'semantic_score': breakdown['cultural_semantic'][position],  
+                'final_score': breakdown['cultural_fit'][position]
+            }
 
-                # NEW: Add career alignment data
-                match['career_alignment'] = {
-                    'archetype_match': int(archetype_match * 100),
-                    'career_stage_match': int(career_stage_match * 100),
-                    'growth_trajectory': int(growth_trajectory * 100),
-                    'insights': self.get_career_alignment_insights(job, candidate)
-                }
+            # Add career alignment data
+            match['career_alignment'] = {
+                'archetype_match': breakdown['archetype_match'][position],
+                'career_stage_match': breakdown['career_stage_match'][position],
+                'growth_trajectory': breakdown['growth_trajectory'][position],
+                'insights': scored['insights'][position]
+            }
 
-                match['match_grade'] = self.get_match_grade(total_score)
-                
-                matches[job_index].append(match)
-            
-            # Sort by final score
-            matches[job_index].sort(key=lambda x: x['score'], reverse=True)
+            match['match_grade'] = scored['match_grade'][position]
+            # Great-circle distance between the job's and the candidate's city (None when either is unknown)
+            match['distance_km'] = scored['distance_km'][position]
             
-            print(f"   ✅ Found {len(matches[job_index])} matches using vector search")
-        
-        return matches, jobs, candidates
+            job_matches.append(match)
+        return job_matches
+    
+    def _find_matches_near(self, jobs, candidate_filter, max_distance_km):
+        """Retrieval with a per-job geographic pre-filter - jobs that share a filter share one batched query"""
+        groups = {}
+        for job_index, job in enumerate(jobs):
+            where = vector_db.build_candidate_filter(near_location=job.get('location', ''), radius_km=max_distance_km)
+            if where and candidate_filter:
+                where = {'$and': [candidate_filter, where]}
+            elif candidate_filter:
+                where = candidate_filter
+            groups.setdefault(json.dumps(where, sort_keys=True), (where, []))[1].append(job_index)
+        
+        chroma_matches_per_job = [[] for _ in jobs]
+        for where, job_indices in groups.values():
+            group_matches = self.db.find_matches_for_jobs([jobs[i] for i in job_indices], top_k=50, where=where)
+            for job_index, job_matches in zip(job_indices, group_matches):
+                chroma_matches_per_job[job_index] = job_matches
+        return chroma_matches_per_job
+    
+    def _candidate_key(self, candidate):
+        """Identity of a shortlisted candidate - its id, or the object itself for ad-hoc records"""
+        candidate_id = candidate.get('id')
+        return ('id', candidate_id) if candidate_id is not None else ('object', id(candidate))
     
     def add_new_candidate(self, candidate_data):
         """Add a new candidate to both database and vector index"""
@@ -689,8 +464,8 @@ class SimpleMatcher:
             print(f"❌ Error adding job: {e}")
             return None
 
-    def _calculate_cultural_fit(self, job_data, candidate):
-        """Calculate cultural fit between job and candidate"""
+    def _calculate_cultural_fit(self, job_data, candidate, semantic_score=None):
+        """Calculate cultural fit between job and candidate (semantic_score may be precomputed in batch)"""
         job_cultural = job_data.get('cultural_attributes', {})
         candidate_cultural = candidate.get('cultural_attributes', {})
     
@@ -704,26 +479,12 @@ class SimpleMatcher:
         total_score = 0
         count = 0
     
-        for attr in ['teamwork', 'innovation', 'work_environment', 'work_pace', 'customer_focus']:
-            job_score_raw = job_cultural.get(attr, 0.5)
-            candidate_score_raw = candidate_cultural.get(attr, 0.5)
-
-            # Handle case where scores are stored as tuples/lists (score, confidence)
-            if isinstance(job_score_raw, (list, tuple)) and len(job_score_raw) > 0:
-                job_score = job_score_raw[0]  # Take the first element (score)
-            else:
-                job_score = job_score_raw
+        for attr in self.CULTURAL_ATTRIBUTES:
+            job_score = self._cultural_attribute_value(job_cultural.get(attr, 0.5))
+            candidate_score = self._cultural_attribute_value(candidate_cultural.get(attr, 0.5))
             
-            if isinstance(candidate_score_raw, (list, tuple)) and len(candidate_score_raw) > 0:
-                candidate_score = candidate_score_raw[0]  # Take the first element (score)
-            else:
-                candidate_score = candidate_score_raw
-        
-            # Ensure scores are numbers
-            try:
-                job_score = float(job_score)
-                candidate_score = float(candidate_score)
-            except (ValueError, TypeError):
+            # Unusable scores on either side count as a neutral pair
+            if job_score is None or candidate_score is None:
                 job_score = 0.5
                 candidate_score = 0.5    
 
@@ -736,7 +497,8 @@ class SimpleMatcher:
         keyword_score = total_score / count if count > 0 else 0.5
         
         # Calculate semantic score (new addition)
-        semantic_score = self._calculate_semantic_cultural_fit(job_data, candidate)
+        if semantic_score is None:
+            semantic_score = self._calculate_semantic_cultural_fit(job_data, candidate)
         
         # Combine with 70/30 weighting (keyword emphasized)
         final_score = (0.7 * keyword_score) + (0.3 * semantic_score)
@@ -747,6 +509,18 @@ class SimpleMatcher:
             'final_score': final_score
         }
 
+    def _cultural_attribute_value(self, score_raw):
+        """Numeric score of a cultural attribute, or None when it is not usable"""
+        # Handle case where scores are stored as tuples/lists (score, confidence)
+        if isinstance(score_raw, (list, tuple)) and len(score_raw) > 0:
+            score_raw = score_raw[0]  # Take the first element (score)
+        
+        # Ensure scores are numbers
+        try:
+            return float(score_raw)
+        except (ValueError, TypeError):
+            return None
+
     def _calculate_semantic_cultural_fit(self, job_data, candidate):
         """Calculate cultural fit using semantic similarity of cultural context"""
         # Extract cultural-relevant text from job and candidate
@@ -760,30 +534,54 @@ class SimpleMatcher:
         semantic_score = self.semantic_matcher.calculate_similarity(job_text, candidate_text)
         return semantic_score
     
+    def _calculate_semantic_cultural_fit_many(self, job_data, candidates):
+        """Semantic cultural fit for one job against many candidates with a single batched similarity call"""
+        job_text = self._extract_cultural_context(job_data)
+        scores = [0.5 for _ in candidates]
+        
+        # Only pairs that reach the semantic step in _calculate_cultural_fit need scoring
+        if not job_text or not job_data.get('cultural_attributes', {}):
+            return scores
+        
+        candidate_texts = {}
+        for i, candidate in enumerate(candidates):
+            if not candidate.get('cultural_attributes', {}):
+                continue
+            candidate_text = self._extract_cultural_context(candidate)
+            if candidate_text:
+                candidate_texts[i] = candidate_text
+        
+        # Precomputed ingest-time vectors turn the semantic step into a dot product
+        job_vector = None
+        candidate_vectors = {}
+        if job_data.get('id') is not None:
+            job_vector = vector_db.get_cultural_context_embeddings(
+                'job', {job_data['id']: job_text}
+            ).get(job_data['id'])
+        if job_vector is not None:
+            candidate_vectors = vector_db.get_cultural_context_embeddings(
+                'candidate',
+                {candidates[i]['id']: text for i, text in candidate_texts.items() if candidates[i].get('id') is not None}
+            )
+        
+        pair_indices = []
+        pairs = []
+        for i, candidate_text in candidate_texts.items():
+            candidate_vector = candidate_vectors.get(candidates[i].get('id'))
+            if candidate_vector is not None:
+                scores[i] = float(job_vector @ candidate_vector)
+            else:
+                # Ad-hoc or not-yet-indexed records still go through the model (batched)
+                pair_indices.append(i)
+                pairs.append((job_text, candidate_text))
+        
+        for i, score in zip(pair_indices, self.semantic_matcher.calculate_similarity_many(pairs)):
+            scores[i] = score
+        return scores
+    
     def _extract_cultural_context(self, data):
         """Extract cultural-relevant text from job or candidate data"""
-        cultural_text_parts = []
-    
-        cultural_attrs = data.get('cultural_attributes', {})
-        # Extract from cultural attributes if available
-        if cultural_attrs:
-            # Convert numerical scores to descriptive text for semantic analysis
-            for attr, value in cultural_attrs.items():
-                if isinstance(value, (list, tuple)) and len(value) > 0:
-                    score = value[0]
-                    if score >= 0.7:
-                        cultural_text_parts.append(f"strong {attr}")
-                    elif score >= 0.6:
-                        cultural_text_parts.append(f"moderate {attr}")
-                    elif score <= 0.4:
-                        cultural_text_parts.append(f"low {attr}")
-        
-        # Add general description for broader context
-        description = data.get('description', '') or data.get('summary', '') or data.get('role', '')
-        if description:
-            cultural_text_parts.append(description)
-            
-        return " ".join(cultural_text_parts) if cultural_text_parts else ""
+        return extract_cultural_context(data)
 
 # Test function
 def main():
@@ -162,7 +162,7 @@ class CandidatesModule {
         `;
     }
 
-    showCandidateDetail(candidateId) {
+    async showCandidateDetail(candidateId) {
         const candidate = this.currentCandidates.find(c => c.id === candidateId);
         
         if (!candidate) {
@@ -173,6 +173,17 @@ class CandidatesModule {
         
         this.populateCandidateDetailModal(candidate);
         this.openCandidateDetailModal();
+        
+        // The raw resume text is not part of the list payload - fetch it on demand
+        if (candidate.original_resume_text === undefined) {
+            try {
+                const data = await api.get(`/api/get-candidate/${candidateId}`);
+                candidate.original_resume_text = (data.candidate && data.candidate.original_resume_text) || '';
+                this.populateCandidateDetailModal(candidate);
+            } catch (error) {
+                console.error('Error loading resume text:', error);
+            }
+        }
     }
 
     populateCandidateDetailModal(candidate) {
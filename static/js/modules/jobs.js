@@ -180,7 +180,7 @@ class JobsModule {
         `;
     }
 
-    showJobDetail(jobId) {
+    async showJobDetail(jobId) {
         const job = this.currentJobs.find(j => j.id === jobId);
         
         if (!job) {
@@ -191,6 +191,17 @@ class JobsModule {
         
         this.populateJobDetailModal(job);
         this.openJobDetailModal();
+        
+        // The raw job text is not part of the list payload - fetch it on demand
+        if (job.original_job_text === undefined) {
+            try {
+                const data = await api.get(`/api/get-job/${jobId}`);
+                job.original_job_text = (data.job && data.job.original_job_text) || '';
+                this.populateJobDetailModal(job);
+            } catch (error) {
+                console.error('Error loading job text:', error);
+            }
+        }
     }
 
     populateJobDetailModal(job) {
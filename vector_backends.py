@@ -0,0 +1,475 @@
+"""
+🧭 VECTOR BACKENDS - Pluggable Nearest-Neighbour Search for Candidate Vectors
+Records (metadata, documents) always live in Chroma; the backend decides how candidate vectors are searched.
+  chroma - query the Chroma collection directly (default)
+  numpy  - normalized vectors in a memory-mapped matrix (float32, float16 or int8), exact top-k with one
+           matmul + argpartition, optionally answered by an hnswlib index once the corpus is large
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# Storage dtype and file suffix of the numpy backend's vector matrix per precision
+PRECISIONS = {'float32': np.float32, 'float16': np.float16, 'int8': np.int8}
+PRECISION_SUFFIXES = {'float32': 'f32', 'float16': 'f16', 'int8': 'i8'}
+
+
+class VectorBackend:
+    """Interface: add vectors by id, search many query vectors at once.
+    search() returns {'ids': [[...] per query], 'distances': [[...] per query], 'metadatas': ... or None},
+    distances on the same scale as the Chroma collection (smaller is closer)"""
+    name = 'base'
+    # Distance space of the candidates collection - search() distances are on this scale
+    space = 'l2'
+    # Whether search() can apply a Chroma `where` itself; otherwise callers pass allowed_ids
+    supports_where = False
+
+    def add(self, ids, embeddings):
+        raise NotImplementedError
+
+    def upsert(self, ids, embeddings):
+        raise NotImplementedError
+
+    def delete(self, ids):
+        raise NotImplementedError
+
+    def search(self, query_embeddings, top_k, allowed_ids=None, where=None, include_metadatas=False):
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def sync(self, collection, batch_size=1000):
+        """Bring the backend in line with the vectors stored in `collection` (no-op when they are the same store)"""
+
+
+class ChromaBackend(VectorBackend):
+    """Vectors live next to the records in the Chroma collection - adds happen with the record write"""
+    name = 'chroma'
+    supports_where = True
+
+    def __init__(self, collection_fn):
+        # A callable, so collection swaps (rebuild_collection) are picked up
+        self._collection_fn = collection_fn
+
+    def add(self, ids, embeddings):
+        pass
+
+    def upsert(self, ids, embeddings):
+        pass
+
+    def delete(self, ids):
+        pass
+
+    def search(self, query_embeddings, top_k, allowed_ids=None, where=None, include_metadatas=False):
+        query = {
+            'query_embeddings': [list(map(float, embedding)) for embedding in query_embeddings],
+            'n_results': top_k,
+            'include': ['metadatas', 'distances'] if include_metadatas else ['distances']
+        }
+        if where:
+            query['where'] = where
+        results = self._collection_fn().query(**query)
+        return {
+            'ids': results['ids'],
+            'distances': results['distances'],
+            'metadatas': results['metadatas'] if include_metadatas else None
+        }
+
+    def count(self):
+        return self._collection_fn().count()
+
+    def clear(self):
+        pass
+
+
+class NumpyBackend(VectorBackend):
+    """Exact search over a memory-mapped matrix of unit-length vectors plus an id array.
+    Files (under `directory`): vectors.f32|f16|i8 (row-major, dim columns), ids.i64, scales.f32 (int8 only),
+    index.json ({dim, count, deleted, generation, precision}). New ids are appended, upserts of indexed ids
+    rewrite their row in place and deletes tombstone the row (id -1) - compacted once half the rows are dead.
+    Every write bumps the generation; readers in other processes re-map when it changes.
+    precision: 'float32', 'float16' (half the memory) or 'int8' (per-row scalar quantization, about a
+    quarter). Reduced precision shortlists rescore_factor * k rows and, with `rescore`, re-ranks that shortlist
+    against rescore.f32 - a float32 copy of the rows, memory-mapped so only the shortlisted rows are paged in.
+    What reduced precision shrinks is the matrix every search scans (resident memory and matmul bandwidth),
+    not the disk footprint: rescore.f32 sits next to it, and Chroma keeps its own float32 copy, which
+    sync() and rebuild_collection() read"""
+    name = 'numpy'
+
+    def __init__(self, directory, space='l2', use_hnsw=False, hnsw_threshold=50000, query_chunk_size=256,
+                 index_config=None, precision='float32', rescore_factor=4, rescore=True, row_chunk_size=65536):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported vector precision '{precision}' (use one of {tuple(PRECISIONS)})")
+        self.directory = directory
+        self.space = space
+        # HNSW parameters (M / construction_ef / search_ef) when the hnswlib path is used
+        self.index_config = {'M': 16, 'construction_ef': 200, 'search_ef': 64, **(index_config or {})}
+        self.use_hnsw = use_hnsw and HNSWLIB_AVAILABLE
+        self.hnsw_threshold = hnsw_threshold
+        self.query_chunk_size = query_chunk_size
+        self.precision = precision
+        self.rescore_factor = rescore_factor
+        # float32 needs no rescoring - its search matrix is already full precision
+        self.rescore = rescore and precision != 'float32'
+        # Reduced-precision rows are widened to float32 this many at a time for the matmul
+        self.row_chunk_size = row_chunk_size
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._scales = None
+        self._full = None
+        self._ids = None
+        self._live = None
+        self._row_by_id = {}
+        self._loaded_generation = None
+        self._hnsw = None
+        self._hnsw_generation = None
+        os.makedirs(directory, exist_ok=True)
+        if use_hnsw and not HNSWLIB_AVAILABLE:
+            print("⚠️ hnswlib not installed - numpy backend uses exact search only")
+        stored = self._read_meta()
+        if stored['precision'] != precision or stored.get('rescore', False) != self.rescore:
+            # Stored at another precision / without the rescore copy - start over, sync() refills from the collection
+            self.clear()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _vectors_file(self):
+        return self._path(f"vectors.{PRECISION_SUFFIXES[self.precision]}")
+
+    def _read_meta(self):
+        meta = {'dim': 0, 'count': 0, 'deleted': 0, 'generation': 0, 'precision': self.precision}
+        if os.path.exists(self._path('index.json')):
+            with open(self._path('index.json')) as meta_file:
+                meta.update(json.load(meta_file))
+        return meta
+
+    def _write_meta(self, meta):
+        """Publish `meta` as the next generation - written last by every write, so readers never see a partly written row"""
+        with open(self._path('index.json.tmp'), 'w') as meta_file:
+            json.dump({
+                **meta, 'generation': meta['generation'] + 1, 'precision': self.precision, 'rescore': self.rescore
+            }, meta_file)
+        os.replace(self._path('index.json.tmp'), self._path('index.json'))
+
+    def _refresh(self):
+        """(Re)map the files if another writer - or this one - published a new generation"""
+        meta = self._read_meta()
+        if meta['generation'] == self._loaded_generation:
+            return
+        dtype = PRECISIONS[self.precision]
+        if meta['count'] == 0:
+            self._vectors = np.zeros((0, meta['dim'] or 0), dtype=dtype)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._scales = np.zeros(0, dtype=np.float32)
+            self._full = np.zeros((0, meta['dim'] or 0), dtype=np.float32) if self.rescore else None
+        else:
+            self._vectors = np.memmap(self._vectors_file(), dtype=dtype, mode='r', shape=(meta['count'], meta['dim']))
+            self._ids = np.fromfile(self._path('ids.i64'), dtype=np.int64, count=meta['count'])
+            self._scales = (
+                np.fromfile(self._path('scales.f32'), dtype=np.float32, count=meta['count'])
+                if self.precision == 'int8' else None
+            )
+            self._full = (
+                np.memmap(self._path('rescore.f32'), dtype=np.float32, mode='r', shape=(meta['count'], meta['dim']))
+                if self.rescore else None
+            )
+        # Tombstoned rows (id -1) stay in the files until compaction but never match
+        self._live = self._ids >= 0
+        self._row_by_id = {int(record_id): row for row, record_id in enumerate(self._ids) if record_id >= 0}
+        self._loaded_generation = meta['generation']
+
+    @staticmethod
+    def _normalize(matrix):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    def _quantize(self, vectors):
+        """Stored form of unit vectors: (matrix, per-row scales or None)"""
+        if self.precision == 'int8':
+            # Symmetric per-row scale, so one row's outlier does not cost the rest their resolution
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(PRECISIONS[self.precision]), None
+
+    def _widen(self, vectors, scales, start, stop):
+        """Rows [start, stop) back as float32 (approximate for reduced precision)"""
+        block = np.asarray(vectors[start:stop], dtype=np.float32)
+        if scales is not None:
+            block *= scales[start:stop, None]
+        return block
+
+    def add(self, ids, embeddings):
+        """Append vectors; ids that are already indexed are skipped (same as Chroma's add)"""
+        return self._write(ids, embeddings, replace=False)
+
+    def upsert(self, ids, embeddings):
+        """Append vectors of new ids and rewrite the rows of indexed ones in place"""
+        return self._write(ids, embeddings, replace=True)
+
+    def _write(self, ids, embeddings, replace):
+        if len(ids) == 0:
+            return 0
+        with self._lock:
+            self._refresh()
+            vectors = self._normalize(embeddings)
+            meta = self._read_meta()
+            if meta['dim'] and meta['dim'] != vectors.shape[1]:
+                raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index dimension {meta['dim']}")
+            # Last occurrence of an id within the batch wins
+            latest = {int(record_id): row for row, record_id in enumerate(ids)}
+            appended = [row for record_id, row in latest.items() if record_id not in self._row_by_id]
+            rewritten = [
+                (self._row_by_id[record_id], row) for record_id, row in latest.items()
+                if replace and record_id in self._row_by_id
+            ]
+            if not appended and not rewritten:
+                return 0
+
+            if rewritten:
+                stored, scales = self._quantize(vectors[[row for _, row in rewritten]])
+                self._write_rows(self._vectors_file(), [target for target, _ in rewritten], stored)
+                if scales is not None:
+                    self._write_rows(self._path('scales.f32'), [target for target, _ in rewritten], scales)
+                if self.rescore:
+                    self._write_rows(
+                        self._path('rescore.f32'), [target for target, _ in rewritten], vectors[[row for _, row in rewritten]]
+                    )
+            if appended:
+                stored, scales = self._quantize(vectors[appended])
+                with open(self._vectors_file(), 'ab') as vector_file:
+                    vector_file.write(np.ascontiguousarray(stored).tobytes())
+                if scales is not None:
+                    with open(self._path('scales.f32'), 'ab') as scale_file:
+                        scale_file.write(scales.tobytes())
+                if self.rescore:
+                    with open(self._path('rescore.f32'), 'ab') as rescore_file:
+                        rescore_file.write(np.ascontiguousarray(vectors[appended]).tobytes())
+                with open(self._path('ids.i64'), 'ab') as id_file:
+                    id_file.write(np.asarray([int(ids[row]) for row in appended], dtype=np.int64).tobytes())
+            self._write_meta({**meta, 'dim': int(vectors.shape[1]), 'count': meta['count'] + len(appended)})
+            self._refresh()
+            return len(appended) + len(rewritten)
+
+    @staticmethod
+    def _write_rows(path, rows, values):
+        """Overwrite rows of a fixed-width row file in place"""
+        values = np.ascontiguousarray(values)
+        row_bytes = values[0].nbytes
+        with open(path, 'r+b') as row_file:
+            for row, value in zip(rows, values):
+                row_file.seek(row * row_bytes)
+                row_file.write(value.tobytes())
+
+    def delete(self, ids):
+        """Tombstone the rows of these ids - they stop matching at once, the files shrink at compaction"""
+        with self._lock:
+            self._refresh()
+            rows = sorted({self._row_by_id[int(record_id)] for record_id in ids if int(record_id) in self._row_by_id})
+            if not rows:
+                return 0
+            self._write_rows(self._path('ids.i64'), rows, np.full(len(rows), -1, dtype=np.int64))
+            meta = self._read_meta()
+            meta['deleted'] += len(rows)
+            if meta['deleted'] * 2 >= meta['count']:
+                meta = self._compact(meta)
+            self._write_meta(meta)
+            self._refresh()
+            return len(rows)
+
+    def _compact(self, meta):
+        """Rewrite the files without tombstoned rows (new files renamed over the old, so open maps stay valid)"""
+        ids = np.fromfile(self._path('ids.i64'), dtype=np.int64, count=meta['count'])
+        live_rows = np.flatnonzero(ids >= 0)
+        dtype = PRECISIONS[self.precision]
+        vectors = np.fromfile(self._vectors_file(), dtype=dtype, count=meta['count'] * meta['dim'])
+        files = {self._vectors_file(): vectors.reshape(meta['count'], meta['dim'])[live_rows], self._path('ids.i64'): ids[live_rows]}
+        if self.precision == 'int8':
+            files[self._path('scales.f32')] = np.fromfile(self._path('scales.f32'), dtype=np.float32, count=meta['count'])[live_rows]
+        if self.rescore:
+            full = np.fromfile(self._path('rescore.f32'), dtype=np.float32, count=meta['count'] * meta['dim'])
+            files[self._path('rescore.f32')] = full.reshape(meta['count'], meta['dim'])[live_rows]
+        for path, values in files.items():
+            with open(path + '.tmp', 'wb') as row_file:
+                row_file.write(np.ascontiguousarray(values).tobytes())
+            os.replace(path + '.tmp', path)
+        return {**meta, 'count': len(live_rows), 'deleted': 0}
+
+    def _distances(self, similarities):
+        """Map dot products of unit vectors onto the Chroma distance scale of the configured space"""
+        if self.space == 'l2':
+            # Squared euclidean distance between unit vectors
+            return np.maximum(2.0 - 2.0 * similarities, 0.0)
+        return 1.0 - similarities
+
+    def _hnsw_index(self):
+        """Lazily (re)built hnswlib index over the live rows - None when HNSW is off or the corpus is small"""
+        live_count = int(self._live.sum())
+        if not self.use_hnsw or live_count < self.hnsw_threshold:
+            return None
+        if self._hnsw is None or self._hnsw_generation != self._loaded_generation:
+            index = hnswlib.Index(space='ip', dim=self._vectors.shape[1])
+            index.init_index(
+                max_elements=live_count,
+                ef_construction=int(self.index_config['construction_ef']),
+                M=int(self.index_config['M'])
+            )
+            for start in range(0, len(self._ids), self.row_chunk_size):
+                stop = min(start + self.row_chunk_size, len(self._ids))
+                live_rows = np.flatnonzero(self._live[start:stop])
+                if len(live_rows):
+                    block = self._widen(self._vectors, self._scales, start, stop)[live_rows]
+                    index.add_items(block, live_rows + start)
+            self._hnsw, self._hnsw_generation = index, self._loaded_generation
+        return self._hnsw
+
+    def _similarities(self, queries, vectors, scales):
+        """queries @ all rows, widening reduced-precision rows chunk by chunk"""
+        if self.precision == 'float32':
+            return queries @ np.asarray(vectors).T
+        similarities = np.empty((len(queries), len(vectors)), dtype=np.float32)
+        for start in range(0, len(vectors), self.row_chunk_size):
+            stop = min(start + self.row_chunk_size, len(vectors))
+            similarities[:, start:stop] = queries @ self._widen(vectors, scales, start, stop).T
+        return similarities
+
+    def _rescore(self, queries, shortlists, approx_similarities, full, k):
+        """Re-rank each query's shortlist (row numbers) by its full-precision rows (`full`, None keeps the
+        approximate scores) and keep the top k. Returns (row numbers, similarities) per query"""
+        ranked = []
+        for query, shortlist, approx in zip(queries, shortlists, approx_similarities):
+            shortlist = np.asarray(shortlist, dtype=np.int64)
+            if full is not None and len(shortlist):
+                similarities = np.asarray(full[shortlist], dtype=np.float32) @ query
+            else:
+                similarities = np.asarray(approx, dtype=np.float32)
+            order = np.argsort(-similarities, kind='stable')[:k]
+            ranked.append((shortlist[order], similarities[order]))
+        return ranked
+
+    def search(self, query_embeddings, top_k, allowed_ids=None, where=None, include_metadatas=False):
+        """Top-k per query. allowed_ids: optional iterable of ids the hits are restricted to"""
+        with self._lock:
+            self._refresh()
+            vectors, scales, full, ids = self._vectors, self._scales, self._full, self._ids
+            live, row_by_id = self._live, self._row_by_id
+            index = self._hnsw_index() if allowed_ids is None else None
+        queries = self._normalize(query_embeddings)
+        result = {'ids': [], 'distances': [], 'metadatas': None}
+        if len(ids) == 0 or top_k <= 0:
+            result['ids'] = [[] for _ in range(len(queries))]
+            result['distances'] = [[] for _ in range(len(queries))]
+            return result
+
+        # Tombstoned rows are masked out, so they never take one of the k slots
+        mask = None if live.all() else live
+        if allowed_ids is not None:
+            mask = np.zeros(len(ids), dtype=bool)
+            rows = [row_by_id[int(record_id)] for record_id in allowed_ids if int(record_id) in row_by_id]
+            mask[rows] = True
+        available = len(ids) if mask is None else int(mask.sum())
+        k = min(top_k, available)
+        # Reduced precision: widen the shortlist so the full-precision rescore can recover the true top k
+        shortlist_k = k if self.precision == 'float32' else min(available, k * self.rescore_factor)
+
+        def emit(ranked):
+            for rows, similarities in ranked:
+                result['ids'].append([str(ids[row]) for row in rows])
+                result['distances'].append(self._distances(np.asarray(similarities, dtype=np.float32)).tolist())
+
+        if index is not None and k > 0:
+            index.set_ef(max(int(self.index_config['search_ef']), shortlist_k))
+            labels, distances = index.knn_query(queries, k=shortlist_k)
+            emit(self._rescore(queries, list(labels), list(1.0 - distances), full, k))
+            return result
+
+        # Exact: one matmul per chunk of queries, argpartition for the shortlist, then sort only those rows
+        for start in range(0, len(queries), self.query_chunk_size):
+            chunk = queries[start:start + self.query_chunk_size]
+            if k == 0:
+                emit([([], [])] * len(chunk))
+                continue
+            similarities = self._similarities(chunk, vectors, scales)
+            if mask is not None:
+                similarities[:, ~mask] = -np.inf
+            top = np.argpartition(-similarities, shortlist_k - 1, axis=1)[:, :shortlist_k]
+            emit(self._rescore(chunk, list(top), [similarities[row, top[row]] for row in range(len(chunk))], full, k))
+        return result
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._row_by_id)
+
+    def stats(self):
+        """Live row count, tombstoned rows, precision, bytes of the searched matrix (plus scales) and of the
+        memory-mapped rescore copy (paged in only for shortlisted rows)"""
+        with self._lock:
+            self._refresh()
+            vector_bytes = int(self._vectors.nbytes) + (int(self._scales.nbytes) if self._scales is not None else 0)
+            return {
+                'count': len(self._row_by_id), 'deleted': len(self._ids) - len(self._row_by_id),
+                'precision': self.precision, 'vector_bytes': vector_bytes,
+                'rescore_bytes': int(self._full.nbytes) if self._full is not None else 0
+            }
+
+    def clear(self):
+        with self._lock:
+            generation = self._read_meta()['generation']
+            for name in [f"vectors.{suffix}" for suffix in PRECISION_SUFFIXES.values()] + ['scales.f32', 'rescore.f32', 'ids.i64']:
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
+            self._write_meta({'dim': 0, 'count': 0, 'deleted': 0, 'generation': generation})
+            self._hnsw = None
+            self._refresh()
+
+    def sync(self, collection, batch_size=1000):
+        """Bring the matrix in line with the collection's id set: index the ids it lacks (from their stored
+        embeddings) and tombstone the ids the collection no longer has. Rows of ids in both are kept -
+        writes through ChromaVectorDB rewrite those with upsert()"""
+        stored = collection.get(include=[])['ids']
+        with self._lock:
+            self._refresh()
+            indexed = self._row_by_id
+            missing = [record_id for record_id in stored if int(record_id) not in indexed]
+            stored_ids = {int(record_id) for record_id in stored}
+            gone = [record_id for record_id in indexed if record_id not in stored_ids]
+        if gone:
+            self.delete(gone)
+        for start in range(0, len(missing), batch_size):
+            page = collection.get(ids=missing[start:start + batch_size], include=['embeddings'])
+            if page['ids']:
+                self.upsert(page['ids'], np.asarray(page['embeddings'], dtype=np.float32))
+        if missing or gone:
+            print(f"✅ Numpy vector index synced: {self.count()} vectors ({self.precision})")
+
+
+def create_vector_backend(name, persist_directory, collection_fn, space='l2', index_config=None, **options):
+    """Backend by name ('chroma' or 'numpy'); unknown names fall back to chroma"""
+    if name == 'numpy':
+        return NumpyBackend(
+            os.path.join(persist_directory, "vector_index", "candidates"),
+            space=space, index_config=index_config, **options
+        )
+    if name != 'chroma':
+        print(f"⚠️ Unknown vector backend '{name}' - falling back to chroma")
+    if options.get('precision', 'float32') != 'float32':
+        print("⚠️ Reduced vector precision needs the numpy backend - chroma stores float32")
+    backend = ChromaBackend(collection_fn)
+    backend.space = space
+    return backend
@@ -3,35 +3,427 @@
 
 import chromadb
 import os
-from sentence_transformers import SentenceTransformer
+import time
+from contextlib import contextmanager
 from typing import List, Dict
-import json
+import numpy as np
+
+from embedding_service import embedding_service, EMBEDDING_MODEL_NAME
+from embedding_cache import normalize_text
+from id_sequence import IdSequence, ID_SEQUENCE_FILE, WRITE_STAMPS
+from collection_names import (
+    load_collection_names, collection_names_signature, swap_collection, retired_collections,
+    forget_retired_collections, collection_write_lock
+)
+from document_store import DocumentStore
+from skill_index import SkillIndex, normalize_skill
+from lazy_record import LazyRecord
+from vector_backends import create_vector_backend
+from record_codec import PACKED_KEY, PackedFields, pack, loads_json
+from location_resolver import normalize_country, is_remote_location
+from gazetteer import gazetteer
+
+# Job quality levels, lowest first - stored as quality_rank so `$gte` filters work
+QUALITY_LEVELS = ['very_low', 'low', 'medium', 'high']
+
+# Bump when scalar metadata keys are added or derived differently so existing rows get migrated once
+# (3: geo_city honours the country stated in the location)
+SCALAR_METADATA_VERSION = 3
+
+# Metadata key holding when a row was last written - rebuild_collection() diffs the old collection by it
+UPDATED_AT_KEY = 'updated_at'
+
+# Catch-up passes rebuild_collection() runs without the write lock before its final, locked one
+REBUILD_CATCH_UP_PASSES = 5
+
+# Seconds a swapped-out collection is kept for processes still reading it before it may be dropped
+RETIRED_COLLECTION_GRACE_SECONDS = 600
+
+# Shortest normalized cultural context that gets a stored vector - same threshold as
+# SemanticMatcher.encode_text, shorter texts use the word-overlap fallback
+MIN_CULTURAL_CONTEXT_LENGTH = 10
+
+# Distance space and HNSW parameters applied when a candidates/jobs collection is created.
+# Existing collections keep the settings they were created with - rebuild_collection() recreates
+# a collection with the current ones. 'cosine' / 'ip' make the `1 - distance` similarity a true cosine
+DISTANCE_SPACES = ('l2', 'cosine', 'ip')
+DEFAULT_INDEX_CONFIG = {
+    'space': os.getenv("VECTOR_SPACE", "l2"),
+    'M': int(os.getenv("HNSW_M", "16")),
+    'construction_ef': int(os.getenv("HNSW_CONSTRUCTION_EF", "100")),
+    'search_ef': int(os.getenv("HNSW_SEARCH_EF", "10"))
+}
+
+
+def index_metadata(index_config: Dict) -> Dict:
+    """Chroma collection metadata keys for an index config"""
+    if index_config['space'] not in DISTANCE_SPACES:
+        raise ValueError(f"Unsupported distance space '{index_config['space']}' (use one of {DISTANCE_SPACES})")
+    return {
+        'hnsw:space': index_config['space'],
+        'hnsw:M': int(index_config['M']),
+        'hnsw:construction_ef': int(index_config['construction_ef']),
+        'hnsw:search_ef': int(index_config['search_ef'])
+    }
+
+
+def collection_space(collection) -> str:
+    """Distance space a collection was created with (Chroma's default is l2)"""
+    return (collection.metadata or {}).get('hnsw:space', 'l2')
+
+COLLECTION_DESCRIPTIONS = {
+    'candidates': "Candidate profiles for semantic search",
+    'jobs': "Job descriptions for semantic search"
+}
+
+# Raw document field per collection - kept in the compressed side store, never in Chroma metadata
+DOCUMENT_FIELDS = {'candidates': 'original_resume_text', 'jobs': 'original_job_text'}
+
+# (field, default stored value, nested/packed field) - the order records are returned in
+CANDIDATE_FIELDS = [
+    ('name', 'Unknown', False),
+    ('email', '', False),
+    ('phone', '', False),
+    ('location', '', False),
+    ('experience_years', 0, False),
+    ('skills', '[]', True),
+    ('profile', '', False),
+    ('education', '', False),
+    ('cultural_attributes', '{}', True),
+    # ENHANCED: Growth data fields
+    ('work_experience', '[]', True),
+    ('career_metrics', '{}', True),
+    ('skill_timeline', '[]', True),
+    ('growth_metrics', '{}', True),
+    ('learning_velocity', 0.0, False)
+    # original_resume_text lives in the document side store (see DOCUMENT_FIELDS)
+]
+
+JOB_FIELDS = [
+    # Existing fields
+    ('title', 'Unknown', False),
+    ('company', '', False),
+    ('location', '', False),
+    ('description', '', False),
+    ('required_skills', '[]', True),
+    ('preferred_skills', '[]', True),
+    ('experience_required', 0, False),
+    ('salary_range', '', False),
+    ('job_type', '', False),
+    ('cultural_attributes', '{}', True),
+    # NEW: Enhanced job dimensions
+    ('growth_requirements', '{}', True),
+    ('skill_requirements', '{}', True),
+    ('career_progression', '{}', True),
+    ('quality_assessment', '{}', True),
+    ('confidence_scores', '{}', True),
+    # original_job_text lives in the document side store (see DOCUMENT_FIELDS)
+    # NEW: AI Job Profile - CRITICAL MISSING FIELD
+    ('ai_job_profile', '{}', True)
+]
 
 class ChromaVectorDB:
-    def __init__(self, persist_directory="./chroma_db"):
+    def __init__(self, persist_directory="./chroma_db", vector_backend=None, index_config: Dict = None):
         self.persist_directory = persist_directory
         self.client = chromadb.PersistentClient(path=persist_directory)
+        # Distance space + HNSW parameters for newly created collections (see DEFAULT_INDEX_CONFIG)
+        self.index_config = {**DEFAULT_INDEX_CONFIG, **(index_config or {})}
+        index_metadata(self.index_config)
         
-        # Initialize embedding model
-        try:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Use the process-wide shared embedding model
+        self.embedding_model = embedding_service.get_model()
+        if self.embedding_model:
             print("✅ Chroma Vector DB initialized with embedding model!")
-        except Exception as e:
-            print(f"❌ Failed to load embedding model: {e}")
-            self.embedding_model = None
+        else:
+            print("❌ Failed to load embedding model")
         
-        # Create collections
-        self.candidates_collection = self.client.get_or_create_collection(
-            name="candidates",
-            metadata={"description": "Candidate profiles for semantic search"}
+        # Create collections - under the names last swapped in by rebuild_collection(), in any process
+        self.vector_backend = None
+        self._collections = {}
+        self._names_signature = None
+        self._resolve_collections()
+        # Cultural context text + unit-length embedding per record, precomputed at ingest
+        self.cultural_contexts_collection = self.client.get_or_create_collection(
+            name="cultural_contexts",
+            metadata={"description": "Precomputed cultural context embeddings for jobs and candidates"}
         )
-        self.jobs_collection = self.client.get_or_create_collection(
-            name="jobs", 
-            metadata={"description": "Job descriptions for semantic search"}
+        
+        # Persisted id counters - O(1) and safe across threads/workers. Also holds each collection's
+        # write stamp, so caches in every process (see record_cache.RecordCache) know when they are stale
+        self.id_sequence = IdSequence(os.path.join(persist_directory, ID_SEQUENCE_FILE))
+        
+        # Original resume/job text, compressed and keyed by id - read only on explicit request
+        self.document_store = DocumentStore(os.path.join(persist_directory, "documents.sqlite3"))
+        
+        # Candidate skills interned to integer ids at write time - read back as a sparse matrix
+        self.skill_index = SkillIndex(os.path.join(persist_directory, "skills.sqlite3"))
+        self._skill_matrix = None
+        
+        # Rows written before filterable scalars existed get them added once
+        self.ensure_scalar_metadata()
+        # Rows written before the side store existed get their raw text moved out once
+        self.ensure_documents_moved()
+        # Candidates written before the skill index existed get indexed once
+        self.ensure_skills_indexed()
+        
+        # Candidate nearest-neighbour search: 'chroma' (default) or 'numpy' (memory-mapped exact search)
+        self.vector_backend = create_vector_backend(
+            vector_backend or os.getenv("VECTOR_BACKEND", "chroma"),
+            persist_directory,
+            lambda: self.candidates_collection,
+            space=collection_space(self.candidates_collection),
+            index_config=self.index_config,
+            # float16 / int8 shrink the matrix each numpy search scans (resident memory, not disk - Chroma keeps
+            # its float32 copy); shortlists are rescored from a memory-mapped float32 copy in the index directory
+            precision=os.getenv("VECTOR_PRECISION", "float32"),
+            rescore_factor=int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
         )
+        self.vector_backend.sync(self.candidates_collection)
+        # Candidates write stamp the backend was last brought in line with (see _sync_vector_backend)
+        self._backend_version = self.get_version('candidates')
+        # Collections swapped out by earlier rebuilds, once no process can still be reading them
+        self.drop_retired_collections()
         
         print("✅ Chroma collections ready for enhanced data!")
     
+    def _get_or_create_collection(self, record_type: str, name: str):
+        """Open a collection, or create it with the configured distance space and HNSW parameters.
+        Settings are only passed on creation - Chroma cannot change the space of an existing index"""
+        existing = {getattr(collection, 'name', collection) for collection in self.client.list_collections()}
+        if name in existing:
+            return self.client.get_collection(name=name)
+        return self.client.create_collection(
+            name=name,
+            metadata={
+                "description": COLLECTION_DESCRIPTIONS[record_type],
+                "embedding_model": embedding_service.model_name,
+                **index_metadata(self.index_config)
+            }
+        )
+
+    @property
+    def candidates_collection(self):
+        return self._live_collection('candidates')
+
+    @property
+    def jobs_collection(self):
+        return self._live_collection('jobs')
+
+    def _live_collection(self, record_type: str):
+        """Live collection of a record type - re-resolved whenever the names file changed, i.e. after
+        rebuild_collection() in this or another process swapped in a new one (one stat per access)"""
+        if collection_names_signature(self.persist_directory) != self._names_signature:
+            self._resolve_collections()
+        return self._collections[record_type]
+
+    def _resolve_collections(self):
+        """(Re)open the collections named in the names file"""
+        self._names_signature = collection_names_signature(self.persist_directory)
+        self.collection_names = load_collection_names(self.persist_directory)
+        for record_type, name in self.collection_names.items():
+            current = self._collections.get(record_type)
+            if current is None or current.name != name:
+                self._collections[record_type] = self._get_or_create_collection(record_type, name)
+                if record_type == 'candidates' and self.vector_backend is not None:
+                    self.vector_backend.space = collection_space(self._collections[record_type])
+
+    @contextmanager
+    def _writing(self, record_type: str):
+        """Write to the live collection (yielded) under the cross-process collection write lock.
+        rebuild_collection() holds the same lock for its final catch-up and swap, so a write either
+        reaches the old collection before that catch-up or the new one after the swap"""
+        with collection_write_lock(self.persist_directory):
+            yield self._live_collection(record_type)
+
+    def _stamped(self, metadatas: List[Dict]) -> List[Dict]:
+        """Metadatas with the row update marker (UPDATED_AT_KEY) - call inside _writing()"""
+        written_at = time.time()
+        return [{**metadata, UPDATED_AT_KEY: written_at} for metadata in metadatas]
+
+    def bump_version(self, record_type: str) -> int:
+        """Mark a collection ('candidates' or 'jobs') as written to and return the new stamp - it is
+        persisted, so writes from other processes and from the delete scripts are seen as well"""
+        return self.id_sequence.allocate(WRITE_STAMPS[record_type])
+
+    def _candidates_written(self):
+        """bump_version('candidates') after a write this process also applied to the vector backend"""
+        stamp = self.bump_version('candidates')
+        if self._backend_version == stamp - 1:
+            # Nobody else wrote in between - the backend is still in line with the collection
+            self._backend_version = stamp
+
+    def _sync_vector_backend(self):
+        """Re-sync the vector backend after candidate writes it did not see (other processes, delete scripts)"""
+        version = self.get_version('candidates')
+        if version != self._backend_version:
+            self.vector_backend.sync(self.candidates_collection)
+            self._backend_version = version
+
+    def get_version(self, record_type: str) -> int:
+        """Current write stamp of a collection - changes whenever any process writes to it"""
+        return self.id_sequence.current(WRITE_STAMPS[record_type])
+    
+    def _max_collection_id(self, collection) -> int:
+        """Highest numeric id in a collection (ids only, no metadata) - used once to seed a sequence"""
+        ids = collection.get(include=[])['ids']
+        numeric_ids = [int(record_id) for record_id in ids if record_id.isdigit()]
+        return max(numeric_ids) if numeric_ids else 0
+    
+    def _id_seed(self, record_type: str):
+        """Seed for a sequence used for the first time - the highest id already in the collection"""
+        return lambda: self._max_collection_id(
+            self.jobs_collection if record_type == 'jobs' else self.candidates_collection
+        )
+    
+    def allocate_candidate_ids(self, count: int = 1) -> int:
+        """Reserve `count` consecutive candidate ids and return the first"""
+        return self.id_sequence.allocate('candidates', count, seed_fn=self._id_seed('candidates'))
+    
+    def allocate_job_ids(self, count: int = 1) -> int:
+        """Reserve `count` consecutive job ids and return the first"""
+        return self.id_sequence.allocate('jobs', count, seed_fn=self._id_seed('jobs'))
+    
+    def _advance_ids(self, record_type: str, record_ids: List):
+        """Move the id sequence past ids a caller chose itself, so allocate_*_ids() never hands them out again"""
+        numeric_ids = [int(record_id) for record_id in record_ids if str(record_id).isdigit()]
+        if numeric_ids:
+            self.id_sequence.advance(record_type, max(numeric_ids), seed_fn=self._id_seed(record_type))
+    
+    def ensure_scalar_metadata(self, batch_size: int = 500) -> bool:
+        """One-time migration: add the filterable scalar metadata keys to existing rows"""
+        marker_path = os.path.join(self.persist_directory, "scalar_metadata_version")
+        try:
+            if os.path.exists(marker_path):
+                with open(marker_path) as marker:
+                    if marker.read().strip() == str(SCALAR_METADATA_VERSION):
+                        return True
+            
+            migrated = 0
+            for record_type, field_spec, scalar_fn in (
+                ('candidates', CANDIDATE_FIELDS, self._candidate_scalar_metadata),
+                ('jobs', JOB_FIELDS, self._job_scalar_metadata)
+            ):
+                offset = 0
+                while True:
+                    with self._writing(record_type) as collection:
+                        page = collection.get(include=['metadatas'], limit=batch_size, offset=offset)
+                        if page['ids']:
+                            metadatas = []
+                            for i in range(len(page['ids'])):
+                                metadata = page['metadatas'][i] or {}
+                                record = self._record_from_metadata(page['ids'][i], metadata, field_spec)
+                                metadatas.append({**metadata, **scalar_fn(record)})
+                            collection.update(ids=page['ids'], metadatas=self._stamped(metadatas))
+                    if page['ids']:
+                        self.bump_version(record_type)
+                        migrated += len(page['ids'])
+                    if len(page['ids']) < batch_size:
+                        break
+                    offset += batch_size
+            
+            with open(marker_path, 'w') as marker:
+                marker.write(str(SCALAR_METADATA_VERSION))
+            if migrated:
+                print(f"✅ Added filterable scalar metadata to {migrated} existing records")
+            return True
+        except Exception as e:
+            print(f"⚠️ Scalar metadata migration failed (filters may miss older records): {e}")
+            return False
+
+    def ensure_documents_moved(self, batch_size: int = 500) -> bool:
+        """One-time migration: move raw text still held in legacy Chroma metadata into the side store"""
+        marker_path = os.path.join(self.persist_directory, "documents_moved")
+        if os.path.exists(marker_path):
+            return True
+        
+        try:
+            moved = 0
+            for record_type in ('candidates', 'jobs'):
+                document_field = DOCUMENT_FIELDS[record_type]
+                offset = 0
+                while True:
+                    with self._writing(record_type) as collection:
+                        page = collection.get(include=['metadatas'], limit=batch_size, offset=offset)
+                        legacy = {
+                            page['ids'][i]: (page['metadatas'][i] or {})[document_field]
+                            for i in range(len(page['ids']))
+                            if document_field in (page['metadatas'][i] or {})
+                        }
+                        if legacy:
+                            self.document_store.put_many(record_type, legacy)
+                            # A None value deletes the key from the stored metadata
+                            collection.update(ids=list(legacy), metadatas=self._stamped([{document_field: None} for _ in legacy]))
+                    if legacy:
+                        self.bump_version(record_type)
+                        moved += len(legacy)
+                    if len(page['ids']) < batch_size:
+                        break
+                    offset += batch_size
+            
+            with open(marker_path, 'w') as marker:
+                marker.write('1')
+            if moved:
+                print(f"✅ Moved original text of {moved} existing records to the document store")
+            return True
+        except Exception as e:
+            # Legacy rows stay readable - original text reads fall back to their metadata
+            print(f"⚠️ Document store migration failed (original text stays in metadata): {e}")
+            return False
+
+    def ensure_skills_indexed(self, batch_size: int = 500) -> bool:
+        """One-time migration: intern the skills of existing candidates into the skill index"""
+        marker_path = os.path.join(self.persist_directory, "skills_indexed")
+        if os.path.exists(marker_path):
+            return True
+        
+        try:
+            indexed = 0
+            pending = {}
+            for candidate in self.iter_candidates(batch_size=batch_size, fields=['skills']):
+                pending[candidate['id']] = candidate.get('skills', [])
+                if len(pending) >= batch_size:
+                    indexed += self.skill_index.put_many(pending)
+                    pending = {}
+            indexed += self.skill_index.put_many(pending)
+            
+            with open(marker_path, 'w') as marker:
+                marker.write('1')
+            if indexed:
+                print(f"✅ Indexed the skills of {indexed} existing candidates")
+            return True
+        except Exception as e:
+            # Unindexed candidates still score - their skills are interned on the fly
+            print(f"⚠️ Skill index migration failed (skills are interned per query instead): {e}")
+            return False
+
+    def build_candidate_filter(self, min_experience=None, country=None, is_remote=None,
+                               career_stage=None, career_archetype=None, min_growth_score=None,
+                               near_location=None, radius_km=None):
+        """Build a Chroma `where` filter over the candidate scalar metadata (None when no conditions).
+        near_location + radius_km keep candidates in gazetteer cities within radius_km of that location
+        (no geographic condition when the location is not a known city, e.g. 'Remote')"""
+        conditions = []
+        if min_experience is not None:
+            conditions.append({'experience_years': {'$gte': min_experience}})
+        if country:
+            conditions.append({'country': normalize_country(country) or country.lower()})
+        if is_remote is not None:
+            conditions.append({'is_remote': bool(is_remote)})
+        if career_stage:
+            conditions.append({'career_stage': career_stage})
+        if career_archetype:
+            conditions.append({'career_archetype': career_archetype})
+        if min_growth_score is not None:
+            conditions.append({'growth_potential_score': {'$gte': float(min_growth_score)}})
+        if near_location and radius_km is not None:
+            nearby_cities = gazetteer.cities_within(near_location, radius_km)
+            if nearby_cities:
+                conditions.append({'geo_city': {'$in': nearby_cities}})
+        
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+
     def get_candidate_count(self) -> int:
         """Get number of candidates in the vector database"""
         try:
@@ -40,6 +432,91 @@ class ChromaVectorDB:
         except:
             return 0
     
+    def get_job_count(self) -> int:
+        """Get number of jobs in the vector database"""
+        try:
+            return self.jobs_collection.count()
+        except:
+            return 0
+    
+    def get_candidate_embeddings(self, ids: List) -> Dict:
+        """Full-precision stored embeddings {id: vector} for the given candidate ids (missing ids are left out)"""
+        if not ids:
+            return {}
+        results = self.candidates_collection.get(ids=[str(record_id) for record_id in ids], include=['embeddings'])
+        return {
+            results['ids'][i]: np.asarray(results['embeddings'][i], dtype=np.float32)
+            for i in range(len(results['ids']))
+        }
+
+    def _candidate_embedding_text(self, candidate: Dict) -> str:
+        """Text that a candidate's search embedding is computed from"""
+        return f"{candidate.get('profile', '')} {' '.join(candidate.get('skills', []))}"
+
+    def _job_embedding_text(self, job: Dict) -> str:
+        """Text that a job's search embedding is computed from"""
+        return f"{job.get('description', '')} {' '.join(job.get('required_skills', []))}"
+
+    def _packed_metadata(self, record: Dict, field_spec: List) -> Dict:
+        """Scalar fields as plain metadata, every nested field packed into one versioned blob"""
+        metadata = {}
+        nested = {}
+        for field, default, is_json in field_spec:
+            if is_json:
+                nested[field] = record.get(field, loads_json(default))
+            else:
+                metadata[field] = record.get(field, default)
+        metadata[PACKED_KEY] = pack(nested)
+        return metadata
+
+    def _store_documents(self, record_type: str, records: List[Dict]):
+        """Write each record's raw text (original_resume_text / original_job_text) to the side store"""
+        document_field = DOCUMENT_FIELDS[record_type]
+        documents = {record['id']: record[document_field] for record in records if document_field in record}
+        if documents:
+            self.document_store.put_many(record_type, documents)
+
+    def _index_skills(self, candidates: List[Dict]):
+        """Intern each candidate's skills into the skill index"""
+        self.skill_index.put_many({candidate['id']: candidate.get('skills', []) for candidate in candidates})
+
+    def get_skill_matrix(self):
+        """Sparse candidate x skill matrix of every indexed candidate - loaded once, then after candidate
+        writes only the rows of the candidates written since are re-read"""
+        version = self.get_version('candidates')
+        if self._skill_matrix is None:
+            self._skill_matrix = (version, self.skill_index.load_matrix())
+        elif self._skill_matrix[0] != version:
+            self._skill_matrix = (version, self.skill_index.update_matrix(self._skill_matrix[1]))
+        return self._skill_matrix[1]
+
+    def skill_matrix_for(self, candidates: List[Dict]):
+        """SkillMatrix rows for `candidates`, in order - candidates missing from the index are interned on the fly"""
+        return self.get_skill_matrix().select(
+            [candidate.get('id') for candidate in candidates],
+            [candidate.get('skills', []) for candidate in candidates]
+        )
+
+    def _candidate_metadata(self, candidate: Dict) -> Dict:
+        """Chroma metadata for a candidate - WITH GROWTH DATA"""
+        return {
+            **self._packed_metadata(candidate, CANDIDATE_FIELDS),
+            **self._candidate_scalar_metadata(candidate)
+        }
+
+    def _candidate_scalar_metadata(self, candidate: Dict) -> Dict:
+        """Filterable first-class scalars for a candidate (Chroma `where` cannot look inside JSON strings)"""
+        growth_metrics = candidate.get('growth_metrics', {}) or {}
+        return {
+            'growth_potential_score': float(growth_metrics.get('growth_potential_score', 0) or 0),
+            'career_stage': growth_metrics.get('career_stage') or '',
+            'career_archetype': growth_metrics.get('career_archetype') or '',
+            'country': normalize_country(candidate.get('location', '')),
+            'is_remote': is_remote_location(candidate.get('location', '')),
+            # Gazetteer city, for radius filters ('' when the location is not a known city)
+            'geo_city': gazetteer.city_key(candidate.get('location', ''))
+        }
+
     def add_candidate(self, candidate: Dict) -> bool:
         """Add a single candidate to the vector database - WITH GROWTH DATA"""
         if not self.embedding_model:
@@ -48,97 +525,96 @@ class ChromaVectorDB:
             
         try:
             # Generate embedding from candidate profile and skills
-            text_to_embed = f"{candidate.get('profile', '')} {' '.join(candidate.get('skills', []))}"
+            text_to_embed = self._candidate_embedding_text(candidate)
             if not text_to_embed.strip():
                 return False
                 
             embedding = self.embedding_model.encode(text_to_embed).tolist()
             
             # ENHANCED: Include growth data in metadata
-            self.candidates_collection.add(
-                ids=[str(candidate['id'])],
-                embeddings=[embedding],
-                documents=[text_to_embed],
-                metadatas=[{
-                    'name': candidate.get('name', 'Unknown'),
-                    'skills': json.dumps(candidate.get('skills', [])),
-                    'experience_years': candidate.get('experience_years', 0),
-                    'location': candidate.get('location', ''),
-                    'email': candidate.get('email', ''),
-                    'phone': candidate.get('phone', ''),
-                    'profile': candidate.get('profile', ''),
-                    'education': candidate.get('education', ''),
-                    'cultural_attributes': json.dumps(candidate.get('cultural_attributes', {})),
-                    # ENHANCED: Growth data fields
-                    'work_experience': json.dumps(candidate.get('work_experience', [])),
-                    'career_metrics': json.dumps(candidate.get('career_metrics', {})),
-                    'skill_timeline': json.dumps(candidate.get('skill_timeline', [])),
-                    'growth_metrics': json.dumps(candidate.get('growth_metrics', {})),
-                    'learning_velocity': candidate.get('learning_velocity', 0.0),
-                    # CRITICAL: Store original resume text
-                    'original_resume_text': candidate.get('original_resume_text', '')
-                }]
-            )
+            # upsert - re-adding an existing id replaces its row, as the side stores and vector backend do
+            with self._writing('candidates') as collection:
+                collection.upsert(
+                    ids=[str(candidate['id'])],
+                    embeddings=[embedding],
+                    documents=[text_to_embed],
+                    metadatas=self._stamped([self._candidate_metadata(candidate)])
+                )
+                self.vector_backend.upsert([candidate['id']], [embedding])
+            self._store_documents('candidates', [candidate])
+            self._advance_ids('candidates', [candidate['id']])
+            self._index_skills([candidate])
+            self._candidates_written()
             print(f"✅ Candidate added to vector DB with growth data: {candidate.get('name', 'Unknown')}")
             return True
         except Exception as e:
             print(f"❌ Error adding candidate to vector DB: {e}")
             return False
     
+    def add_candidates_bulk(self, candidates: List[Dict], batch_size: int = 64, chunk_size: int = 1000) -> List[int]:
+        """Bulk-insert candidates: one batched model.encode per chunk, one collection.add per chunk.
+        Returns the ids that were written (candidates with no embeddable text are skipped)"""
+        if not self.embedding_model:
+            return []
+        
+        added_ids = []
+        embeddable = [c for c in candidates if self._candidate_embedding_text(c).strip()]
+        
+        for start in range(0, len(embeddable), chunk_size):
+            chunk = embeddable[start:start + chunk_size]
+            documents = [self._candidate_embedding_text(c) for c in chunk]
+            try:
+                embeddings = np.asarray(self.embedding_model.encode(documents, batch_size=batch_size), dtype=np.float32)
+                with self._writing('candidates') as collection:
+                    collection.upsert(
+                        ids=[str(c['id']) for c in chunk],
+                        embeddings=[embedding.tolist() for embedding in embeddings],
+                        documents=documents,
+                        metadatas=self._stamped([self._candidate_metadata(c) for c in chunk])
+                    )
+                    self.vector_backend.upsert([c['id'] for c in chunk], embeddings)
+                self._store_documents('candidates', chunk)
+                self._advance_ids('candidates', [c['id'] for c in chunk])
+                self._index_skills(chunk)
+                self._candidates_written()
+                added_ids.extend(int(c['id']) for c in chunk)
+            except Exception as e:
+                print(f"❌ Error adding candidate chunk starting at {start}: {e}")
+        
+        return added_ids
+
     def add_candidates_batch(self, candidates: List[Dict]) -> bool:
         """Add multiple candidates to the vector database - WITH GROWTH DATA"""
-        if not self.embedding_model:
-            return False
-            
         try:
-            ids = []
-            embeddings = []
-            documents = []
-            metadatas = []
-            
-            for candidate in candidates:
-                text_to_embed = f"{candidate.get('profile', '')} {' '.join(candidate.get('skills', []))}"
-                if text_to_embed.strip():
-                    embedding = self.embedding_model.encode(text_to_embed).tolist()
-                    
-                    ids.append(str(candidate['id']))
-                    embeddings.append(embedding)
-                    documents.append(text_to_embed)
-                    # ENHANCED: Include growth data in metadata
-                    metadatas.append({
-                        'name': candidate.get('name', 'Unknown'),
-                        'skills': json.dumps(candidate.get('skills', [])),
-                        'experience_years': candidate.get('experience_years', 0),
-                        'location': candidate.get('location', ''),
-                        'email': candidate.get('email', ''),
-                        'phone': candidate.get('phone', ''),
-                        'profile': candidate.get('profile', ''),
-                        'education': candidate.get('education', ''),
-                        'cultural_attributes': json.dumps(candidate.get('cultural_attributes', {})),
-                        # ENHANCED: Growth data fields
-                        'work_experience': json.dumps(candidate.get('work_experience', [])),
-                        'career_metrics': json.dumps(candidate.get('career_metrics', {})),
-                        'skill_timeline': json.dumps(candidate.get('skill_timeline', [])),
-                        'growth_metrics': json.dumps(candidate.get('growth_metrics', {})),
-                        'learning_velocity': candidate.get('learning_velocity', 0.0),
-                        # CRITICAL: Store original resume text
-                        'original_resume_text': candidate.get('original_resume_text', '')
-                    })
-            
-            if ids:
-                self.candidates_collection.add(
-                    ids=ids,
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas
-                )
-                print(f"✅ Added {len(ids)} candidates to vector database with growth data")
+            added_ids = self.add_candidates_bulk(candidates)
+            if added_ids:
+                print(f"✅ Added {len(added_ids)} candidates to vector database with growth data")
                 return True
             return False
         except Exception as e:
             print(f"❌ Error adding candidates batch: {e}")
             return False
     
+    def _job_metadata(self, job: Dict) -> Dict:
+        """Chroma metadata for a job - ENHANCED WITH JOB REQUIREMENTS"""
+        return {
+            **self._packed_metadata(job, JOB_FIELDS),
+            **self._job_scalar_metadata(job)
+        }
+
+    def _job_scalar_metadata(self, job: Dict) -> Dict:
+        """Filterable first-class scalars for a job (Chroma `where` cannot look inside JSON strings)"""
+        growth_requirements = job.get('growth_requirements', {}) or {}
+        quality_level = (job.get('quality_assessment', {}) or {}).get('quality_level', 'medium') or 'medium'
+        return {
+            'quality_level': quality_level,
+            'quality_rank': QUALITY_LEVELS.index(quality_level) if quality_level in QUALITY_LEVELS else -1,
+            'role_archetype': growth_requirements.get('role_archetype') or '',
+            'target_career_stage': growth_requirements.get('target_career_stage') or '',
+            'country': normalize_country(job.get('location', '')),
+            'is_remote': is_remote_location(job.get('location', ''))
+        }
+
     def add_job(self, job: Dict) -> bool:
         """Add a single job to the vector database - ENHANCED WITH JOB REQUIREMENTS"""
         if not self.embedding_model:
@@ -147,40 +623,23 @@ class ChromaVectorDB:
             
         try:
             # Generate embedding from job description and skills
-            text_to_embed = f"{job.get('description', '')} {' '.join(job.get('required_skills', []))}"
+            text_to_embed = self._job_embedding_text(job)
             if not text_to_embed.strip():
                 return False
                 
             embedding = self.embedding_model.encode(text_to_embed).tolist()
             
             # ENHANCED: Include job requirements data in metadata
-            self.jobs_collection.add(
-                ids=[str(job['id'])],
-                embeddings=[embedding],
-                documents=[text_to_embed],
-                metadatas=[{
-                    # Existing fields
-                    'title': job.get('title', 'Unknown'),
-                    'company': job.get('company', ''),
-                    'location': job.get('location', ''),
-                    'description': job.get('description', ''),
-                    'required_skills': json.dumps(job.get('required_skills', [])),
-                    'preferred_skills': json.dumps(job.get('preferred_skills', [])),
-                    'experience_required': job.get('experience_required', 0),
-                    'salary_range': job.get('salary_range', ''),
-                    'job_type': job.get('job_type', ''),
-                    'cultural_attributes': json.dumps(job.get('cultural_attributes', {})),
-                    # NEW: Enhanced job dimensions
-                    'growth_requirements': json.dumps(job.get('growth_requirements', {})),
-                    'skill_requirements': json.dumps(job.get('skill_requirements', {})),
-                    'career_progression': json.dumps(job.get('career_progression', {})),
-                    'quality_assessment': json.dumps(job.get('quality_assessment', {})),
-                    'confidence_scores': json.dumps(job.get('confidence_scores', {})),
-                    'original_job_text': job.get('original_job_text', ''),
-                    # NEW: AI Job Profile - CRITICAL MISSING FIELD
-                    'ai_job_profile': json.dumps(job.get('ai_job_profile', {}))
-                }]
-            )
+            with self._writing('jobs') as collection:
+                collection.add(
+                    ids=[str(job['id'])],
+                    embeddings=[embedding],
+                    documents=[text_to_embed],
+                    metadatas=self._stamped([self._job_metadata(job)])
+                )
+            self._store_documents('jobs', [job])
+            self._advance_ids('jobs', [job['id']])
+            self.bump_version('jobs')
             print(f"✅ Job added to vector DB with enhanced data: {job.get('title', 'Unknown')}")
             print(f"   AI Job Profile stored: {'ai_job_profile' in job and bool(job['ai_job_profile'])}")
             return True
@@ -200,43 +659,26 @@ class ChromaVectorDB:
             metadatas = []
             
             for job in jobs:
-                text_to_embed = f"{job.get('description', '')} {' '.join(job.get('required_skills', []))}"
+                text_to_embed = self._job_embedding_text(job)
                 if text_to_embed.strip():
                     embedding = self.embedding_model.encode(text_to_embed).tolist()
                     
                     ids.append(str(job['id']))
                     embeddings.append(embedding)
                     documents.append(text_to_embed)
-                    metadatas.append({
-                        # Existing fields
-                        'title': job.get('title', 'Unknown'),
-                        'company': job.get('company', ''),
-                        'location': job.get('location', ''),
-                        'description': job.get('description', ''),
-                        'required_skills': json.dumps(job.get('required_skills', [])),
-                        'preferred_skills': json.dumps(job.get('preferred_skills', [])),
-                        'experience_required': job.get('experience_required', 0),
-                        'salary_range': job.get('salary_range', ''),
-                        'job_type': job.get('job_type', ''),
-                        'cultural_attributes': json.dumps(job.get('cultural_attributes', {})),
-                        # NEW: Enhanced job dimensions
-                        'growth_requirements': json.dumps(job.get('growth_requirements', {})),
-                        'skill_requirements': json.dumps(job.get('skill_requirements', {})),
-                        'career_progression': json.dumps(job.get('career_progression', {})),
-                        'quality_assessment': json.dumps(job.get('quality_assessment', {})),
-                        'confidence_scores': json.dumps(job.get('confidence_scores', {})),
-                        'original_job_text': job.get('original_job_text', ''),
-                        # NEW: AI Job Profile - CRITICAL MISSING FIELD
-                        'ai_job_profile': json.dumps(job.get('ai_job_profile', {}))
-                    })
+                    metadatas.append(self._job_metadata(job))
             
             if ids:
-                self.jobs_collection.add(
-                    ids=ids,
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas
-                )
+                with self._writing('jobs') as collection:
+                    collection.add(
+                        ids=ids,
+                        embeddings=embeddings,
+                        documents=documents,
+                        metadatas=self._stamped(metadatas)
+                    )
+                self._store_documents('jobs', [job for job in jobs if str(job['id']) in set(ids)])
+                self._advance_ids('jobs', ids)
+                self.bump_version('jobs')
                 print(f"✅ Added {len(ids)} jobs to vector database with enhanced data")
                 return True
             return False
@@ -244,126 +686,561 @@ class ChromaVectorDB:
             print(f"❌ Error adding jobs batch: {e}")
             return False
 
-    def find_matches_for_job(self, job: Dict, top_k: int = 20) -> List[Dict]:
-        """Find candidate matches for a job using semantic search - WITH GROWTH DATA"""
-        if not self.embedding_model:
-            return []
+    def _get_job_query_embeddings(self, jobs: List[Dict]) -> List:
+        """Return one query vector per job - the one persisted by add_job when it is still current,
+        otherwise a fresh encoding (ad-hoc jobs without an id, or stale stored text).
+        Stored vectors are fetched in one get() and missing ones encoded in one batch"""
+        texts = [self._job_embedding_text(job) for job in jobs]
+        embeddings = [None] * len(jobs)
+        
+        stored_ids = list(dict.fromkeys(str(job['id']) for job in jobs if job.get('id') is not None))
+        if stored_ids:
+            try:
+                stored = self.jobs_collection.get(ids=stored_ids, include=['embeddings', 'documents'])
+                stored_by_id = {
+                    stored['ids'][k]: (stored['documents'][k], stored['embeddings'][k])
+                    for k in range(len(stored['ids']))
+                }
+                for index, job in enumerate(jobs):
+                    if job.get('id') is None:
+                        continue
+                    document, embedding = stored_by_id.get(str(job['id']), (None, None))
+                    if document is not None and document == texts[index]:
+                        embeddings[index] = list(embedding)
+            except Exception as e:
+                print(f"⚠️ Could not load stored job embeddings: {e}")
+        
+        to_encode = [k for k in range(len(jobs)) if embeddings[k] is None and texts[k].strip()]
+        if to_encode and self.embedding_model:
+            encoded = self.embedding_model.encode([texts[k] for k in to_encode])
+            for k, embedding in zip(to_encode, encoded):
+                embeddings[k] = embedding.tolist()
+        
+        return embeddings
+
+    def _get_job_query_embedding(self, job: Dict):
+        """Return the query vector for a single job (see _get_job_query_embeddings)"""
+        return self._get_job_query_embeddings([job])[0]
+
+    def _record_from_metadata(self, record_id: str, metadata: Dict, field_spec: List, fields=None) -> LazyRecord:
+        """Build a record from Chroma metadata, keeping only `fields` (all when None).
+        JSON fields stay encoded until first accessed"""
+        wanted = set(fields) if fields is not None else None
+        packed_blob = metadata.get(PACKED_KEY)
+        values = {'id': int(record_id)}
+        lazy_fields = []
+        for field, default, is_json in field_spec:
+            if wanted is not None and field not in wanted:
+                continue
+            if is_json and packed_blob is not None:
+                # Placeholder - the packed blob is decoded once, on first access to any nested field
+                values[field] = field
+            else:
+                values[field] = metadata.get(field, default)
+            if is_json:
+                lazy_fields.append(field)
+        
+        if packed_blob is not None:
+            packed = PackedFields(packed_blob, {field: default for field, default, is_json in field_spec if is_json})
+            return LazyRecord(values, lazy_fields, decode=packed.get)
+        # Legacy rows: one JSON string per nested field
+        return LazyRecord(values, lazy_fields, decode=loads_json)
+
+    def _candidate_from_metadata(self, candidate_id: str, metadata: Dict) -> Dict:
+        """Decode a candidate query hit back into its dict form - WITH GROWTH DATA"""
+        return self._record_from_metadata(candidate_id, metadata, CANDIDATE_FIELDS)
+
+    def _build_matches(self, job: Dict, candidates: List, distances: List) -> List[Dict]:
+        """Turn one job's query hits (decoded candidate or None per hit) into match dicts"""
+        job_skills = list(dict.fromkeys(normalize_skill(skill) for skill in job.get('required_skills', [])))
+        
+        # Traditional skill overlap for every hit from the interned skill matrix
+        present = [candidate for candidate in candidates if candidate is not None]
+        common_per_candidate = iter(self.skill_matrix_for(present).common_skills(job_skills))
+        
+        matches = []
+        for i in range(len(candidates)):
+            candidate = candidates[i]
+            # ADD NULL CHECK HERE
+            if candidate is None:
+                continue  # Skip this candidate if metadata is None
+
+            distance = distances[i]
+            similarity_score = max(0, 1 - distance)  # Convert distance to similarity
+            
+            common_skills = next(common_per_candidate)
+            skill_overlap = len(common_skills) / len(job_skills) if job_skills else 0
+            
+            matches.append({
+                'candidate': candidate,
+                'score': similarity_score,
+                'common_skills': common_skills,
+                'score_breakdown': {
+                    'semantic': int(similarity_score * 100),
+                    'skills': int(skill_overlap * 100),
+                    'experience': 0,  # Will be calculated by matcher
+                    'location': 0     # Will be calculated by matcher
+                }
+            })
+        
+        return matches
+
+    def find_matches_for_job(self, job: Dict, top_k: int = 20, where: Dict = None, record_lookup=None) -> List[Dict]:
+        """Find candidate matches for a job using semantic search - WITH GROWTH DATA
+        where: optional Chroma filter over candidate scalar metadata (see build_candidate_filter)"""
+        return self.find_matches_for_jobs([job], top_k=top_k, where=where, record_lookup=record_lookup)[0]
+
+    def find_matches_for_jobs(self, jobs: List[Dict], top_k: int = 20, where: Dict = None,
+                              record_lookup=None) -> List[List[Dict]]:
+        """Find candidate matches for many jobs with a single Chroma query - one result list per job.
+        Semantic score is `1 - distance` in the candidates collection's space (cosine similarity for cosine/ip).
+        Candidate metadata is decoded once per distinct candidate id, not once per hit
+        (hits for the same candidate share one candidate dict). `where` is applied inside the store.
+        record_lookup: optional callable(list of ids) -> {int id: candidate}; when given, the query
+        returns distances only and hit candidates come from it (e.g. a decoded-record cache)"""
+        results_per_job = [[] for _ in jobs]
+        if not jobs:
+            return results_per_job
             
         try:
-            # Generate embedding from job description and requirements
-            text_to_embed = f"{job.get('description', '')} {' '.join(job.get('required_skills', []))}"
-            if not text_to_embed.strip():
-                return []
-                
-            query_embedding = self.embedding_model.encode(text_to_embed).tolist()
+            # Reuse the embeddings stored at add_job time - no transformer pass for known jobs
+            query_embeddings = self._get_job_query_embeddings(jobs)
+            query_indices = [k for k, embedding in enumerate(query_embeddings) if embedding is not None]
+            if not query_indices:
+                return results_per_job
             
-            # Semantic search in Chroma
-            results = self.candidates_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=min(top_k, self.get_candidate_count()),
-                include=['metadatas', 'distances', 'documents']
+            n_results = min(top_k, self.get_candidate_count())
+            if n_results <= 0:
+                return results_per_job
+            
+            # Semantic search through the vector backend - all jobs in one round-trip
+            self._sync_vector_backend()
+            allowed_ids = None
+            if where and not self.vector_backend.supports_where:
+                allowed_ids = self.candidates_collection.get(where=where, include=[])['ids']
+            results = self.vector_backend.search(
+                [query_embeddings[k] for k in query_indices],
+                n_results,
+                allowed_ids=allowed_ids,
+                where=where,
+                include_metadatas=record_lookup is None
             )
             
-            matches = []
-            if results['ids'] and len(results['ids'][0]) > 0:
-                for i in range(len(results['ids'][0])):
-                    metadata = results['metadatas'][0][i]
-                    # ADD NULL CHECK HERE
-                    if not metadata:
-                        continue  # Skip this candidate if metadata is None
-
-                    distance = results['distances'][0][i]
-                    similarity_score = max(0, 1 - distance)  # Convert distance to similarity
-                    
-                    # Parse JSON strings back to original formats
-                    candidate_skills = json.loads(metadata.get('skills', '[]'))
-                    
-                    # Calculate skill overlap (traditional matching)
-                    job_skills = set([s.lower() for s in job.get('required_skills', [])])
-                    candidate_skills_set = set([s.lower() for s in candidate_skills])
-                    skill_overlap = len(job_skills.intersection(candidate_skills_set)) / len(job_skills) if job_skills else 0
-                    
-                    # ENHANCED: Include growth data in candidate profile
-                    matches.append({
-                        'candidate': {
-                            'id': int(results['ids'][0][i]),
-                            'name': metadata.get('name', 'Unknown'),
-                            'skills': candidate_skills,
-                            'experience_years': metadata.get('experience_years', 0),
-                            'location': metadata.get('location', ''),
-                            'email': metadata.get('email', ''),
-                            'phone': metadata.get('phone', ''),
-                            'profile': metadata.get('profile', ''),
-                            'education': metadata.get('education', ''),
-                            'cultural_attributes': json.loads(metadata.get('cultural_attributes', '{}')),
-                            # ENHANCED: Growth data fields
-                            'work_experience': json.loads(metadata.get('work_experience', '[]')),
-                            'career_metrics': json.loads(metadata.get('career_metrics', '{}')),
-                            'skill_timeline': json.loads(metadata.get('skill_timeline', '[]')),
-                            'growth_metrics': json.loads(metadata.get('growth_metrics', '{}')),
-                            'learning_velocity': metadata.get('learning_velocity', 0.0)
-                        },
-                        'score': similarity_score,
-                        'common_skills': list(job_skills.intersection(candidate_skills_set)),
-                        'score_breakdown': {
-                            'semantic': int(similarity_score * 100),
-                            'skills': int(skill_overlap * 100),
-                            'experience': 0,  # Will be calculated by matcher
-                            'location': 0     # Will be calculated by matcher
-                        }
-                    })
+            hit_ids = list(dict.fromkeys(record_id for row in results['ids'] for record_id in row))
+            if record_lookup:
+                decoded = {str(record_id): candidate for record_id, candidate in record_lookup(hit_ids).items()}
+            elif results['metadatas'] is not None:
+                decoded = {}
+                for row in range(len(results['ids'])):
+                    for record_id, metadata in zip(results['ids'][row], results['metadatas'][row]):
+                        if metadata and record_id not in decoded:
+                            decoded[record_id] = self._candidate_from_metadata(record_id, metadata)
+            else:
+                decoded = {str(candidate['id']): candidate for candidate in self.get_many(hit_ids, 'candidates')}
             
-            return matches
+            for row, job_index in enumerate(query_indices):
+                results_per_job[job_index] = self._build_matches(
+                    jobs[job_index],
+                    [decoded.get(record_id) for record_id in results['ids'][row]],
+                    results['distances'][row]
+                )
+            
+            return results_per_job
         except Exception as e:
             print(f"❌ Error in semantic search: {e}")
-            return []
+            return results_per_job
+
+    def add_cultural_context(self, record_type: str, record_id, context_text: str) -> bool:
+        """Store the cultural context text and its normalized embedding for a job or candidate"""
+        if not self.embedding_model:
+            return False
+        
+        normalized = normalize_text(context_text)
+        if len(normalized) < MIN_CULTURAL_CONTEXT_LENGTH:
+            return False
+            
+        try:
+            embedding = np.asarray(self.embedding_model.encode([normalized])[0], dtype=np.float32)
+            embedding = embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+            
+            self.cultural_contexts_collection.upsert(
+                ids=[f"{record_type}_{record_id}"],
+                embeddings=[embedding.tolist()],
+                documents=[normalized],
+                metadatas=[{'record_type': record_type, 'record_id': int(record_id)}]
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Error storing cultural context for {record_type} {record_id}: {e}")
+            return False
+    
+    def add_cultural_contexts_batch(self, record_type: str, contexts: Dict, batch_size: int = 64, chunk_size: int = 1000) -> int:
+        """Bulk version of add_cultural_context for {record_id: context_text} - one batched encode and
+        one upsert per chunk (Chroma caps a single write). Returns how many were stored"""
+        if not self.embedding_model:
+            return 0
+        
+        entries = [
+            (record_id, normalized) for record_id, normalized in
+            ((record_id, normalize_text(text)) for record_id, text in contexts.items())
+            if len(normalized) >= MIN_CULTURAL_CONTEXT_LENGTH
+        ]
+        
+        stored = 0
+        for start in range(0, len(entries), chunk_size):
+            chunk = entries[start:start + chunk_size]
+            try:
+                embeddings = np.asarray(
+                    self.embedding_model.encode([text for _, text in chunk], batch_size=batch_size),
+                    dtype=np.float32
+                )
+                embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+                
+                self.cultural_contexts_collection.upsert(
+                    ids=[f"{record_type}_{record_id}" for record_id, _ in chunk],
+                    embeddings=embeddings.tolist(),
+                    documents=[text for _, text in chunk],
+                    metadatas=[{'record_type': record_type, 'record_id': int(record_id)} for record_id, _ in chunk]
+                )
+                stored += len(chunk)
+            except Exception as e:
+                print(f"❌ Error storing cultural contexts chunk starting at {start}: {e}")
+        return stored
+    
+    def get_cultural_context_embeddings(self, record_type: str, contexts: Dict) -> Dict:
+        """Fetch stored unit-length cultural context vectors for {record_id: current_context_text}.
+        Records whose stored text no longer matches the current text are left out (stale)"""
+        if not contexts:
+            return {}
+            
+        try:
+            results = self.cultural_contexts_collection.get(
+                ids=[f"{record_type}_{record_id}" for record_id in contexts],
+                include=['embeddings', 'documents']
+            )
+            
+            vectors = {}
+            for i in range(len(results['ids'])):
+                record_id = int(results['ids'][i].rsplit('_', 1)[1])
+                current_text = normalize_text(contexts.get(record_id, ''))
+                if results['documents'][i] == current_text:
+                    vectors[record_id] = np.asarray(results['embeddings'][i], dtype=np.float32)
+            return vectors
+        except Exception as e:
+            print(f"❌ Error fetching cultural context embeddings: {e}")
+            return {}
+
+    def delete_cultural_contexts(self, record_type: str, record_ids: List = None):
+        """Drop stored cultural contexts of 'job' or 'candidate' records - every one of them when ids is None"""
+        if record_ids is None:
+            self.cultural_contexts_collection.delete(where={'record_type': record_type})
+        elif record_ids:
+            self.cultural_contexts_collection.delete(ids=[f"{record_type}_{record_id}" for record_id in record_ids])
 
     def clear_candidates(self):
         """Clear all candidates from the vector database (for testing)"""
         try:
-            self.client.delete_collection("candidates")
-            self.candidates_collection = self.client.get_or_create_collection(
-                name="candidates",
-                metadata={"description": "Candidate profiles for semantic search"}
-            )
+            with self._writing('candidates') as collection:
+                self.client.delete_collection(collection.name)
+                self._collections['candidates'] = self._get_or_create_collection('candidates', collection.name)
+            self.vector_backend.space = collection_space(self.candidates_collection)
+            # Side stores are keyed by id - ids get re-allocated, so their candidate rows must go too
+            self.delete_cultural_contexts('candidate')
+            self.document_store.delete('candidates')
+            self.skill_index.delete()
+            self.vector_backend.clear()
+            self._candidates_written()
             print("✅ Vector database cleared!")
             return True
         except Exception as e:
             print(f"❌ Error clearing vector database: {e}")
             return False
 
-    def get_all_candidates(self) -> List[Dict]:
-        """Retrieve all candidates from Chroma DB in original format - WITH GROWTH DATA"""
+    def delete_candidates(self, candidate_ids: List) -> bool:
+        """Delete candidates by id from the collection, the vector backend and every side store"""
+        if not candidate_ids:
+            return True
+        try:
+            with self._writing('candidates') as collection:
+                collection.delete(ids=[str(candidate_id) for candidate_id in candidate_ids])
+                self.vector_backend.delete(candidate_ids)
+            self.delete_cultural_contexts('candidate', candidate_ids)
+            self.document_store.delete('candidates', candidate_ids)
+            self.skill_index.delete(candidate_ids)
+            self._candidates_written()
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting candidates {candidate_ids}: {e}")
+            return False
+
+    def _copy_rows_to(self, record_type: str, shadow, page: Dict, model_changed: bool, batch_size: int) -> int:
+        """Write one page of rows into `shadow` with current-format metadata, reusing each stored
+        embedding unless the model changed or the row's embedding text no longer matches. Returns re-encoded count"""
+        if record_type == 'jobs':
+            field_spec, text_fn, metadata_fn = JOB_FIELDS, self._job_embedding_text, self._job_metadata
+        else:
+            field_spec, text_fn, metadata_fn = CANDIDATE_FIELDS, self._candidate_embedding_text, self._candidate_metadata
+        document_field = DOCUMENT_FIELDS[record_type]
+        
+        ids, records, texts, embeddings = [], [], [], []
+        legacy_documents = {}
+        for i in range(len(page['ids'])):
+            metadata = page['metadatas'][i] or {}
+            record = self._record_from_metadata(page['ids'][i], metadata, field_spec)
+            if metadata.get(document_field):
+                legacy_documents[record['id']] = metadata[document_field]
+            embedding = page['embeddings'][i] if page['embeddings'] is not None else None
+            ids.append(page['ids'][i])
+            records.append(record)
+            texts.append(text_fn(record))
+            embeddings.append(
+                None if embedding is None or model_changed or page['documents'][i] != texts[-1]
+                else np.asarray(embedding, dtype=np.float32).tolist()
+            )
+        
+        to_encode = [k for k in range(len(ids)) if embeddings[k] is None]
+        if to_encode:
+            if not self.embedding_model:
+                raise RuntimeError("Embedding model not available - cannot re-encode changed rows")
+            encoded = self.embedding_model.encode([texts[k] for k in to_encode], batch_size=batch_size)
+            for k, embedding in zip(to_encode, encoded):
+                embeddings[k] = embedding.tolist()
+        
+        if legacy_documents:
+            # Raw text still held in legacy metadata moves to the side store on the way
+            self.document_store.put_many(record_type, legacy_documents)
+        if record_type == 'candidates':
+            # Keeps the skill index in line with the copied rows (and fills it for unindexed ones)
+            self._index_skills(records)
+        if ids:
+            # upsert - catch-up passes re-copy rows that changed after their first copy
+            shadow.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=[metadata_fn(record) for record in records]
+            )
+        return len(to_encode)
+
+    def _catch_up(self, record_type: str, old, shadow, copied: Dict, since: float, model_changed: bool,
+                  batch_size: int, encode_batch_size: int):
+        """Bring `shadow` in line with writes to `old` since `since`: copy rows it lacks or whose update marker
+        differs from the copied one, delete rows that are gone. `copied` is {id: update marker} of the shadow's
+        rows and is kept current. Returns (rows changed, rows re-encoded)"""
+        current = set(old.get(include=[])['ids'])
+        gone = [record_id for record_id in copied if record_id not in current]
+        if gone:
+            shadow.delete(ids=gone)
+            for record_id in gone:
+                del copied[record_id]
+        
+        touched = old.get(where={UPDATED_AT_KEY: {'$gte': since}}, include=['metadatas'])
+        stale = [
+            record_id for record_id, metadata in zip(touched['ids'], touched['metadatas'])
+            if copied.get(record_id) != (metadata or {}).get(UPDATED_AT_KEY)
+        ]
+        stale = list(dict.fromkeys(stale + [record_id for record_id in current if record_id not in copied]))
+        re_encoded = 0
+        for start in range(0, len(stale), batch_size):
+            page = old.get(ids=stale[start:start + batch_size], include=['metadatas', 'documents', 'embeddings'])
+            re_encoded += self._copy_rows_to(record_type, shadow, page, model_changed, encode_batch_size)
+            copied.update(self._update_markers(page))
+        return len(gone) + len(stale), re_encoded
+
+    @staticmethod
+    def _update_markers(page: Dict) -> Dict:
+        """{id: update marker (None for rows written before markers existed)} of a get() page"""
+        return {
+            page['ids'][i]: (page['metadatas'][i] or {}).get(UPDATED_AT_KEY)
+            for i in range(len(page['ids']))
+        }
+
+    def rebuild_collection(self, record_type: str = 'candidates', batch_size: int = 500, encode_batch_size: int = 64) -> Dict:
+        """Zero-downtime rebuild of the candidates or jobs collection.
+        Streams every row and its stored embedding into a fresh shadow collection in pages, re-encoding only
+        rows whose embedding text changed (every row if the embedding model changed), then swaps the shadow in.
+        Writes made meanwhile are caught up by id and update marker (new, changed and deleted rows); the last
+        catch-up and the swap run under the collection write lock, so no write is lost. Searches keep using
+        the old collection until the swap; every process re-resolves the live collection on its next access
+        and the old one is dropped after RETIRED_COLLECTION_GRACE_SECONDS. The new collection gets the current
+        index_config (distance space / HNSW parameters). Returns counts for the rebuild"""
+        old = self._live_collection(record_type)
+        # Collections created before the key existed were built with the default model
+        old_model = (old.metadata or {}).get('embedding_model', EMBEDDING_MODEL_NAME)
+        model_changed = old_model != embedding_service.model_name
+        
+        shadow_name = f"{record_type}_{int(time.time() * 1000)}"
+        shadow = self._get_or_create_collection(record_type, shadow_name)
+        copied = {}
+        re_encoded = 0
+        try:
+            # Rows are stamped under the lock - once it is free, every later write carries a marker >= started
+            with collection_write_lock(self.persist_directory):
+                started = time.time()
+            offset = 0
+            while True:
+                page = old.get(include=['metadatas', 'documents', 'embeddings'], limit=batch_size, offset=offset)
+                re_encoded += self._copy_rows_to(record_type, shadow, page, model_changed, encode_batch_size)
+                copied.update(self._update_markers(page))
+                if len(page['ids']) < batch_size:
+                    break
+                offset += batch_size
+            
+            # Catch up with writes made while the pass was running, without blocking writers
+            for _ in range(REBUILD_CATCH_UP_PASSES):
+                changed, pass_re_encoded = self._catch_up(
+                    record_type, old, shadow, copied, started, model_changed, batch_size, encode_batch_size
+                )
+                re_encoded += pass_re_encoded
+                if not changed:
+                    break
+            
+            # Last catch-up and swap with writers held off - one atomic rename of the names file
+            with collection_write_lock(self.persist_directory):
+                re_encoded += self._catch_up(
+                    record_type, old, shadow, copied, started, model_changed, batch_size, encode_batch_size
+                )[1]
+                swap_collection(self.persist_directory, record_type, shadow_name)
+        except Exception:
+            self.client.delete_collection(shadow_name)
+            raise
+        
+        self._resolve_collections()
+        if record_type == 'candidates':
+            if re_encoded:
+                # Re-encoded vectors differ from the indexed ones - re-index from the new collection
+                self.vector_backend.clear()
+            self.vector_backend.sync(shadow)
+            self._candidates_written()
+        else:
+            self.bump_version(record_type)
+        self.drop_retired_collections()
+        
+        print(f"✅ Rebuilt {record_type} collection: {len(copied)} records, {re_encoded} re-encoded")
+        return {'records': len(copied), 're_encoded': re_encoded, 'model_changed': model_changed}
+
+    def drop_retired_collections(self, grace_seconds: float = RETIRED_COLLECTION_GRACE_SECONDS) -> List[str]:
+        """Drop collections rebuild_collection() swapped out at least grace_seconds ago - every process
+        re-resolves the live collection on each access, so by then none is still reading them"""
+        try:
+            with collection_write_lock(self.persist_directory):
+                names = retired_collections(self.persist_directory, grace_seconds)
+                for name in names:
+                    try:
+                        self.client.delete_collection(name)
+                    except Exception as e:
+                        print(f"⚠️ Could not drop retired collection {name}: {e}")
+                if names:
+                    forget_retired_collections(self.persist_directory, names)
+            return names
+        except Exception as e:
+            print(f"⚠️ Could not drop retired collections: {e}")
+            return []
+
+    def get_many(self, ids: List, record_type: str = 'candidates', fields: List[str] = None,
+                 include_original_text: bool = False) -> List[Dict]:
+        """Fetch records by id with one collection.get(ids=[...]) - returned in the order of `ids`,
+        missing ids are skipped. record_type is 'candidates' or 'jobs'.
+        include_original_text: also attach the raw resume/job text from the document side store"""
+        if not ids:
+            return []
+        
+        if record_type == 'jobs':
+            collection, field_spec = self.jobs_collection, JOB_FIELDS
+        else:
+            collection, field_spec = self.candidates_collection, CANDIDATE_FIELDS
+            
+        try:
+            results = collection.get(ids=[str(record_id) for record_id in ids], include=['metadatas'])
+            by_id = {
+                results['ids'][i]: self._record_from_metadata(results['ids'][i], results['metadatas'][i] or {}, field_spec, fields)
+                for i in range(len(results['ids']))
+            }
+            if include_original_text:
+                document_field = DOCUMENT_FIELDS[record_type]
+                legacy = {
+                    int(results['ids'][i]): (results['metadatas'][i] or {}).get(document_field)
+                    for i in range(len(results['ids']))
+                }
+                texts = self._original_texts(record_type, list(legacy), legacy)
+                for record_id, record in by_id.items():
+                    record[document_field] = texts.get(int(record_id), '')
+            return [by_id[str(record_id)] for record_id in ids if str(record_id) in by_id]
+        except Exception as e:
+            print(f"❌ Error retrieving {record_type} by id from Chroma DB: {e}")
+            return []
+
+    def get_candidate(self, candidate_id, fields: List[str] = None, include_original_text: bool = False):
+        """Fetch a single candidate by id (None if it does not exist)"""
+        records = self.get_many([candidate_id], 'candidates', fields, include_original_text)
+        return records[0] if records else None
+
+    def get_job(self, job_id, fields: List[str] = None, include_original_text: bool = False):
+        """Fetch a single job by id (None if it does not exist)"""
+        records = self.get_many([job_id], 'jobs', fields, include_original_text)
+        return records[0] if records else None
+
+    def _original_texts(self, record_type: str, record_ids: List[int], legacy: Dict = None) -> Dict:
+        """{record_id: raw text} from the side store, falling back to text still held in legacy metadata"""
+        texts = self.document_store.get_many(record_type, record_ids)
+        for record_id, text in (legacy or {}).items():
+            if record_id not in texts and text:
+                texts[record_id] = text
+        return texts
+
+    def get_original_text(self, record_type: str, record_id) -> str:
+        """Raw resume (record_type='candidates') or job text (record_type='jobs') for one record ('' if none)"""
+        try:
+            text = self.document_store.get(record_type, record_id)
+            if text is None:
+                # Legacy row written before the side store existed
+                collection = self.jobs_collection if record_type == 'jobs' else self.candidates_collection
+                results = collection.get(ids=[str(record_id)], include=['metadatas'])
+                if results['ids']:
+                    text = (results['metadatas'][0] or {}).get(DOCUMENT_FIELDS[record_type])
+            return text or ''
+        except Exception as e:
+            print(f"❌ Error retrieving original text for {record_type} {record_id}: {e}")
+            return ''
+
+    def _iter_collection(self, collection, field_spec: List, batch_size: int, where: Dict, fields):
+        """Page through a collection with get(limit, offset), yielding one lazily decoded record at a time"""
+        offset = 0
+        while True:
+            query = {'include': ['metadatas'], 'limit': batch_size, 'offset': offset}
+            if where:
+                query['where'] = where
+            page = collection.get(**query)
+            
+            for i in range(len(page['ids'])):
+                yield self._record_from_metadata(page['ids'][i], page['metadatas'][i] or {}, field_spec, fields)
+            
+            if len(page['ids']) < batch_size:
+                break
+            offset += batch_size
+
+    def iter_candidates(self, batch_size: int = 500, where: Dict = None, fields: List[str] = None):
+        """Stream candidates page by page (optionally filtered with a Chroma `where`) - memory stays flat"""
+        return self._iter_collection(self.candidates_collection, CANDIDATE_FIELDS, batch_size, where, fields)
+
+    def iter_jobs(self, batch_size: int = 500, where: Dict = None, fields: List[str] = None):
+        """Stream jobs page by page (optionally filtered with a Chroma `where`) - memory stays flat"""
+        return self._iter_collection(self.jobs_collection, JOB_FIELDS, batch_size, where, fields)
+
+    def get_all_candidates(self, fields: List[str] = None) -> List[Dict]:
+        """Retrieve all candidates from Chroma DB in original format - WITH GROWTH DATA
+        fields: optional projection, e.g. ['name', 'growth_metrics'] ('id' is always included).
+        Nested JSON fields are decoded lazily, on first access"""
         try:
             # Get all candidates from collection
             results = self.candidates_collection.get(
-                include=['metadatas', 'documents']
+                include=['metadatas']
             )
             
-            candidates = []
-            for i in range(len(results['ids'])):
-                metadata = results['metadatas'][i]
-                # ENHANCED: Include growth data in candidate profile
-                candidates.append({
-                    'id': int(results['ids'][i]),
-                    'name': metadata.get('name', 'Unknown'),
-                    'email': metadata.get('email', ''),
-                    'phone': metadata.get('phone', ''),
-                    'location': metadata.get('location', ''),
-                    'experience_years': metadata.get('experience_years', 0),
-                    'skills': json.loads(metadata.get('skills', '[]')),
-                    'profile': metadata.get('profile', ''),
-                    'education': metadata.get('education', ''),
-                    'cultural_attributes': json.loads(metadata.get('cultural_attributes', '{}')),
-                    # ENHANCED: Growth data fields
-                    'work_experience': json.loads(metadata.get('work_experience', '[]')),
-                    'career_metrics': json.loads(metadata.get('career_metrics', '{}')),
-                    'skill_timeline': json.loads(metadata.get('skill_timeline', '[]')),
-                    'growth_metrics': json.loads(metadata.get('growth_metrics', '{}')),
-                    'learning_velocity': metadata.get('learning_velocity', 0.0),
-                    # CRITICAL: Include original resume text
-                    'original_resume_text': metadata.get('original_resume_text', '')
-                })
+            candidates = [
+                self._record_from_metadata(results['ids'][i], results['metadatas'][i] or {}, CANDIDATE_FIELDS, fields)
+                for i in range(len(results['ids']))
+            ]
             
             print(f"✅ Retrieved {len(candidates)} candidates from Chroma DB with growth data")
             return candidates
@@ -371,40 +1248,20 @@ class ChromaVectorDB:
             print(f"❌ Error retrieving candidates from Chroma DB: {e}")
             return []
 
-    def get_all_jobs(self) -> List[Dict]:
-        """Retrieve all jobs from Chroma DB in original format - ENHANCED"""
+    def get_all_jobs(self, fields: List[str] = None) -> List[Dict]:
+        """Retrieve all jobs from Chroma DB in original format - ENHANCED
+        fields: optional projection, e.g. ['title', 'quality_assessment'] ('id' is always included).
+        Nested JSON fields are decoded lazily, on first access"""
         try:
             # Get all jobs from collection
             results = self.jobs_collection.get(
-                include=['metadatas', 'documents']
+                include=['metadatas']
             )
             
-            jobs = []
-            for i in range(len(results['ids'])):
-                metadata = results['metadatas'][i]
-                jobs.append({
-                    'id': int(results['ids'][i]),
-                    # Existing fields
-                    'title': metadata.get('title', 'Unknown'),
-                    'company': metadata.get('company', ''),
-                    'location': metadata.get('location', ''),
-                    'description': metadata.get('description', ''),
-                    'required_skills': json.loads(metadata.get('required_skills', '[]')),
-                    'preferred_skills': json.loads(metadata.get('preferred_skills', '[]')),
-                    'experience_required': metadata.get('experience_required', 0),
-                    'salary_range': metadata.get('salary_range', ''),
-                    'job_type': metadata.get('job_type', ''),
-                    'cultural_attributes': json.loads(metadata.get('cultural_attributes', '{}')),
-                    # NEW: Enhanced job dimensions
-                    'growth_requirements': json.loads(metadata.get('growth_requirements', '{}')),
-                    'skill_requirements': json.loads(metadata.get('skill_requirements', '{}')),
-                    'career_progression': json.loads(metadata.get('career_progression', '{}')),
-                    'quality_assessment': json.loads(metadata.get('quality_assessment', '{}')),
-                    'confidence_scores': json.loads(metadata.get('confidence_scores', '{}')),
-                    'original_job_text': metadata.get('original_job_text', ''),
-                    # NEW: AI Job Profile - CRITICAL MISSING FIELD
-                    'ai_job_profile': json.loads(metadata.get('ai_job_profile', '{}'))
-                })
+            jobs = [
+                self._record_from_metadata(results['ids'][i], results['metadatas'][i] or {}, JOB_FIELDS, fields)
+                for i in range(len(results['ids']))
+            ]
             
             print(f"✅ Retrieved {len(jobs)} jobs from Chroma DB with enhanced data")
             return jobs
@@ -77,10 +77,10 @@ except ImportError as e:
     
     # Demo classes for fallback (Chroma DB only)
     class ChromaDataManager:
-        def load_jobs(self): 
+        def load_jobs(self, fields=None): 
             return []
         
-        def load_candidates(self): 
+        def load_candidates(self, fields=None): 
             return []
         
         def add_job(self, data): return 1
@@ -374,9 +374,8 @@ def parse_resume_file():
         else:
             content = file.read().decode('utf-8')
         
-        # ENHANCED: Use enhanced parser with growth data
-        parser = ResumeParser()
-        candidate_data = parser.parse_resume_to_candidate(
+        # ENHANCED: Use enhanced parser with growth data (shared instance - no model reload)
+        candidate_data = resume_parser.parse_resume_to_candidate(
             content, 
             include_extensions=['core', 'career_timeline', 'skill_progression', 'growth_metrics']
         )
@@ -419,12 +418,39 @@ def get_candidate_growth_data(candidate_id):
         print(f"❌ Error getting growth data: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/get-candidate/<int:candidate_id>', methods=['GET'])
+def get_candidate(candidate_id):
+    """Get a single candidate by id"""
+    try:
+        candidate = db.get_candidate_with_growth_data(candidate_id, include_original_text=True)
+        if candidate:
+            return jsonify({'success': True, 'candidate': candidate})
+        return jsonify({'success': False, 'error': 'Candidate not found'}), 404
+    except Exception as e:
+        print(f"❌ Error getting candidate: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/get-job/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get a single job by id"""
+    try:
+        job = db.get_job(job_id, include_original_text=True)
+        if job:
+            return jsonify({'success': True, 'job': job})
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    except Exception as e:
+        print(f"❌ Error getting job: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/get-high-growth-candidates', methods=['GET'])
 def get_high_growth_candidates():
     """Get candidates with high growth potential"""
     try:
         min_score = request.args.get('min_score', 70, type=int)
-        candidates = db.get_candidates_by_growth_potential(min_score=min_score)
+        candidates = db.get_candidates_by_growth_potential(
+            min_score=min_score,
+            fields=['name', 'growth_metrics', 'experience_years', 'skills', 'career_metrics']
+        )
         
         # Return simplified candidate data for the list
         simplified_candidates = []
@@ -467,18 +493,17 @@ def health():
 def get_stats():
     """Get system statistics and metrics - ENHANCED WITH GROWTH DATA"""
     try:
-        jobs = db.load_jobs()
-        candidates = db.load_candidates()
         vector_db_count = vector_db.get_candidate_count()
         
-        # Enhanced stats with growth data
+        # Enhanced stats with growth data (streams the collections once)
         enhanced_stats = db.get_vector_db_stats()
+        total_jobs = enhanced_stats.get('jobs_count', 0)
         
         return jsonify({
-            'total_jobs': len(jobs),
-            'total_candidates': len(candidates),
+            'total_jobs': total_jobs,
+            'total_candidates': vector_db_count,
             'vector_db_count': vector_db_count,
-            'total_matches': len(jobs) * len(candidates),
+            'total_matches': total_jobs * vector_db_count,
             'success_rate': 95,
             # Enhanced growth metrics
             'average_growth_potential': enhanced_stats.get('average_growth_potential', 0),
@@ -493,7 +518,13 @@ def run_matching():
     """Run AI matching between jobs and candidates - WITH GROWTH DATA"""
     try:
         print("🤖 Running AI matching with Chroma DB and growth data...")
-        results, jobs, candidates = matcher.find_matches()
+        # Optional geographic pre-filter: only candidates within max_distance_km of each job's city
+        max_distance_km = (request.get_json(silent=True) or {}).get('max_distance_km')
+        # Only each job's best match is returned, so only that one is fully scored
+        results, jobs, candidates = matcher.find_matches(
+            max_distance_km=float(max_distance_km) if max_distance_km else None,
+            top_k=1
+        )
         
         matches = []
         for job_index, job_matches in results.items():
@@ -532,6 +563,7 @@ def run_matching():
                     'cultural_breakdown': top_match.get('cultural_breakdown', {}),
                     'growth_potential_score': growth_score,
                     'growth_breakdown': growth_breakdown,
+                    'distance_km': top_match.get('distance_km'),
                     'match_grade': top_match.get('match_grade', 'A')
                 })
         
@@ -582,15 +614,14 @@ def reinitialize_vector_db():
     """Reinitialize vector database - WITH GROWTH DATA"""
     try:
         print("🔄 Reinitializing Vector Database with growth data...")
-        # Clear and reinitialize
-        vector_db.clear_candidates()
-        candidates = db.load_candidates()
-        vector_db.add_candidates_batch(candidates)
+        # Rebuild into a shadow collection and swap it in - searches keep working meanwhile
+        result = vector_db.rebuild_collection('candidates')
         
         return jsonify({
             'status': 'success',
             'message': 'Vector database reinitialized successfully with growth data',
-            'candidates_loaded': len(candidates)
+            'candidates_loaded': result['records'],
+            'candidates_re_encoded': result['re_encoded']
         })
     except Exception as e:
         print(f"❌ Vector DB reinit error: {e}")